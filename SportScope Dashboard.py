@@ -1,42 +1,41 @@
+# Startup is timed from the first import; see DataVizApp.startup_report
+import time
+STARTUP_START = time.perf_counter()
 import math
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
-from tkinter import filedialog, messagebox, simpledialog, colorchooser, Tk, Canvas, Frame, BOTH, LEFT, RIGHT, Y, X, NW
+from tkinter import (filedialog, messagebox, simpledialog, colorchooser, Canvas, Frame, Listbox, BOTH, LEFT, RIGHT, Y,
+                     X, NW)
 import tkinter.font as tkFont
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures, StandardScaler
-from sklearn.ensemble import IsolationForest
-import sqlite3
 import numpy as np
-import itertools
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error, r2_score
-
-
-# Helper: Create a scrollable frame
-def create_scrollable_frame(parent, bg=None):
-    if bg is None:
-        try:
-            bg = parent.cget("background")
-        except Exception:
-            bg = "#f7f7f7"
-    canvas = Canvas(parent, borderwidth=0, background=bg)
-    frame = Frame(canvas, background=bg)
-    vsb = tb.Scrollbar(parent, orient="vertical", command=canvas.yview)
-    canvas.configure(yscrollcommand=vsb.set)
-    vsb.pack(side=RIGHT, fill=Y)
-    canvas.pack(side=LEFT, fill=BOTH, expand=True)
-    frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas.create_window((0, 0), window=frame, anchor=NW)
-    return frame
-
+import concurrent.futures
+import os
+import queue
+import sys
+import threading
+import webbrowser
+from sportscope import (ANOMALY_CHUNK_ROWS, ANOMALY_CONTAMINATION, ANOMALY_FIT_ROWS, ANOMALY_POLL_MS,
+                       AUTO_ARIMA_CRITERIA, AnomalyCancelled, BACKTEST_FOLDS, BACKTEST_WINDOWS, CHART_MAX_POINTS,
+                       CHART_TYPES, CHART_WORKERS, CONVERT_FORMATS, CONVERT_INPUT_EXTENSIONS, CONVERT_POLL_MS,
+                       CSVTail, ChartEngine, ChartServer, ColumnIndex, ConvertStats, DASHBOARD_POLL_MS,
+                       DASHBOARD_TITLE, DEFERRED_MODULES, DashboardAggregates, DashboardChart, DashboardSpec,
+                       FORECAST_POLL_MS, FigureCache, ForecastCancelled, ForecastJob, IMPORT_TIMINGS,
+                       IncrementalForecaster, LIVE_POLL_MS, LOAD_CHUNK_ROWS, LOAD_POLL_MS, LiveDashboard,
+                       LoadCancelled, OUT_OF_CORE_CHART_ROWS, ResultCache, SQLITE_EXTENSIONS, SQLiteDataset,
+                       SQLiteQuery, SQLiteWriter, SUGGESTION_POLL_MS, WEBGL_THRESHOLD, add_anomaly_trace,
+                       add_forecast_traces, apply_chart_theme, backtest_figure, backtest_models, batch_forecast,
+                       build_dashboard_chart, clear_cache, concat_chunks, convert_files, csv_data_offset,
+                       dashboard_figure, dataset_fingerprint, detect_anomalies, export_dashboard_html, fit_forecast,
+                       forecast_inputs, format_memory_report, get_chart_type, is_sqlite_file, load_dashboard_spec,
+                       load_dataset, make_chunk_writer, pd, reduce_dashboard_chart, save_dashboard_spec,
+                       sqlite_table_columns, sqlite_tables, suggest_charts, validate_sqlite_where)
+
+STARTUP_IMPORT_SECONDS = time.perf_counter() - STARTUP_START
 
 class DataVizApp:
     def __init__(self, master):
+        init_start = time.perf_counter()
         self.master = master
         self.master.title("Sport Scope Dashboard")
         self.master.geometry("1700x950")
@@ -80,13 +79,30 @@ class DataVizApp:
 
         # Forecasting options
         self.prediction_var = tb.BooleanVar(value=False)
+        self.chart_type_var = tb.StringVar(value="")
         self.forecast_model_var = tb.StringVar(value="Linear")
         self.forecast_horizon_var = tb.StringVar(value="5")
         self.conf_int_var = tb.BooleanVar(value=False)
+        self.chart_max_points_var = tb.StringVar(value=str(CHART_MAX_POINTS))
+        self.webgl_threshold_var = tb.StringVar(value=str(WEBGL_THRESHOLD))
         self.forecast_x = None
         self.forecast_y = None
         self.forecast_ci = None
 
+        # Forecasts run one at a time on a background worker; further requests queue behind it
+        self.forecast_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+        self.forecast_jobs = []
+        self.forecast_group_var = tb.StringVar(value="")
+        self.arima_criterion_var = tb.StringVar(value="AIC")
+        self.backtest_folds_var = tb.StringVar(value=str(BACKTEST_FOLDS))
+        self.backtest_window_var = tb.StringVar(value=BACKTEST_WINDOWS[0])
+        self.group_forecasts = None
+        # (x column, y column, IncrementalForecaster) of the last applied forecast, updated on append
+        self.forecaster = None
+        self.group_forecast_metrics = None
+        # Counts successful loads; forecast jobs queued before the latest load are discarded when they finish
+        self.load_generation = 0
+
         # Custom chart creator (for File & Data tab)
         self.custom_chart_type_var = tb.StringVar(value="Scatter")
         self.custom_chart_title_var = tb.StringVar()
@@ -94,11 +110,72 @@ class DataVizApp:
 
         # Data and anomalies
         self.file_path = None
+        self.sqlite_query = None
+        # File and query of the load in progress; they become file_path/sqlite_query only once it succeeds
+        self.loading_file_path = None
+        self.loading_sqlite_query = None
+        # Fingerprint of the file the in-memory data matches (None once rows are appended)
+        self.dataset_fingerprint = None
         self.data = None
+        self.dataset = None
+        # Row positions flagged by the last anomaly detection run
         self.anomalies = None
+        self.anomaly_result = None
+        self.anomaly_contamination_var = tb.StringVar(value=str(ANOMALY_CONTAMINATION))
+        self.anomaly_cache = ResultCache(max_entries=16)
+        self.anomaly_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="anomaly")
+        self.anomaly_future = None
+        self.anomaly_cancel_event = None
+
+        # Background loader state
+        self.load_thread = None
+        self.load_queue = None
+        self.load_cancel_event = None
+        self.cancel_load_buttons = []
+        self.convert_thread = None
+        self.convert_queue = None
+        self.convert_cancel_event = None
+        self.convert_sizes = {}
+        self.convert_positions = {}
+        self.convert_skipped_tables = {}
+        self.convert_start = 0.0
+        # Live refresh: tail thread, its queue and stop event; file_rows counts the rows of self.data read from
+        # self.file_path, so tailing resumes right after them
+        self.live_thread = None
+        self.live_queue = None
+        self.live_stop_event = None
+        self.file_rows = 0
+        self.stop_live_buttons = []
+        # Chart viewer page (every chart is shown there) and the dashboard shown live in it; viewer work runs on
+        # one thread, in order
+        self.viewer = None
+        self.live_dashboard = None
+        self.live_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="live")
+        self.sqlite_index_var = tb.StringVar(value="")
+        self.optimize_memory_var = tb.BooleanVar(value=True)
+        self.memory_report = None
+        self.use_cache_var = tb.BooleanVar(value=True)
+        self.out_of_core_var = tb.BooleanVar(value=False)
 
         # Dashboard chart configuration storage
+        self.chart_count_var = tb.StringVar(value="1")
         self.dashboard_chart_configs = []
+        # Reduced data behind dashboard charts, reused across builds and persisted by Save Dashboard
+        self.dashboard_aggregates = DashboardAggregates()
+        self.shown_suggestions = None
+
+        # Shared chart engine (registry of chart builders, theming and per-type build timings)
+        self.chart_engine = ChartEngine()
+
+        # Built figures are memoized per dataset version; the version is bumped whenever the data changes
+        self.data_version = 0
+        self.figure_cache = FigureCache()
+        self.column_index = None
+
+        # Worker pool for building dashboard figures in parallel
+        self.chart_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CHART_WORKERS,
+                                                                    thread_name_prefix="chart")
+        self.dashboard_futures = []
 
         # ------------------ Style Setup ------------------
         self.style = tb.Style()
@@ -133,8 +210,14 @@ class DataVizApp:
         self.content_frame.grid(row=0, column=1, sticky="nsew")
         self.content_frame.rowconfigure(0, weight=1)
         self.content_frame.columnconfigure(0, weight=1)
+        # Only the start page is built here; the others are built on their first show_page
         self.pages = {}
-        self._build_pages()
+        self.page_builders = {"File & Data": self._build_file_data_page,
+                              "File Converter": self._build_converter_page,
+                              "Forecasting": self._build_forecasting_page,
+                              "Custom Dashboard": self._build_dashboard_page,
+                              "Settings": self._build_settings_page}
+        self.page_build_seconds = {}
 
         # Right Suggestions Panel (visible only on "File & Data")
         self.suggestions_frame = tb.Frame(self.main_pane, width=250)
@@ -147,7 +230,11 @@ class DataVizApp:
         self.status_bar.pack(fill=X, side="bottom")
 
         # Show default page
+        self.startup_timings = [("Module imports", STARTUP_IMPORT_SECONDS),
+                                ("Window and styles", time.perf_counter() - init_start)]
         self.show_page("File & Data")
+        self.startup_timings.append(("File & Data page", self.page_build_seconds["File & Data"]))
+        self.master.after_idle(self._record_startup_ready)
 
     # ------------------ Style Methods ------------------
     def _update_style_fonts(self):
@@ -188,15 +275,103 @@ class DataVizApp:
         self.status_bar.config(text=message, bootstyle="danger" if error else "secondary")
 
     def get_column_name(self, col):
-        if self.data is None:
-            return col
-        if col in self.data.columns:
+        if self.column_index is None:
             return col
-        col_lower = col.lower()
-        for c in self.data.columns:
-            if c.lower() == col_lower:
-                return c
-        return col
+        return self.column_index.resolve(col)
+
+    # ------------------ Data Access (in-memory or out-of-core) ------------------
+    def has_data(self):
+        return self.data is not None or self.dataset is not None
+
+    def data_columns(self):
+        if self.data is not None:
+            return list(self.data.columns)
+        if self.dataset is not None:
+            return self.dataset.columns
+        return []
+
+    def data_length(self):
+        if self.data is not None:
+            return len(self.data)
+        return len(self.dataset) if self.dataset is not None else 0
+
+    # Return only the requested columns; out-of-core datasets are thinned to max_rows evenly spaced rows
+    def column_frame(self, columns, max_rows=None):
+        columns = list(dict.fromkeys(c for c in columns if c))
+        if self.data is not None:
+            return self.data[columns]
+        return self.dataset.load(columns, max_rows=max_rows)
+
+    def get_chart_max_points(self):
+        value = self.chart_max_points_var.get().strip()
+        return max(int(value), 100) if value.isdigit() else CHART_MAX_POINTS
+
+    # WebGL traces stay fast with many points; SVG keeps small charts crisp and fully featured
+    def get_webgl_threshold(self):
+        value = self.webgl_threshold_var.get().strip()
+        return int(value) if value.isdigit() else WEBGL_THRESHOLD
+
+    def chart_theme(self):
+        return dict(font_family=self.font_family_var.get(), title_size=int(self.font_size_var.get()) + 8,
+                    title_color=self.chart_title_color, axis_color=self.axis_label_color)
+
+    # Snapshot of every Tk setting that affects a figure, so charts can be built off the UI thread
+    def chart_settings(self):
+        return dict(theme=self.chart_theme(), palette=self.get_default_color_palette(),
+                    max_points=self.get_chart_max_points(), webgl_threshold=self.get_webgl_threshold())
+
+    # Load just the columns a chart needs and build it through the shared chart engine.
+    # Returns (ChartResult, unreduced data).
+    def build_chart(self, chart_type, columns, title=None, palette=None, continuous_scale="Viridis",
+                    extra_columns=(), settings=None):
+        settings = settings or self.chart_settings()
+        spec = get_chart_type(chart_type)
+        data = self.column_frame(spec.used_columns(columns) + list(extra_columns), max_rows=OUT_OF_CORE_CHART_ROWS)
+        result = self.chart_engine.build(spec.name, data, columns, settings["theme"], title=title,
+                                         palette=palette or settings["palette"], continuous_scale=continuous_scale,
+                                         max_points=settings["max_points"],
+                                         webgl_threshold=settings["webgl_threshold"])
+        return result, data
+
+    # Call whenever the data changes; columns names the changed columns when the rest is untouched, appended
+    # means rows were only added at the end of the in-memory data
+    def bump_data_version(self, columns=None, appended=False):
+        self.data_version += 1
+        self.figure_cache.clear()
+        if not self.has_data():
+            self.column_index = None
+        elif appended and self.column_index is not None and self.data is not None:
+            self.column_index.append(self.data)
+        elif columns is None or self.column_index is None:
+            self.column_index = self.build_column_index()
+        else:
+            self.column_index.invalidate(columns, self.data_columns())
+
+    def build_column_index(self):
+        if self.data is not None:
+            return ColumnIndex(self.data)
+        # Out-of-core datasets are indexed from their preview rows
+        return ColumnIndex(self.dataset.preview, columns=self.dataset.columns)
+
+    def figure_key(self, *parts, settings=None):
+        settings = settings or self.chart_settings()
+        return (self.data_version, parts, tuple(sorted(settings["theme"].items())), tuple(settings["palette"]),
+                settings["max_points"], settings["webgl_threshold"])
+
+    def chart_status_message(self, result, label):
+        if result is None:
+            message = f"{label} chart loaded from figure cache."
+        else:
+            message = f"{label} chart generated successfully in {result.seconds:.2f}s."
+            if result.reduction:
+                message += f" Reduced {result.total_rows:,} rows to {result.shown_rows:,} ({result.reduction})."
+        return f"{message} [{self.figure_cache.stats_text()}]"
+
+    def show_chart_timings(self):
+        if not self.chart_engine.timings:
+            messagebox.showinfo("Chart Build Timings", "No charts have been built yet.")
+            return
+        self.show_text_window("Chart Build Timings", self.chart_engine.timing_report())
 
     def get_default_color_palette(self):
         if hasattr(self, "color_palette_entry"):
@@ -220,6 +395,8 @@ class DataVizApp:
 
     def show_page(self, page_name):
         page = self.pages.get(page_name)
+        if page is None:
+            page = self.build_page(page_name)
         if page:
             for p in self.pages.values():
                 p.grid_remove()
@@ -232,17 +409,42 @@ class DataVizApp:
             self.suggestions_frame.grid_remove()
 
     # ------------------ Pages Building ------------------
-    def _build_pages(self):
-        for page_name in ["File & Data", "File Converter", "Forecasting", "Custom Dashboard", "Settings"]:
-            frame = tb.Frame(self.content_frame)
-            frame.grid(row=0, column=0, sticky="nsew")
-            self.pages[page_name] = frame
-
-        self._build_file_data_page(self.pages["File & Data"])
-        self._build_converter_page(self.pages["File Converter"])
-        self._build_forecasting_page(self.pages["Forecasting"])
-        self._build_dashboard_page(self.pages["Custom Dashboard"])
-        self._build_settings_page(self.pages["Settings"])
+    def build_page(self, page_name):
+        builder = self.page_builders.get(page_name)
+        if builder is None:
+            return None
+        start = time.perf_counter()
+        frame = tb.Frame(self.content_frame)
+        frame.grid(row=0, column=0, sticky="nsew")
+        self.pages[page_name] = frame
+        builder(frame)
+        self.page_build_seconds[page_name] = time.perf_counter() - start
+        return frame
+
+    def _record_startup_ready(self):
+        self.startup_timings.append(("Total until the window is idle", time.perf_counter() - STARTUP_START))
+
+    def startup_report(self):
+        lines = [f"{'Startup stage':<34}{'Seconds':>10}"]
+        lines += [f"{stage:<34}{seconds:>10.3f}" for stage, seconds in self.startup_timings]
+        lines += ["", "Pages built on first visit:"]
+        lines += [f"  {name:<32}{seconds:>10.3f}" for name, seconds in self.page_build_seconds.items()
+                  if name != "File & Data"]
+        unbuilt = [name for name in self.page_builders if name not in self.pages]
+        if unbuilt:
+            lines.append(f"  Not built yet: {', '.join(unbuilt)}")
+        lines += ["", "Modules imported on first use:"]
+        lines += [f"  {name:<32}{seconds:>10.3f}" for name, seconds in IMPORT_TIMINGS.items()]
+        pending = [name for name in DEFERRED_MODULES if name not in sys.modules]
+        if pending:
+            lines.append(f"  Not imported yet: {', '.join(pending)}")
+        deferred = sum(IMPORT_TIMINGS.values())
+        if deferred:
+            lines += ["", f"Import time moved out of startup so far: {deferred:.2f}s"]
+        return "\n".join(lines)
+
+    def show_startup_timings(self):
+        self.show_text_window("Startup Timings", self.startup_report())
 
     # ------------------ Page: File & Data ------------------
     def _build_file_data_page(self, parent):
@@ -251,6 +453,50 @@ class DataVizApp:
         tb.Label(file_frame, text="Upload your file:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         tb.Button(file_frame, text="Browse File", command=self.upload_file, bootstyle=SUCCESS).grid(row=0, column=1,
                                                                                                     padx=5, pady=5)
+        cancel_btn = tb.Button(file_frame, text="Cancel Load", command=self.cancel_load, bootstyle=DANGER,
+                               state="disabled")
+        cancel_btn.grid(row=0, column=2, padx=5, pady=5)
+        self.cancel_load_buttons.append(cancel_btn)
+        tb.Checkbutton(file_frame, text="Optimize memory (streaming ingest)", variable=self.optimize_memory_var).grid(
+            row=1, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        tb.Button(file_frame, text="Memory Report", command=self.show_memory_report, bootstyle=SECONDARY).grid(
+            row=1, column=2, padx=5, pady=5)
+        tb.Checkbutton(file_frame, text="Cache parsed files for fast reloads", variable=self.use_cache_var).grid(
+            row=2, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        tb.Button(file_frame, text="Clear Cache", command=self.clear_file_cache, bootstyle=SECONDARY).grid(
+            row=2, column=2, padx=5, pady=5)
+        tb.Checkbutton(file_frame, text="Out-of-core mode (keep large datasets on disk)",
+                       variable=self.out_of_core_var).grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        tb.Button(file_frame, text="Append Rows", command=self.append_rows_from_file, bootstyle=PRIMARY).grid(
+            row=3, column=2, padx=5, pady=5)
+        tb.Label(file_frame, text="Live refresh (read rows appended to the CSV):").grid(row=4, column=0, padx=5,
+                                                                                       pady=5, sticky="w")
+        tb.Button(file_frame, text="Start Live Refresh", command=self.start_live_refresh, bootstyle=SUCCESS).grid(
+            row=4, column=1, padx=5, pady=5)
+        stop_live_btn = tb.Button(file_frame, text="Stop Live Refresh", command=self.stop_live_refresh,
+                                  bootstyle=DANGER, state="normal" if self.live_running() else "disabled")
+        stop_live_btn.grid(row=4, column=2, padx=5, pady=5)
+        self.stop_live_buttons.append(stop_live_btn)
+        anomaly_frame = tb.Labelframe(parent, text="Anomaly Detection", padding=10, bootstyle=INFO)
+        anomaly_frame.pack(fill="x", padx=10, pady=5)
+        tb.Label(anomaly_frame, text="Columns (default: X/Y):").grid(row=0, column=0, padx=5, pady=5, sticky="nw")
+        self.anomaly_columns_list = Listbox(anomaly_frame, selectmode=MULTIPLE, height=4, exportselection=False)
+        self.anomaly_columns_list.grid(row=0, column=1, rowspan=2, padx=5, pady=5, sticky="ew")
+        tb.Label(anomaly_frame, text="Contamination:").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        tb.Entry(anomaly_frame, textvariable=self.anomaly_contamination_var, width=8).grid(row=0, column=3, padx=5,
+                                                                                          pady=5, sticky="w")
+        anomaly_btn_frame = tb.Frame(anomaly_frame)
+        anomaly_btn_frame.grid(row=1, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+        tb.Button(anomaly_btn_frame, text="Detect Anomalies", command=self.run_anomaly_detection,
+                  bootstyle=SUCCESS).pack(side=LEFT, padx=2)
+        self.cancel_anomaly_btn = tb.Button(anomaly_btn_frame, text="Cancel", command=self.cancel_anomaly_detection,
+                                            bootstyle=DANGER, state="disabled")
+        self.cancel_anomaly_btn.pack(side=LEFT, padx=2)
+        tb.Button(anomaly_btn_frame, text="Clear", command=self.clear_anomalies, bootstyle=SECONDARY).pack(side=LEFT,
+                                                                                                       padx=2)
+        tb.Button(anomaly_btn_frame, text="Export Flagged Rows", command=self.export_anomalies,
+                  bootstyle=PRIMARY).pack(side=LEFT, padx=2)
+        anomaly_frame.columnconfigure(1, weight=1)
         col_frame = tb.Labelframe(parent, text="Column Selection", padding=10, bootstyle=INFO)
         col_frame.pack(fill="x", padx=10, pady=5)
         tb.Label(col_frame, text="X-Axis Column:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
@@ -259,7 +505,7 @@ class DataVizApp:
         tb.Label(col_frame, text="Y-Axis Column:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
         self.y_col_menu = tb.Combobox(col_frame, state="readonly")
         self.y_col_menu.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
-        self.z_col_label = tb.Label(col_frame, text="Z-Axis Column (3D):")
+        self.z_col_label = tb.Label(col_frame, text="Z-Axis Column (3D / Gantt task / cluster):")
         self.z_col_menu = tb.Combobox(col_frame, state="readonly")
         self.z_col_label.grid(row=0, column=2, padx=5, pady=5, sticky="w")
         self.z_col_menu.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
@@ -269,8 +515,9 @@ class DataVizApp:
         custom_frame.pack(fill="x", padx=10, pady=5)
         tb.Label(custom_frame, text="Chart Type:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.custom_chart_type_cb = tb.Combobox(custom_frame, state="readonly", textvariable=self.custom_chart_type_var,
-                                                values=["Scatter", "Line", "Bar", "Area", "Bubble", "Pie", "Other"])
+                                                values=list(CHART_TYPES) + ["Other"])
         self.custom_chart_type_cb.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        self.custom_chart_type_cb.bind("<<ComboboxSelected>>", self.update_z_axis_visibility)
         tb.Label(custom_frame, text="Chart Title:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
         self.custom_chart_title_entry = tb.Entry(custom_frame, textvariable=self.custom_chart_title_var)
         self.custom_chart_title_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
@@ -294,13 +541,34 @@ class DataVizApp:
         tb.Button(conv_frame, text="Browse File", command=self.upload_file, bootstyle=SUCCESS).grid(row=0, column=1,
                                                                                                     padx=5, pady=5,
                                                                                                     sticky="w")
+        loading = self.load_thread is not None and self.load_thread.is_alive()
+        cancel_btn = tb.Button(conv_frame, text="Cancel Load", command=self.cancel_load, bootstyle=DANGER,
+                               state="normal" if loading else "disabled")
+        cancel_btn.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        self.cancel_load_buttons.append(cancel_btn)
         tb.Label(conv_frame, text="Output Format:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
-        self.output_format_cb = tb.Combobox(conv_frame, state="readonly", values=["CSV", "Excel", "SQLite"])
+        self.output_format_cb = tb.Combobox(conv_frame, state="readonly", values=list(CONVERT_FORMATS))
         self.output_format_cb.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
-        tb.Button(conv_frame, text="Convert File", command=self.convert_file, bootstyle=PRIMARY).grid(row=2, column=0,
+        tb.Label(conv_frame, text="SQLite Index Columns:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        tb.Entry(conv_frame, textvariable=self.sqlite_index_var).grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        tb.Button(conv_frame, text="Convert File", command=self.convert_file, bootstyle=PRIMARY).grid(row=3, column=0,
                                                                                                       columnspan=2,
                                                                                                       padx=5, pady=10,
                                                                                                       sticky="ew")
+        stream_frame = tb.Labelframe(conv_frame, text="Streaming Conversion (without loading)", padding=10,
+                                     bootstyle=INFO)
+        stream_frame.grid(row=4, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        tb.Button(stream_frame, text="Stream Convert File", command=self.stream_convert_file,
+                  bootstyle=PRIMARY).pack(side=LEFT, padx=5)
+        tb.Button(stream_frame, text="Batch Convert Folder", command=self.batch_convert_folder,
+                  bootstyle=PRIMARY).pack(side=LEFT, padx=5)
+        self.cancel_convert_btn = tb.Button(stream_frame, text="Cancel Conversion", command=self.cancel_conversion,
+                                            bootstyle=DANGER, state="disabled")
+        self.cancel_convert_btn.pack(side=LEFT, padx=5)
+        self.convert_progress = tb.Progressbar(stream_frame, mode="determinate", maximum=1.0, bootstyle=INFO)
+        self.convert_progress.pack(side=LEFT, fill=X, expand=True, padx=5)
+        self.convert_rate_label = tb.Label(stream_frame, text="")
+        self.convert_rate_label.pack(side=LEFT, padx=5)
         conv_frame.columnconfigure(1, weight=1)
 
     # ------------------ Page: Forecasting ------------------
@@ -311,7 +579,7 @@ class DataVizApp:
                                                 command=self.toggle_prediction)
         self.prediction_toggle.grid(row=0, column=0, padx=5, pady=5, sticky="w")
         tb.Label(fc_frame, text="Chart Type:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
-        self.chart_menu = tb.Combobox(fc_frame, state="readonly",
+        self.chart_menu = tb.Combobox(fc_frame, state="readonly", textvariable=self.chart_type_var,
                                       values=["Scatter", "Line", "Bar", "Pie", "Area", "Bubble",
                                               "Waterfall", "Histogram", "Funnel", "Gantt", "Donut", "Radar",
                                               "Treemap", "Box Plot", "Clustered Bar", "Flowchart", "Heatmap",
@@ -321,19 +589,50 @@ class DataVizApp:
         self.chart_menu.bind("<<ComboboxSelected>>", self.update_z_axis_visibility)
         tb.Label(fc_frame, text="Forecast Model:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
         self.forecast_model_cb = tb.Combobox(fc_frame, state="readonly", textvariable=self.forecast_model_var,
-                                             values=["Linear", "Polynomial", "ARIMA"])
+                                             values=["Linear", "Polynomial", "ARIMA", "Auto ARIMA"])
         self.forecast_model_cb.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
-        tb.Label(fc_frame, text="Forecast Horizon:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        tb.Label(fc_frame, text="Auto ARIMA Criterion:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        tb.Combobox(fc_frame, state="readonly", textvariable=self.arima_criterion_var,
+                    values=list(AUTO_ARIMA_CRITERIA)).grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        tb.Label(fc_frame, text="Forecast Horizon:").grid(row=4, column=0, padx=5, pady=5, sticky="w")
         self.forecast_horizon_entry = tb.Entry(fc_frame, textvariable=self.forecast_horizon_var)
-        self.forecast_horizon_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        self.forecast_horizon_entry.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
+        tb.Label(fc_frame, text="Group By (optional):").grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        self.forecast_group_cb = tb.Combobox(fc_frame, state="readonly", textvariable=self.forecast_group_var,
+                                             values=[""] + self.data_columns() if self.has_data() else [""])
+        self.forecast_group_cb.grid(row=5, column=1, padx=5, pady=5, sticky="ew")
         self.conf_int_cb = tb.Checkbutton(fc_frame, text="Show Confidence Interval", variable=self.conf_int_var)
-        self.conf_int_cb.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="w")
-        tb.Button(fc_frame, text="Visualize Forecast", command=self.generate_chart, bootstyle=PRIMARY).grid(row=5,
+        self.conf_int_cb.grid(row=6, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        tb.Button(fc_frame, text="Visualize Forecast", command=self.generate_chart, bootstyle=PRIMARY).grid(row=7,
                                                                                                             column=0,
                                                                                                             columnspan=2,
                                                                                                             padx=5,
                                                                                                             pady=10,
                                                                                                             sticky="ew")
+        forecast_btn_frame = tb.Frame(fc_frame)
+        forecast_btn_frame.grid(row=8, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        tb.Button(forecast_btn_frame, text="Queue Forecast", command=self.run_forecast,
+                  bootstyle=SUCCESS).pack(side=LEFT, padx=5)
+        self.cancel_forecast_btn = tb.Button(forecast_btn_frame, text="Cancel Forecasts",
+                                             command=self.cancel_forecasts, bootstyle=DANGER, state="disabled")
+        self.cancel_forecast_btn.pack(side=LEFT, padx=5)
+        self.forecast_progress = tb.Progressbar(forecast_btn_frame, mode="indeterminate", bootstyle=INFO)
+        self.forecast_progress.pack(side=LEFT, fill=X, expand=True, padx=5)
+        group_btn_frame = tb.Frame(fc_frame)
+        group_btn_frame.grid(row=9, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        tb.Button(group_btn_frame, text="Group Forecast Metrics", command=self.show_group_forecast_metrics,
+                  bootstyle=INFO).pack(side=LEFT, padx=5)
+        tb.Button(group_btn_frame, text="Export Group Forecasts", command=self.export_group_forecasts,
+                  bootstyle=INFO).pack(side=LEFT, padx=5)
+        backtest_frame = tb.Labelframe(fc_frame, text="Backtest (rolling origin)", padding=5)
+        backtest_frame.grid(row=10, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        tb.Label(backtest_frame, text="Folds:").pack(side=LEFT, padx=5)
+        tb.Entry(backtest_frame, textvariable=self.backtest_folds_var, width=5).pack(side=LEFT, padx=5)
+        tb.Label(backtest_frame, text="Window:").pack(side=LEFT, padx=5)
+        tb.Combobox(backtest_frame, state="readonly", textvariable=self.backtest_window_var,
+                    values=list(BACKTEST_WINDOWS), width=10).pack(side=LEFT, padx=5)
+        tb.Button(backtest_frame, text="Backtest Models", command=self.run_backtest,
+                  bootstyle=PRIMARY).pack(side=LEFT, padx=5)
         fc_frame.columnconfigure(1, weight=1)
 
     # ------------------ Page: Custom Dashboard ------------------
@@ -347,7 +646,6 @@ class DataVizApp:
         count_frame = tb.Frame(frame)
         count_frame.pack(fill=X, pady=5)
         tb.Label(count_frame, text="How many charts do you need?").pack(side=LEFT, padx=5)
-        self.chart_count_var = tb.StringVar(value="1")
         self.chart_count_entry = tb.Entry(count_frame, textvariable=self.chart_count_var, width=5)
         self.chart_count_entry.pack(side=LEFT, padx=5)
         tb.Button(count_frame, text="Generate Chart Options", command=self.generate_chart_options,
@@ -357,8 +655,19 @@ class DataVizApp:
         self.chart_options_frame = tb.Frame(frame)
         self.chart_options_frame.pack(fill=BOTH, expand=True, pady=10)
 
-        # Create Dashboard button
-        tb.Button(frame, text="Create Dashboard", command=self.create_dashboard, bootstyle=SUCCESS).pack(pady=10)
+        # Create / export dashboard buttons
+        action_frame = tb.Frame(frame)
+        action_frame.pack(pady=10)
+        tb.Button(action_frame, text="Create Dashboard", command=self.create_dashboard, bootstyle=SUCCESS).pack(
+            side=LEFT, padx=5)
+        tb.Button(action_frame, text="Export Dashboard HTML", command=self.export_dashboard,
+                  bootstyle=PRIMARY).pack(side=LEFT, padx=5)
+        tb.Button(action_frame, text="Save Dashboard", command=self.save_dashboard, bootstyle=INFO).pack(
+            side=LEFT, padx=5)
+        tb.Button(action_frame, text="Load Dashboard", command=self.load_dashboard, bootstyle=INFO).pack(
+            side=LEFT, padx=5)
+        tb.Button(action_frame, text="Open Live Dashboard", command=self.open_live_dashboard,
+                  bootstyle=SUCCESS).pack(side=LEFT, padx=5)
 
     def generate_chart_options(self):
         # Clear previous options
@@ -384,17 +693,16 @@ class DataVizApp:
             tb.Label(subframe, text="Chart Type:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
             chart_type_var = tb.StringVar(value="Scatter")
             chart_type_cb = tb.Combobox(subframe, state="readonly", textvariable=chart_type_var,
-                                        values=["Scatter", "Line", "Bar", "Pie", "Area", "Bubble", "Histogram"])
+                                        values=[name for name, spec in CHART_TYPES.items()
+                                                if spec.dashboard and "z" not in spec.requires])
             chart_type_cb.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
             tb.Label(subframe, text="X Column:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
             x_col_var = tb.StringVar()
-            x_col_cb = tb.Combobox(subframe, state="readonly", textvariable=x_col_var,
-                                   values=list(self.data.columns) if self.data is not None else [])
+            x_col_cb = tb.Combobox(subframe, state="readonly", textvariable=x_col_var, values=self.data_columns())
             x_col_cb.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
             tb.Label(subframe, text="Y Column:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
             y_col_var = tb.StringVar()
-            y_col_cb = tb.Combobox(subframe, state="readonly", textvariable=y_col_var,
-                                   values=list(self.data.columns) if self.data is not None else [])
+            y_col_cb = tb.Combobox(subframe, state="readonly", textvariable=y_col_var, values=self.data_columns())
             y_col_cb.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
 
             self.dashboard_chart_configs.append({
@@ -405,89 +713,256 @@ class DataVizApp:
 
     # New method to generate a chart figure without displaying it
     def generate_chart_figure(self, x_column, y_column, chart_type):
-        # Use similar logic as in create_visualization, but return the figure instead of calling show()
         x_column = self.get_column_name(x_column)
         y_column = self.get_column_name(y_column)
         fig = None
         try:
-            if chart_type == "Scatter":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=f"Scatter: {x_column} vs {y_column}")
-            elif chart_type == "Line":
-                fig = px.line(self.data, x=x_column, y=y_column,
-                              title=f"Line: {x_column} vs {y_column}")
-            elif chart_type == "Bar":
-                fig = px.bar(self.data, x=x_column, y=y_column,
-                             title=f"Bar: {x_column} vs {y_column}")
-            elif chart_type == "Pie":
-                fig = px.pie(self.data, names=x_column, values=y_column,
-                             title=f"Pie: {x_column} vs {y_column}")
-            elif chart_type == "Area":
-                fig = px.area(self.data, x=x_column, y=y_column,
-                              title=f"Area: {x_column} vs {y_column}")
-            elif chart_type == "Bubble":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=f"Bubble: {x_column} vs {y_column}",
-                                 size=self.data.index, color=self.data.index, color_continuous_scale='Viridis')
-            elif chart_type == "Histogram":
-                fig = px.histogram(self.data, x=x_column,
-                                   title=f"Histogram: {x_column}")
-            else:
+            if get_chart_type(chart_type) is None:
                 # If the chart type is not implemented, return an empty figure
-                fig = go.Figure()
+                fig = apply_chart_theme(go.Figure(), self.chart_theme())
                 fig.add_annotation(text=f"Chart type '{chart_type}' not implemented", showarrow=False)
-            # Update layout for consistency
-            fig.update_layout(title_font=dict(family=self.font_family_var.get(),
-                                              size=int(self.font_size_var.get()) + 8,
-                                              color=self.chart_title_color),
-                              xaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              yaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              font=dict(color=self.axis_label_color),
-                              margin=dict(l=60, r=60, t=60, b=60))
+            else:
+                fig = self.dashboard_chart_figure(DashboardChart(chart_type, x_column, y_column),
+                                                  self.chart_settings(), load_columns=self.dashboard_columns)
         except Exception as e:
             messagebox.showerror("Error", f"Error generating chart: {e}")
         return fig
 
-    # Modified create_dashboard: Combine all charts into one dashboard using subplots
-    def create_dashboard(self):
-        if self.data is None:
+    def dashboard_columns(self, columns):
+        return self.column_frame(columns, max_rows=OUT_OF_CORE_CHART_ROWS)
+
+    # Thread-safe: touches no Tk state, all settings are passed in. Charts come from the persisted aggregates
+    # when they hold them; load_columns is None when no matching dataset is loaded.
+    def dashboard_chart_figure(self, chart, settings, aggregates=None, load_columns=None):
+        fingerprint = aggregates.fingerprint if aggregates is not None else None
+        key = self.figure_key("dashboard", fingerprint, *chart, settings=settings)
+        fig = self.figure_cache.get(key)
+        if fig is None:
+            fig = build_dashboard_chart(self.chart_engine, chart, settings, aggregates, load_columns)[0]
+            self.figure_cache.put(key, fig)
+        return fig
+
+    def _timed_dashboard_chart(self, chart, settings, aggregates, load_columns):
+        start = time.perf_counter()
+        fig = self.dashboard_chart_figure(chart, settings, aggregates, load_columns)
+        return fig, time.perf_counter() - start
+
+    # Validate the chart options; available is the set of data columns, or None to skip the column check
+    def dashboard_charts(self, available=None):
+        problems = []
+        charts = []
+        for i, config in enumerate(self.dashboard_chart_configs, start=1):
+            chart_type = config["chart_type_var"].get()
+            columns = {"x": self.get_column_name(config["x_col_var"].get()),
+                       "y": self.get_column_name(config["y_col_var"].get())}
+            spec = get_chart_type(chart_type)
+            if spec is None or not spec.dashboard:
+                problems.append(f"Chart {i}: chart type '{chart_type}' is not available in dashboards.")
+                continue
+            missing = spec.missing_roles(columns)
+            if missing:
+                problems.append(f"Chart {i}: please select the {' and '.join(r.upper() for r in missing)} column.")
+                continue
+            unknown = [c for c in spec.used_columns(columns) if available is not None and c not in available]
+            if unknown:
+                problems.append(f"Chart {i}: column(s) not found: {', '.join(unknown)}.")
+                continue
+            charts.append(DashboardChart(spec.name, columns["x"], columns["y"]))
+        if problems:
+            messagebox.showerror("Error", "Please fix the dashboard configuration:\n" + "\n".join(problems))
+            self.update_status("Dashboard configuration is invalid.", error=True)
+            return None
+        return charts
+
+    def dashboard_busy(self):
+        if self.dashboard_futures and not all(f.done() for f in self.dashboard_futures):
+            messagebox.showinfo("Dashboard", "A dashboard is already being built. Please wait.")
+            return True
+        return False
+
+    # Modified create_dashboard: Combine all charts into one dashboard using subplots.
+    # Every chart is validated first, then all figures are built concurrently on the chart pool.
+    def create_dashboard(self, export_path=None):
+        if not self.has_data():
             messagebox.showerror("Error", "Please upload a dataset in the File & Data tab first.")
             return
 
-        num_charts = len(self.dashboard_chart_configs)
-        if num_charts == 0:
+        if not self.dashboard_chart_configs:
             messagebox.showerror("Error", "No chart configurations available.")
             return
+        if self.dashboard_busy():
+            return
+        charts = self.dashboard_charts(set(self.data_columns()))
+        if charts is None:
+            return
+
+        settings = self.chart_settings()
+        self.dashboard_aggregates = self.dashboard_aggregates.for_dataset(self.dataset_fingerprint,
+                                                                          settings["max_points"])
+        self.start_dashboard(charts, settings, self.dashboard_aggregates, self.dashboard_columns, export_path)
+
+    def start_dashboard(self, charts, settings, aggregates, load_columns, export_path=None, title=DASHBOARD_TITLE,
+                        on_built=None):
+        self.dashboard_futures = [self.chart_executor.submit(self._timed_dashboard_chart, chart, settings, aggregates,
+                                                             load_columns)
+                                  for chart in charts]
+        self.update_status(f"Building {len(charts)} dashboard charts...")
+        self.master.after(DASHBOARD_POLL_MS, self._poll_dashboard, time.perf_counter(), export_path, title, on_built)
+
+    def export_dashboard(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".html", filetypes=[("HTML Files", "*.html")])
+        if not file_path:
+            self.update_status("Dashboard export cancelled.")
+            return
+        self.create_dashboard(export_path=file_path)
 
-        # Calculate grid dimensions for the dashboard (roughly square)
-        cols = int(math.ceil(math.sqrt(num_charts)))
-        rows = int(math.ceil(num_charts / cols))
+    # Save the chart options and chart settings as a JSON spec, together with the reduced data of every chart so
+    # that the dashboard reopens on an unchanged dataset without reading it
+    def save_dashboard(self):
+        if not self.has_data():
+            messagebox.showerror("Error", "Please upload a dataset in the File & Data tab first.")
+            return
+        if not self.dashboard_chart_configs:
+            messagebox.showerror("Error", "No chart configurations available.")
+            return
+        charts = self.dashboard_charts(set(self.data_columns()))
+        if charts is None:
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Dashboard Specs", "*.json")])
+        if not file_path:
+            self.update_status("Dashboard save cancelled.")
+            return
+        settings = self.chart_settings()
+        aggregates = self.dashboard_aggregates.for_dataset(self.dataset_fingerprint, settings["max_points"])
+        try:
+            if aggregates.fingerprint is not None:
+                missing = [chart for chart in dict.fromkeys(charts) if aggregates.get(chart) is None]
+                reduced = self.chart_executor.map(lambda chart: reduce_dashboard_chart(
+                    self.chart_engine, chart, settings["max_points"], self.dashboard_columns), missing)
+                for chart, result in zip(missing, reduced):
+                    aggregates.put(chart, result)
+            dataset = {"path": os.path.abspath(self.file_path), "sqlite_query": self.sqlite_query}
+            saved, skipped = save_dashboard_spec(file_path, DashboardSpec(charts, settings, dataset, aggregates))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save dashboard: {e}")
+            self.update_status("Failed to save dashboard.", error=True)
+            return
+        self.dashboard_aggregates = aggregates
+        message = f"Dashboard saved to {file_path} ({saved} of {len(charts)} charts with precomputed data)."
+        if skipped:
+            message += f" Data could not be stored for {', '.join(skipped)}; they are rebuilt from the dataset."
+        self.update_status(message, error=bool(skipped))
+
+    # Open a saved dashboard and render it with its saved settings: from the saved chart data while the dataset
+    # is unchanged, otherwise from the loaded dataset (refreshing the saved data when it is the spec's own dataset)
+    def load_dashboard(self):
+        if self.dashboard_busy():
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("Dashboard Specs", "*.json")])
+        if not file_path:
+            self.update_status("Dashboard load cancelled.")
+            return
+        try:
+            spec = load_dashboard_spec(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load dashboard: {e}")
+            self.update_status("Failed to load dashboard.", error=True)
+            return
+        self.restore_dashboard_configs(spec.charts)
+        charts = self.dashboard_charts(set(self.data_columns()) if self.has_data() else None)
+        if charts is None:
+            return
 
-        # Create subplots with appropriate titles
-        subplot_titles = [f"Chart {i + 1}" for i in range(num_charts)]
-        combined_fig = make_subplots(rows=rows, cols=cols, subplot_titles=subplot_titles)
+        dataset = spec.dataset or {}
+        if self.has_data():
+            fingerprint, load_columns = self.dataset_fingerprint, self.dashboard_columns
+            same_file = self.file_path is not None and dataset.get("path") == os.path.abspath(self.file_path)
+        else:
+            try:
+                fingerprint = dataset_fingerprint(dataset["path"], dataset.get("sqlite_query"))
+            except (KeyError, OSError):
+                fingerprint = None
+            load_columns, same_file = None, False
+        aggregates = (spec.aggregates or DashboardAggregates()).for_dataset(fingerprint, spec.settings["max_points"])
+        skipped = f"Saved data could not be read for {', '.join(spec.skipped)}." if spec.skipped else ""
+        if load_columns is None and any(aggregates.get(chart) is None for chart in charts):
+            reason = skipped or ("The saved chart data no longer matches the dataset "
+                                 f"({dataset.get('path', 'unknown')}).")
+            messagebox.showerror("Error", f"{reason} Please upload the dataset in the File & Data tab and load the "
+                                          "dashboard again.")
+            self.update_status("Saved dashboard data is out of date or unreadable.", error=True)
+            return
 
-        chart_index = 0
-        for config in self.dashboard_chart_configs:
-            chart_type = config["chart_type_var"].get()
-            x_col = config["x_col_var"].get()
-            y_col = config["y_col_var"].get()
-            if not x_col or not y_col:
-                messagebox.showerror("Error", "Please select X and Y columns for all charts.")
+        self.dashboard_aggregates = aggregates
+        on_built = None
+        if same_file:
+            known = len(aggregates.charts)
+
+            def on_built():
+                self._refresh_saved_dashboard(file_path, spec, aggregates, known)
+        if skipped:
+            refresh = on_built
+
+            def on_built():
+                self.update_status(f"Dashboard loaded. {skipped} Those charts were rebuilt from the dataset.",
+                                   error=True)
+                if refresh is not None:
+                    refresh()
+        self.start_dashboard(charts, spec.settings, aggregates, load_columns, title=spec.title, on_built=on_built)
+
+    def restore_dashboard_configs(self, charts):
+        self.chart_count_var.set(str(len(charts)))
+        self.generate_chart_options()
+        for config, chart in zip(self.dashboard_chart_configs, charts):
+            config["chart_type_var"].set(chart.chart)
+            config["x_col_var"].set(chart.x)
+            config["y_col_var"].set(chart.y)
+
+    # Rewrite a loaded spec when some of its charts had to be rebuilt from the data
+    def _refresh_saved_dashboard(self, file_path, spec, aggregates, known):
+        if len(aggregates.charts) <= known:
+            return
+        dataset = {"path": os.path.abspath(self.file_path), "sqlite_query": self.sqlite_query}
+        try:
+            save_dashboard_spec(file_path, spec._replace(dataset=dataset, aggregates=aggregates))
+        except Exception as e:
+            self.update_status(f"Dashboard shown, but its saved data could not be updated: {e}", error=True)
+
+    def _poll_dashboard(self, start, export_path=None, title=DASHBOARD_TITLE, on_built=None):
+        futures = self.dashboard_futures
+        if not all(f.done() for f in futures):
+            self.master.after(DASHBOARD_POLL_MS, self._poll_dashboard, start, export_path, title, on_built)
+            return
+        figures, timings, failures = [], [], []
+        for i, future in enumerate(futures, start=1):
+            try:
+                fig, seconds = future.result()
+            except Exception as e:
+                fig, seconds = None, 0.0
+                failures.append(f"Chart {i}: {e}")
+            figures.append(fig)
+            timings.append(seconds)
+
+        combined_fig = dashboard_figure(figures, title)
+        per_chart = ", ".join(f"{i}: {t:.2f}s" for i, t in enumerate(timings, start=1))
+        if export_path:
+            try:
+                n_arrays = export_dashboard_html(combined_fig, export_path, title)
+            except Exception as e:
+                messagebox.showerror("Error", f"Dashboard export failed: {e}")
+                self.update_status("Dashboard export failed.", error=True)
                 return
-            # Generate individual chart figure
-            fig = self.generate_chart_figure(x_col, y_col, chart_type)
-            # Determine the subplot position
-            row = chart_index // cols + 1
-            col = chart_index % cols + 1
-            # Add all traces from the individual figure to the subplot
-            for trace in fig.data:
-                combined_fig.add_trace(trace, row=row, col=col)
-            chart_index += 1
-
-        combined_fig.update_layout(height=rows * 400, width=cols * 600, title_text="Custom Dashboard")
-        combined_fig.show()
-        self.update_status("Custom dashboard created successfully.")
+            size_mb = os.path.getsize(export_path) / 1e6
+            self.update_status(f"Dashboard exported to {export_path} ({size_mb:.1f} MB, {n_arrays} shared arrays) in "
+                               f"{time.perf_counter() - start:.2f}s (per chart: {per_chart}).", error=bool(failures))
+        else:
+            self.show_figure(combined_fig)
+            self.update_status(f"Custom dashboard created in {time.perf_counter() - start:.2f}s "
+                               f"(per chart: {per_chart}).", error=bool(failures))
+        if on_built is not None:
+            on_built()
+        if failures:
+            messagebox.showerror("Error", "Some dashboard charts failed:\n" + "\n".join(failures))
 
     # ------------------ Page: Settings ------------------
     def _build_settings_page(self, parent):
@@ -536,6 +1011,22 @@ class DataVizApp:
         self.color_palette_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         chart_frame.columnconfigure(1, weight=1)
 
+        large_frame = tb.Labelframe(scroll_frame, text="Large Data Rendering", padding=10, bootstyle=INFO)
+        large_frame.pack(fill="x", padx=10, pady=5)
+        tb.Label(large_frame, text="Max points per chart (larger data is aggregated or downsampled):").grid(
+            row=0, column=0, padx=5, pady=5, sticky="w")
+        tb.Entry(large_frame, textvariable=self.chart_max_points_var, width=10).grid(row=0, column=1, padx=5, pady=5,
+                                                                                     sticky="w")
+        tb.Label(large_frame, text="Use WebGL for Scatter/Line/Bubble above (points):").grid(
+            row=1, column=0, padx=5, pady=5, sticky="w")
+        tb.Entry(large_frame, textvariable=self.webgl_threshold_var, width=10).grid(row=1, column=1, padx=5, pady=5,
+                                                                                    sticky="w")
+        tb.Button(large_frame, text="Chart Build Timings", command=self.show_chart_timings,
+                  bootstyle=SECONDARY).grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        tb.Button(large_frame, text="Startup Timings", command=self.show_startup_timings,
+                  bootstyle=SECONDARY).grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        large_frame.columnconfigure(1, weight=1)
+
         btn_frame = tb.Frame(scroll_frame, padding=10)
         btn_frame.pack(fill="x", padx=10, pady=5)
         tb.Button(btn_frame, text="Reset to Defaults", command=self.reset_settings, bootstyle=DANGER).grid(row=0,
@@ -553,15 +1044,18 @@ class DataVizApp:
         about_frame = tb.Labelframe(scroll_frame, text="About", padding=10, bootstyle=INFO)
         about_frame.pack(fill="both", expand=True, padx=10, pady=5)
         about_text = (
-            "This application is designed to help with data cleaning, forecasting, anomaly detection, and visualization.\n\n"
+            "This application is designed to help with data cleaning, forecasting, anomaly detection, and "
+            "visualization.\n\n"
             "Features include:\n"
             "• File upload and column selection.\n"
             "• File conversion between CSV, Excel, and SQLite formats.\n"
-            "• Forecasting using Linear, Polynomial, and ARIMA models with adjustable forecasting horizon and confidence intervals.\n"
+            "• Forecasting using Linear, Polynomial, and ARIMA models with adjustable forecasting horizon and "
+            "confidence intervals.\n"
             "• Custom chart creation with title, color, and formatting options.\n"
             "• Custom Dashboard creation where you can specify multiple charts to generate a dashboard view.\n\n"
             "Developed by: ONKAR SINGH P\nVersion 2.0\n"
-            "This interface uses a modern three-pane design with a left navigation sidebar, central content area, and right suggestions panel."
+            "This interface uses a modern three-pane design with a left navigation sidebar, central content area, "
+            "and right suggestions panel."
         )
         tb.Label(about_frame, text=about_text, wraplength=600, justify="left").pack(padx=5, pady=5)
 
@@ -582,29 +1076,34 @@ class DataVizApp:
                                   background="#ffffff")
         self.sug_label.pack(pady=10)
 
+    # Profile and rank on a worker thread; the panel is refreshed when the result arrives
     def update_suggestions(self):
-        if self.data is not None:
-            self.display_suggestions()
+        if not self.has_data():
+            return
+        index = self.column_index
+        future = self.chart_executor.submit(lambda: suggest_charts(*index.profile()))
+        self.master.after(SUGGESTION_POLL_MS, self._poll_suggestions, future, index)
+
+    def _poll_suggestions(self, future, index):
+        if not future.done():
+            self.master.after(SUGGESTION_POLL_MS, self._poll_suggestions, future, index)
+            return
+        if index is not self.column_index:
+            # Another dataset was loaded while profiling; its own request updates the panel
+            return
+        try:
+            suggestions = future.result()
+        except Exception as e:
+            self.update_status(f"Chart suggestions failed: {e}", error=True)
+            return
+        # Appended rows (live refresh) re-profile often; only redraw the panel when the ranking changes
+        if suggestions != self.shown_suggestions:
+            self.shown_suggestions = suggestions
+            self.display_suggestions(suggestions)
 
-    def display_suggestions(self):
+    def display_suggestions(self, unique_suggestions):
         for widget in self.sug_inner.winfo_children():
             widget.destroy()
-        all_cols = list(self.data.columns)
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = self.data.select_dtypes(exclude=[np.number]).columns.tolist()
-        suggestions = []
-        for x, y in itertools.permutations(all_cols, 2):
-            if x in numeric_cols and y in numeric_cols:
-                suggestions.append(("Scatter", x, y))
-                suggestions.append(("Line", x, y))
-                suggestions.append(("Bar", x, y))
-                suggestions.append(("Bubble", x, y))
-            elif x in categorical_cols and y in numeric_cols:
-                suggestions.append(("Bar", x, y))
-                suggestions.append(("Pie", x, y))
-        for col in numeric_cols:
-            suggestions.append(("Histogram", col, ""))
-        unique_suggestions = list(dict.fromkeys(suggestions))[:10]
         if unique_suggestions:
             lbl = tb.Label(self.sug_inner, text="Chart Suggestions:", font=(self.base_font_family, 12, "bold"),
                            background="#ffffff")
@@ -623,73 +1122,613 @@ class DataVizApp:
     def suggestion_clicked(self, chart, x, y):
         self.x_col_menu.set(x)
         self.y_col_menu.set(y)
-        self.chart_menu.set(chart)
+        self.chart_type_var.set(chart)
         self.create_visualization(x, y, chart)
 
     # ------------------ File and Data Methods ------------------
     def upload_file(self):
-        self.file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")])
-        if not self.file_path:
+        if self.load_thread is not None and self.load_thread.is_alive():
+            messagebox.showinfo("Loading", "A file is already loading. Please wait or cancel it first.")
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx"),
+                                                          ("SQLite DB", " ".join("*" + e for e in SQLITE_EXTENSIONS))])
+        if not file_path:
             self.update_status("File upload cancelled.")
             return
+        sqlite_query = None
+        if is_sqlite_file(file_path):
+            try:
+                sqlite_query = self.ask_sqlite_query(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read SQLite database: {e}")
+                self.update_status("Failed to read SQLite database.", error=True)
+                return
+            if sqlite_query is None:
+                self.update_status("File upload cancelled.")
+                return
+        self.loading_file_path = file_path
+        self.loading_sqlite_query = sqlite_query
+        self.load_queue = queue.Queue()
+        self.load_cancel_event = threading.Event()
+        self.load_thread = threading.Thread(target=self._load_file_worker,
+                                            args=(file_path, self.load_cancel_event, self.load_queue,
+                                                  self.optimize_memory_var.get(), self.use_cache_var.get(),
+                                                  self.out_of_core_var.get(), sqlite_query),
+                                            daemon=True)
+        self._set_cancel_load_state("normal")
+        self.update_status(f"Loading {file_path}...")
+        self.load_thread.start()
+        self.master.after(LOAD_POLL_MS, self._poll_load_queue)
+
+    # Pick the table, the columns to load and an optional WHERE filter; all three are pushed down into SQLite
+    def ask_sqlite_query(self, file_path):
+        tables = sqlite_tables(file_path)
+        if not tables:
+            raise ValueError("The database contains no tables.")
+        table = tables[0]
+        if len(tables) > 1:
+            table = simpledialog.askstring("SQLite Table", f"Table to load ({', '.join(tables)}):",
+                                           initialvalue=table)
+            if table is None:
+                return None
+            if table not in tables:
+                raise ValueError(f"Unknown table '{table}'.")
+        available = sqlite_table_columns(file_path, table)
+        columns = simpledialog.askstring("SQLite Columns",
+                                         f"Columns to load, comma-separated (blank for all):\n{', '.join(available)}")
+        if columns is None:
+            return None
+        columns = [c.strip() for c in columns.split(",") if c.strip()]
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        where = simpledialog.askstring("SQLite Filter", "Row filter, as an SQL WHERE clause (blank for all rows):")
+        if where is None:
+            return None
+        return SQLiteQuery(table, tuple(columns) or None, validate_sqlite_where(where.strip()) or None)
+
+    def cancel_load(self):
+        if self.load_cancel_event is not None and self.load_thread is not None and self.load_thread.is_alive():
+            self.load_cancel_event.set()
+            self.update_status("Cancelling file load...")
+
+    def _set_cancel_load_state(self, state):
+        for btn in self.cancel_load_buttons:
+            btn.config(state=state)
+
+    # Runs on the worker thread: never touch Tk widgets here, only post messages to the queue
+    def _load_file_worker(self, file_path, cancel_event, result_queue, optimize, use_cache, out_of_core,
+                          sqlite_query=None):
+        def progress(fraction, rows):
+            result_queue.put(("progress", (fraction, rows)))
+
+        try:
+            if out_of_core:
+                dataset = SQLiteDataset.from_file(file_path, cancel_event, progress, sqlite_query=sqlite_query)
+                result_queue.put(("done", (dataset, None, False)))
+            else:
+                result_queue.put(("done", load_dataset(file_path, cancel_event, progress, optimize, use_cache,
+                                                       sqlite_query)))
+        except LoadCancelled:
+            result_queue.put(("cancelled", None))
+        except Exception as e:
+            result_queue.put(("error", e))
+
+    def _poll_load_queue(self):
+        latest_progress = None
+        while True:
+            try:
+                kind, payload = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest_progress = payload
+                continue
+            self._set_cancel_load_state("disabled")
+            if kind == "done":
+                data, self.memory_report, from_cache = payload
+                self.file_path, self.sqlite_query = self.loading_file_path, self.loading_sqlite_query
+                if isinstance(data, SQLiteDataset):
+                    self.data, self.dataset = None, data
+                else:
+                    self.data, self.dataset = data, None
+                self.load_generation += 1
+                self.forecaster = None
+                self.anomalies = self.anomaly_result = None
+                try:
+                    self.dataset_fingerprint = dataset_fingerprint(self.file_path, self.sqlite_query)
+                except OSError:
+                    self.dataset_fingerprint = None
+                self.stop_live_refresh()
+                self.live_dashboard = None
+                self.file_rows = self.data_length()
+                self.bump_data_version()
+                self.update_dropdowns()
+                self.update_suggestions()
+                message = f"File loaded: {self.file_path} ({self.data_length():,} rows"
+                if self.dataset is not None:
+                    message += ", out-of-core"
+                if self.memory_report is not None:
+                    before, after = self.memory_report["before"].sum(), self.memory_report["after"].sum()
+                    message += f", {before / 1e6:,.1f} MB -> {after / 1e6:,.1f} MB"
+                if from_cache:
+                    message += ", from cache"
+                self.update_status(message + ")")
+            elif kind == "cancelled":
+                self.update_status("File load cancelled.")
+            else:
+                messagebox.showerror("Error", f"Failed to load file: {payload}")
+                self.update_status("Failed to load file.", error=True)
+            return
+        if latest_progress is not None:
+            fraction, rows = latest_progress
+            if fraction is None:
+                self.update_status(f"Loading {self.loading_file_path}...")
+            else:
+                self.update_status(f"Loading {self.loading_file_path}... {fraction:.0%} ({rows:,} rows)")
+        self.master.after(LOAD_POLL_MS, self._poll_load_queue)
+
+    def append_rows_from_file(self):
+        if self.data is None:
+            messagebox.showerror("Error", "Please upload a dataset first (not available in out-of-core mode).")
+            self.update_status("Append failed: no in-memory dataset loaded.", error=True)
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")])
+        if not file_path:
+            self.update_status("Append cancelled.")
+            return
+        try:
+            rows = pd.read_excel(file_path) if file_path.endswith(".xlsx") else pd.read_csv(file_path)
+            self.append_rows(rows)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to append rows: {e}")
+            self.update_status("Failed to append rows.", error=True)
+
+    # Append new rows (same columns as the loaded data) and bring the last forecast up to date without refitting
+    def append_rows(self, rows):
+        if self.data is None:
+            raise ValueError("Appending requires an in-memory dataset.")
+        unknown = [c for c in rows.columns if c not in self.data.columns]
+        if unknown:
+            raise ValueError(f"Columns not in the loaded data: {', '.join(map(str, unknown))}")
+        rows = rows.reindex(columns=self.data.columns)
+        for col in self.data.columns:
+            if isinstance(self.data[col].dtype, pd.CategoricalDtype):
+                rows[col] = rows[col].astype("category")
+            elif pd.api.types.is_float_dtype(self.data[col]) and pd.api.types.is_numeric_dtype(rows[col]):
+                # Keep downcast float32 columns from being widened back to float64
+                rows[col] = rows[col].astype(self.data[col].dtype)
+        start = len(self.data)
+        self.data = concat_chunks([self.data, rows])
+        # The data no longer matches its file, so dashboard aggregates are not persisted for it
+        self.dataset_fingerprint = None
+        self.bump_data_version(appended=True)
+        message = f"Appended {len(rows):,} rows ({len(self.data):,} total)."
+        if self.forecaster is not None:
+            updated = time.perf_counter()
+            self.update_forecast(start)
+            message += f" Forecast updated in {time.perf_counter() - updated:.3f}s."
+        self.update_suggestions()
+        self.update_status(message)
+
+    # Feed rows from position start onwards into the incremental forecaster and refresh Prediction / forecast
+    def update_forecast(self, start):
+        x_column, y_column, forecaster = self.forecaster
+        X_series = self.column_index.numeric(x_column)
+        y_series = self.column_index.numeric(y_column)
+        valid_mask = (X_series.notna() & y_series.notna()).to_numpy()
+        new_mask = valid_mask.copy()
+        new_mask[:start] = False
+        if not new_mask.any():
+            return
+        X_new = X_series.to_numpy()[new_mask].reshape(-1, 1)
+        y_pred_new, result = forecaster.update(X_new, y_series.to_numpy()[new_mask])
+        if forecaster.results is None:
+            # Coefficients changed: re-evaluate the (cheap) fitted curve for every row, no refit involved
+            self.data.loc[valid_mask, "Prediction"] = forecaster.predict(X_series.to_numpy()[valid_mask])
+        else:
+            self.data.loc[new_mask, "Prediction"] = y_pred_new
+        self.forecast_x, self.forecast_y, self.forecast_ci = result.forecast_x, result.forecast_y, result.forecast_ci
+        self.bump_data_version(columns=["Prediction"])
+
+    def clear_file_cache(self):
         try:
-            if self.file_path.endswith(".csv"):
-                self.data = pd.read_csv(self.file_path)
-            elif self.file_path.endswith(".xlsx"):
-                self.data = pd.read_excel(self.file_path)
-            self.update_dropdowns()
-            self.update_suggestions()
-            self.update_status(f"File loaded: {self.file_path}")
+            clear_cache(keep=(self.dataset.db_path,) if self.dataset is not None else ())
+            self.update_status("File cache cleared.")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {e}")
-            self.update_status("Failed to load file.", error=True)
+            messagebox.showerror("Error", f"Failed to clear cache: {e}")
+            self.update_status("Failed to clear cache.", error=True)
+
+    def show_memory_report(self):
+        if self.memory_report is None:
+            messagebox.showinfo("Memory Report", "No memory report available. Load a file with memory optimization on.")
+            return
+        self.show_text_window("Memory Report", format_memory_report(self.memory_report))
+
+    def show_text_window(self, title, text):
+        window = tb.Toplevel(self.master)
+        window.title(title)
+        window.geometry("900x500")
+        text_widget = tb.Text(window, wrap="none", font=("Courier New", 10))
+        vsb = tb.Scrollbar(window, orient="vertical", command=text_widget.yview)
+        text_widget.configure(yscrollcommand=vsb.set)
+        vsb.pack(side=RIGHT, fill=Y)
+        text_widget.pack(side=LEFT, fill=BOTH, expand=True)
+        text_widget.insert("1.0", text)
+        text_widget.configure(state="disabled")
 
     def update_dropdowns(self):
-        if self.data is not None:
-            columns = list(self.data.columns)
+        if self.has_data():
+            columns = self.data_columns()
             self.x_col_menu['values'] = columns
             self.y_col_menu['values'] = columns
             self.z_col_menu['values'] = columns
+            if "Forecasting" in self.pages:
+                self.forecast_group_cb['values'] = [""] + columns
+            self.anomaly_columns_list.delete(0, "end")
+            for col in columns:
+                self.anomaly_columns_list.insert("end", col)
 
     def update_z_axis_visibility(self, event=None):
-        selected_chart = self.chart_menu.get()
-        if "3D" in selected_chart:
+        selected_chart = event.widget.get() if event is not None else self.chart_type_var.get()
+        spec = get_chart_type(selected_chart)
+        if spec is not None and "z" in spec.roles:
             self.z_col_label.grid()
             self.z_col_menu.grid()
         else:
             self.z_col_label.grid_remove()
             self.z_col_menu.grid_remove()
 
+    # ------------------ Live Refresh ------------------
+    def live_running(self):
+        return self.live_thread is not None and self.live_thread.is_alive()
+
+    def _set_stop_live_state(self, state):
+        for btn in self.stop_live_buttons:
+            btn.config(state=state)
+
+    # Tail the loaded CSV: rows appended to the file are added to the data, the forecast, the suggestions and
+    # the live dashboard
+    def start_live_refresh(self):
+        if self.live_running():
+            messagebox.showinfo("Live Refresh", "Live refresh is already running.")
+            return
+        if self.data is None or not self.file_path or not self.file_path.endswith(".csv"):
+            messagebox.showerror("Error", "Live refresh needs a CSV file loaded in memory (not out-of-core).")
+            self.update_status("Live refresh needs an in-memory CSV dataset.", error=True)
+            return
+        try:
+            tail = CSVTail(self.file_path, csv_data_offset(self.file_path, self.file_rows))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start live refresh: {e}")
+            self.update_status("Failed to start live refresh.", error=True)
+            return
+        self.live_queue = queue.Queue()
+        self.live_stop_event = threading.Event()
+        self.live_thread = threading.Thread(target=self._live_worker,
+                                            args=(tail, self.live_stop_event, self.live_queue), daemon=True)
+        self.live_thread.start()
+        self._set_stop_live_state("normal")
+        self.update_status(f"Live refresh on: watching {self.file_path} for new rows.")
+        self.master.after(LIVE_POLL_MS, self._poll_live, self.live_queue)
+
+    def stop_live_refresh(self):
+        if not self.live_running():
+            return
+        self.live_stop_event.set()
+        # Rows already read but not yet appended are dropped; a restart resumes after self.file_rows
+        self.live_queue = None
+        self._set_stop_live_state("disabled")
+        self.update_status("Live refresh stopped.")
+
+    # Runs on the worker thread: never touch Tk widgets here, only post messages to the queue
+    def _live_worker(self, tail, stop_event, result_queue):
+        while not stop_event.wait(LIVE_POLL_MS / 1000):
+            try:
+                rows = tail.read()
+            except Exception as e:
+                result_queue.put(("error", e))
+                return
+            if rows is not None:
+                result_queue.put(("rows", rows))
+
+    def _poll_live(self, result_queue):
+        if result_queue is not self.live_queue:
+            return
+        batches, error = [], None
+        while True:
+            try:
+                kind, payload = result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "rows":
+                batches.append(payload)
+            else:
+                error = payload
+        if batches:
+            start = len(self.data)
+            try:
+                self.append_rows(pd.concat(batches, ignore_index=True))
+            except Exception as e:
+                error = e
+            else:
+                self.file_rows += len(self.data) - start
+                if self.live_dashboard is not None:
+                    snapshot = self.live_dashboard.snapshot(self.data)
+                    self._submit_live(self.live_dashboard.push, self.viewer, snapshot,
+                                      max(0, len(snapshot) - (len(self.data) - start)))
+        if error is not None:
+            self.stop_live_refresh()
+            messagebox.showerror("Error", f"Live refresh stopped: {error}")
+            self.update_status("Live refresh stopped after an error.", error=True)
+            return
+        self.master.after(LIVE_POLL_MS, self._poll_live, result_queue)
+
+    # The chart viewer page, started on first use; a browser tab is opened when no page is connected
+    def chart_viewer(self):
+        if self.viewer is None:
+            self.viewer = ChartServer()
+        if self.viewer.client_count() == 0:
+            webbrowser.open(self.viewer.url)
+        return self.viewer
+
+    # Charts replace each other in the one viewer page instead of opening a browser tab per figure; viewer work
+    # runs on the live thread, so it stays ordered with pending live updates
+    def show_figure(self, fig):
+        try:
+            viewer = self.chart_viewer()
+        except OSError as e:
+            self.update_status(f"Chart viewer unavailable ({e}); opening the chart in a browser tab.", error=True)
+            fig.show()
+            return
+        self.live_dashboard = None
+        self._submit_live(viewer.show, fig)
+
+    # Show the dashboard in the chart viewer; while live refresh runs, appended rows are pushed to it
+    def open_live_dashboard(self):
+        if self.data is None:
+            messagebox.showerror("Error", "Please upload a dataset in the File & Data tab first (not out-of-core).")
+            return
+        if not self.dashboard_chart_configs:
+            messagebox.showerror("Error", "No chart configurations available.")
+            return
+        charts = self.dashboard_charts(set(self.data_columns()))
+        if charts is None:
+            return
+        try:
+            viewer = self.chart_viewer()
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to start the chart viewer: {e}")
+            self.update_status("Failed to start the chart viewer.", error=True)
+            return
+        self.live_dashboard = LiveDashboard(self.chart_engine, charts, self.chart_settings())
+        self._submit_live(self.live_dashboard.show, viewer, self.live_dashboard.snapshot(self.data))
+        message = f"Live dashboard opened at {viewer.url}"
+        if not self.live_running():
+            message += " (start live refresh on the File & Data page to stream new rows)"
+        self.update_status(message + ".")
+
+    def _submit_live(self, fn, *args):
+        future = self.live_executor.submit(fn, *args)
+        self.master.after(DASHBOARD_POLL_MS, self._poll_viewer, future)
+
+    def _poll_viewer(self, future):
+        if not future.done():
+            self.master.after(DASHBOARD_POLL_MS, self._poll_viewer, future)
+            return
+        error = future.exception()
+        if error is not None:
+            self.live_dashboard = None
+            messagebox.showerror("Error", f"Chart viewer update failed: {error}")
+            self.update_status("Chart viewer update failed.", error=True)
+
     # ------------------ File Converter ------------------
     def convert_file(self):
-        if self.data is None:
+        if not self.has_data():
             messagebox.showerror("Error", "Please upload a file in the File Converter section first.")
             return
         output_format = self.output_format_cb.get()
         if not output_format:
             messagebox.showerror("Error", "Please select an output format (CSV, Excel, or SQLite).")
             return
-        file_path = filedialog.asksaveasfilename(defaultextension="",
-                                                 filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx"),
-                                                            ("SQLite DB", "*.db")])
+        file_path = filedialog.asksaveasfilename(defaultextension=CONVERT_FORMATS[output_format],
+                                                 filetypes=[(output_format, "*" + CONVERT_FORMATS[output_format])])
         if not file_path:
             self.update_status("File conversion cancelled.")
             return
         try:
-            if output_format == "CSV":
+            if self.dataset is not None:
+                self.write_dataset_chunks(file_path, output_format)
+            elif output_format == "CSV":
                 self.data.to_csv(file_path, index=False)
             elif output_format == "Excel":
                 self.data.to_excel(file_path, index=False)
             elif output_format == "SQLite":
-                conn = sqlite3.connect(file_path)
-                self.data.to_sql("converted_data", conn, if_exists="replace", index=False)
-                conn.close()
+                with SQLiteWriter(file_path, index_columns=self.sqlite_index_columns()) as writer:
+                    for start in range(0, max(len(self.data), 1), LOAD_CHUNK_ROWS):
+                        writer.write(self.data.iloc[start:start + LOAD_CHUNK_ROWS])
+            elif output_format == "Parquet":
+                self.data.to_parquet(file_path, index=False)
+            elif output_format == "Feather":
+                self.data.reset_index(drop=True).to_feather(file_path)
             messagebox.showinfo("File Converter", f"File converted and saved to {file_path}")
             self.update_status(f"File converted to {output_format} and saved.")
         except Exception as e:
             messagebox.showerror("Error", f"File conversion failed: {e}")
             self.update_status("File conversion failed.", error=True)
 
+    # Out-of-core datasets are written chunk by chunk so they never need to fit in memory
+    def write_dataset_chunks(self, file_path, output_format):
+        with make_chunk_writer(output_format, file_path, self.sqlite_index_columns()) as writer:
+            for chunk in self.dataset.iter_chunks():
+                writer.write(chunk)
+
+    def sqlite_index_columns(self):
+        return [self.get_column_name(c.strip()) or c.strip() for c in self.sqlite_index_var.get().split(",")
+                if c.strip()]
+
+    # Streaming conversion reads straight from the source file, so nothing needs to be loaded first
+    def stream_convert_file(self):
+        output_format = self.output_format_cb.get()
+        if not output_format:
+            messagebox.showerror("Error", "Please select an output format first.")
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("Data Files", " ".join("*" + e for e in
+                                                                                   CONVERT_INPUT_EXTENSIONS))])
+        if not file_path:
+            self.update_status("File conversion cancelled.")
+            return
+        sqlite_query = None
+        if is_sqlite_file(file_path):
+            try:
+                sqlite_query = self.ask_sqlite_query(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read SQLite database: {e}")
+                self.update_status("Failed to read SQLite database.", error=True)
+                return
+            if sqlite_query is None:
+                self.update_status("File conversion cancelled.")
+                return
+        extension = CONVERT_FORMATS[output_format]
+        output_path = filedialog.asksaveasfilename(defaultextension=extension,
+                                                   initialfile=os.path.splitext(os.path.basename(file_path))[0]
+                                                   + extension,
+                                                   filetypes=[(output_format, "*" + extension)])
+        if not output_path:
+            self.update_status("File conversion cancelled.")
+            return
+        if os.path.abspath(output_path) == os.path.abspath(file_path):
+            messagebox.showerror("Error", "The output file must differ from the input file.")
+            return
+        self.start_conversion([(file_path, output_path)], output_format, sqlite_query)
+
+    def batch_convert_folder(self):
+        output_format = self.output_format_cb.get()
+        if not output_format:
+            messagebox.showerror("Error", "Please select an output format first.")
+            return
+        folder = filedialog.askdirectory(title="Folder to convert")
+        if not folder:
+            self.update_status("Batch conversion cancelled.")
+            return
+        output_dir = filedialog.askdirectory(title="Output folder")
+        if not output_dir:
+            self.update_status("Batch conversion cancelled.")
+            return
+        extension = CONVERT_FORMATS[output_format]
+        jobs = []
+        # Batch conversion writes the first table of each database; the others are reported when it finishes
+        skipped_tables = {}
+        for name in sorted(os.listdir(folder)):
+            file_path = os.path.join(folder, name)
+            output_path = os.path.join(output_dir, os.path.splitext(name)[0] + extension)
+            if (os.path.isfile(file_path) and name.lower().endswith(CONVERT_INPUT_EXTENSIONS)
+                    and os.path.abspath(output_path) != os.path.abspath(file_path)):
+                jobs.append((file_path, output_path))
+                if is_sqlite_file(file_path):
+                    try:
+                        tables = sqlite_tables(file_path)
+                    except Exception:
+                        # An unreadable database fails its own conversion job
+                        tables = []
+                    if len(tables) > 1:
+                        skipped_tables[name] = tables[1:]
+        if not jobs:
+            messagebox.showerror("Error", "The folder contains no CSV, Excel or SQLite files to convert.")
+            self.update_status("Batch conversion failed: no input files.", error=True)
+            return
+        self.start_conversion(jobs, output_format, skipped_tables=skipped_tables)
+
+    def start_conversion(self, jobs, output_format, sqlite_query=None, skipped_tables=None):
+        if self.convert_thread is not None and self.convert_thread.is_alive():
+            messagebox.showinfo("Converting", "A conversion is already running. Please wait or cancel it first.")
+            return
+        self.convert_queue = queue.Queue()
+        self.convert_cancel_event = threading.Event()
+        self.convert_thread = threading.Thread(target=self._convert_worker,
+                                               args=(jobs, output_format, self.sqlite_index_columns(),
+                                                     self.convert_cancel_event, self.convert_queue, sqlite_query),
+                                               daemon=True)
+        self.convert_sizes = {file_path: os.path.getsize(file_path) for file_path, _ in jobs}
+        self.convert_positions = {}
+        self.convert_skipped_tables = skipped_tables or {}
+        self.convert_start = time.perf_counter()
+        self.convert_progress.config(value=0)
+        self.convert_rate_label.config(text="")
+        self.cancel_convert_btn.config(state="normal")
+        self.update_status(f"Converting {len(jobs)} file(s) to {output_format}...")
+        self.convert_thread.start()
+        self.master.after(CONVERT_POLL_MS, self._poll_conversion)
+
+    def cancel_conversion(self):
+        if self.convert_thread is not None and self.convert_thread.is_alive():
+            self.convert_cancel_event.set()
+            self.update_status("Cancelling conversion...")
+
+    # Runs on the worker thread: never touch Tk widgets here, only post messages to the queue
+    def _convert_worker(self, jobs, output_format, index_columns, cancel_event, result_queue, sqlite_query=None):
+        def progress(file_path, rows, bytes_read):
+            result_queue.put(("progress", (file_path, rows, bytes_read)))
+
+        try:
+            result_queue.put(("done", convert_files(jobs, output_format, cancel_event, progress, index_columns,
+                                                    sqlite_query=sqlite_query)))
+        except LoadCancelled:
+            result_queue.put(("cancelled", None))
+        except Exception as e:
+            result_queue.put(("error", e))
+
+    def _poll_conversion(self):
+        while True:
+            try:
+                kind, payload = self.convert_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                file_path, rows, bytes_read = payload
+                self.convert_positions[file_path] = (rows, bytes_read)
+                continue
+            self.cancel_convert_btn.config(state="disabled")
+            if kind == "done":
+                self._finish_conversion(payload)
+            elif kind == "cancelled":
+                self.update_status("Conversion cancelled.")
+            else:
+                messagebox.showerror("Error", f"File conversion failed: {payload}")
+                self.update_status("File conversion failed.", error=True)
+            return
+        self._show_conversion_rate()
+        self.master.after(CONVERT_POLL_MS, self._poll_conversion)
+
+    def _show_conversion_rate(self):
+        rows = sum(r for r, _ in self.convert_positions.values())
+        bytes_read = sum(b for _, b in self.convert_positions.values())
+        seconds = max(time.perf_counter() - self.convert_start, 1e-9)
+        rate = f"{rows:,} rows, {rows / seconds:,.0f} rows/s, {bytes_read / seconds / 1e6:,.1f} MB/s"
+        self.convert_progress.config(value=min(bytes_read / (sum(self.convert_sizes.values()) or 1), 1.0))
+        self.convert_rate_label.config(text=rate)
+        return rate
+
+    def _finish_conversion(self, results):
+        for file_path, stats in results.items():
+            if isinstance(stats, ConvertStats):
+                self.convert_positions[file_path] = (stats.rows, self.convert_sizes[file_path])
+        rate = self._show_conversion_rate()
+        failed = {os.path.basename(p): e for p, e in results.items() if not isinstance(e, ConvertStats)}
+        converted = len(results) - len(failed)
+        message = f"Converted {converted} of {len(results)} file(s) ({rate})."
+        skipped = ""
+        if self.convert_skipped_tables:
+            skipped = "\n\nOnly the first table of each database was converted. Skipped tables:\n" + "\n".join(
+                f"{name}: {', '.join(tables)}" for name, tables in self.convert_skipped_tables.items())
+        if failed:
+            details = "\n".join(f"{name}: {e}" for name, e in failed.items())
+            messagebox.showerror("File Converter", f"{message}\n\nFailed:\n{details}{skipped}")
+            self.update_status(message, error=True)
+        else:
+            messagebox.showinfo("File Converter", message + skipped)
+            self.update_status(message)
+
     # ------------------ Custom Chart Creator ------------------
     def custom_chart(self):
         x_column = self.get_column_name(self.x_col_menu.get())
@@ -704,45 +1743,27 @@ class DataVizApp:
             if not chart_type:
                 messagebox.showerror("Error", "No custom chart type provided.")
                 return
+        spec = get_chart_type(chart_type)
+        if spec is None:
+            messagebox.showerror("Error", f"Custom chart type '{chart_type}' not implemented.")
+            return
         title_text = self.custom_chart_title_var.get()
         custom_color = self.custom_chart_color_var.get().strip()
         palette = [custom_color] if custom_color else self.get_default_color_palette()
+        columns = {"x": x_column, "y": y_column,
+                   "z": self.get_column_name(self.z_col_menu.get()) if "z" in spec.roles else None}
+        title_text = title_text or f"Custom {spec.default_title(columns)}"
+        key = self.figure_key("custom", spec.name, tuple(columns.items()), title_text, tuple(palette))
         try:
-            if chart_type.lower() == "scatter":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=title_text or f"Custom Scatter: {x_column} vs {y_column}",
-                                 color_discrete_sequence=palette)
-            elif chart_type.lower() == "line":
-                fig = px.line(self.data, x=x_column, y=y_column,
-                              title=title_text or f"Custom Line: {x_column} vs {y_column}",
-                              color_discrete_sequence=palette)
-            elif chart_type.lower() == "bar":
-                fig = px.bar(self.data, x=x_column, y=y_column,
-                             title=title_text or f"Custom Bar: {x_column} vs {y_column}",
-                             color_discrete_sequence=palette)
-            elif chart_type.lower() == "area":
-                fig = px.area(self.data, x=x_column, y=y_column,
-                              title=title_text or f"Custom Area: {x_column} vs {y_column}",
-                              color_discrete_sequence=palette)
-            elif chart_type.lower() == "bubble":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=title_text or f"Custom Bubble: {x_column} vs {y_column}",
-                                 size=self.data.index, color=self.data.index, color_continuous_scale=palette)
-            elif chart_type.lower() == "pie":
-                fig = px.pie(self.data, names=x_column, values=y_column,
-                             title=title_text or f"Custom Pie: {x_column} vs {y_column}")
-            else:
-                messagebox.showerror("Error", f"Custom chart type '{chart_type}' not implemented.")
-                return
-            fig.update_layout(title_font=dict(family=self.font_family_var.get(),
-                                              size=int(self.font_size_var.get()) + 8,
-                                              color=self.chart_title_color),
-                              xaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              yaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              font=dict(color=self.axis_label_color),
-                              margin=dict(l=60, r=60, t=60, b=60))
-            fig.show()
-            self.update_status("Custom chart generated successfully.")
+            fig, result = self.figure_cache.get(key), None
+            if fig is None:
+                # A continuous colour scale needs at least two colours
+                result, _ = self.build_chart(spec.name, columns, title=title_text, palette=palette,
+                                             continuous_scale=palette if len(palette) > 1 else "Viridis")
+                fig = result.figure
+                self.figure_cache.put(key, fig)
+            self.show_figure(fig)
+            self.update_status(self.chart_status_message(result, f"Custom {spec.name}"))
         except Exception as e:
             messagebox.showerror("Error", f"Custom chart failed: {e}")
             self.update_status("Custom chart generation failed.", error=True)
@@ -750,130 +1771,50 @@ class DataVizApp:
     # ------------------ Visualization & Forecasting ------------------
     def create_visualization(self, x_column, y_column, chart_type):
         # This method is still used for individual chart display
-        x_column = self.get_column_name(x_column)
-        y_column = self.get_column_name(y_column)
+        spec = get_chart_type(chart_type)
+        if spec is None:
+            messagebox.showinfo("Not Implemented", f"The chart type '{chart_type}' is not implemented.")
+            self.update_status(f"Chart type '{chart_type}' not implemented.")
+            return
+        columns = {"x": self.get_column_name(x_column), "y": self.get_column_name(y_column),
+                   "z": self.get_column_name(self.z_col_menu.get()) if "z" in spec.roles else None}
+        if "z" in spec.missing_roles(columns):
+            messagebox.showerror("Error", f"Please select a Z-Axis column for {spec.name} charts.")
+            self.update_status(f"Missing Z-Axis for {spec.name}.", error=True)
+            return
+        x_column, y_column = columns["x"], columns["y"]
         try:
-            fig = None
-            if chart_type == "Scatter":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=f"Scatter plot: {x_column} vs {y_column}")
-            elif chart_type == "Line":
-                fig = px.line(self.data, x=x_column, y=y_column,
-                              title=f"Line plot: {x_column} vs {y_column}")
-            elif chart_type == "Bar":
-                fig = px.bar(self.data, x=x_column, y=y_column,
-                             title=f"Bar chart: {x_column} vs {y_column}")
-            elif chart_type == "Pie":
-                fig = px.pie(self.data, names=x_column, values=y_column,
-                             title=f"Pie chart: {x_column} vs {y_column}")
-            elif chart_type == "Area":
-                fig = px.area(self.data, x=x_column, y=y_column,
-                              title=f"Area plot: {x_column} vs {y_column}")
-            elif chart_type == "Bubble":
-                fig = px.scatter(self.data, x=x_column, y=y_column,
-                                 title=f"Bubble plot: {x_column} vs {y_column}",
-                                 size=self.data.index, color=self.data.index, color_continuous_scale='Viridis')
-            elif chart_type == "Waterfall":
-                fig = px.waterfall(self.data, x=x_column, y=y_column,
-                                   title=f"Waterfall plot: {x_column} vs {y_column}")
-            elif chart_type == "Histogram":
-                fig = px.histogram(self.data, x=x_column,
-                                   title=f"Histogram: {x_column}")
-            elif chart_type == "Box Plot":
-                fig = px.box(self.data, y=y_column,
-                             title=f"Box plot: {y_column}")
-            elif chart_type == "Heatmap":
-                fig = px.density_heatmap(self.data, x=x_column, y=y_column,
-                                         title=f"Heatmap: {x_column} vs {y_column}")
-            elif chart_type == "3D Scatter":
-                z_column = self.get_column_name(self.z_col_menu.get())
-                if not z_column:
-                    messagebox.showerror("Error", "Please select a Z-Axis column for 3D charts.")
-                    self.update_status("Missing Z-Axis for 3D Scatter.", error=True)
-                    return
-                fig = px.scatter_3d(self.data, x=x_column, y=y_column, z=z_column, title="3D Scatter")
-            elif chart_type == "3D Bubble":
-                z_column = self.get_column_name(self.z_col_menu.get())
-                if not z_column:
-                    messagebox.showerror("Error", "Please select a Z-Axis column for 3D charts.")
-                    self.update_status("Missing Z-Axis for 3D Bubble.", error=True)
-                    return
-                fig = px.scatter_3d(self.data, x=x_column, y=y_column, z=z_column, size=self.data.index,
-                                    title="3D Bubble")
-            elif chart_type == "3D Surface":
-                z_column = self.get_column_name(self.z_col_menu.get())
-                if not z_column:
-                    messagebox.showerror("Error", "Please select a Z-Axis column for 3D charts.")
-                    self.update_status("Missing Z-Axis for 3D Surface.", error=True)
-                    return
-                fig = px.surface(self.data, x=x_column, y=y_column, z=z_column, title="3D Surface")
-            else:
-                messagebox.showinfo("Not Implemented", f"The chart type '{chart_type}' is not implemented.")
-                self.update_status(f"Chart type '{chart_type}' not implemented.")
-                return
-
-            fig.update_layout(title_font=dict(family=self.font_family_var.get(),
-                                              size=int(self.font_size_var.get()) + 8,
-                                              color=self.chart_title_color),
-                              xaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              yaxis=dict(title_font=dict(color=self.axis_label_color)),
-                              font=dict(color=self.axis_label_color),
-                              margin=dict(l=60, r=80, t=60, b=60))
-            if self.prediction_var.get() and "Prediction" in self.data.columns and chart_type in ["Scatter", "Line",
-                                                                                                  "Bubble"]:
-                sorted_df = self.data.sort_values(by=x_column)
-                pred_trace = go.Scatter(
-                    x=sorted_df[x_column],
-                    y=sorted_df["Prediction"],
-                    mode="lines",
-                    name="Fitted Prediction",
-                    line=dict(color="red", width=2)
-                )
-                fig.add_trace(pred_trace)
-                if self.forecast_x is not None and self.forecast_y is not None and len(self.forecast_x) > 0:
-                    forecast_trace = go.Scatter(
-                        x=self.forecast_x,
-                        y=self.forecast_y,
-                        mode="lines",
-                        name="Forecast",
-                        line=dict(color="red", width=2, dash="dash")
-                    )
-                    fig.add_trace(forecast_trace)
-                    if self.forecast_ci is not None:
-                        lower, upper = self.forecast_ci
-                        fig.add_trace(go.Scatter(
-                            x=list(self.forecast_x) + list(self.forecast_x[::-1]),
-                            y=list(upper) + list(lower[::-1]),
-                            fill='toself',
-                            fillcolor='rgba(255,0,0,0.2)',
-                            line=dict(color='rgba(255,255,255,0)'),
-                            hoverinfo="skip",
-                            showlegend=True,
-                            name="95% CI"
-                        ))
-            if self.anomalies is not None and chart_type in ["Scatter", "Line", "Bubble"]:
-                anomaly_points = self.data.loc[self.anomalies]
-                if not anomaly_points.empty:
-                    anom_trace = go.Scatter(
-                        x=anomaly_points[x_column],
-                        y=anomaly_points[y_column],
-                        mode="markers",
-                        name="Anomalies",
-                        marker=dict(color="black", size=10, symbol="x")
-                    )
-                    fig.add_trace(anom_trace)
-            fig.show()
-            self.update_status(f"{chart_type} chart generated successfully.")
+            with_prediction = spec.overlays and self.prediction_var.get() and "Prediction" in self.data_columns()
+            key = self.figure_key("visualization", spec.name, x_column, y_column, columns["z"], with_prediction)
+            fig, result = self.figure_cache.get(key), None
+            if fig is None:
+                result, raw_data = self.build_chart(spec.name, columns,
+                                                    extra_columns=["Prediction"] if with_prediction else [])
+                fig = result.figure
+                if spec.overlays:
+                    self.add_chart_overlays(fig, result, raw_data, x_column, y_column, with_prediction)
+                self.figure_cache.put(key, fig)
+            self.show_figure(fig)
+            self.update_status(self.chart_status_message(result, spec.name))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create visualization: {e}")
             self.update_status("Visualization failed.", error=True)
 
+    # Prediction, forecast, confidence-interval and anomaly traces for charts that take overlays
+    def add_chart_overlays(self, fig, result, raw_data, x_column, y_column, with_prediction):
+        if with_prediction:
+            add_forecast_traces(fig, result.render_mode, raw_data, x_column, self.forecast_x, self.forecast_y,
+                                self.forecast_ci, self.get_chart_max_points())
+        if self.anomalies is not None and len(self.anomalies):
+            anomaly_points = self.anomaly_points([x_column, y_column], max_rows=self.get_chart_max_points())
+            add_anomaly_trace(fig, result.render_mode, anomaly_points, x_column, y_column)
+
     def generate_chart(self):
-        if self.data is None:
+        if not self.has_data():
             messagebox.showerror("Error", "Please upload a dataset first.")
             self.update_status("No dataset loaded.", error=True)
             return
-        chart_type = self.chart_menu.get()
+        chart_type = self.chart_type_var.get()
         x_column = self.x_col_menu.get()
         y_column = self.y_col_menu.get()
         if not chart_type:
@@ -889,108 +1830,356 @@ class DataVizApp:
     # ------------------ Forecasting / Prediction ------------------
     def toggle_prediction(self):
         if self.prediction_var.get():
-            if self.data is None:
-                messagebox.showerror("Error", "Please upload a dataset first.")
-                self.prediction_var.set(False)
-                self.update_status("Prediction failed: no dataset loaded.", error=True)
-                return
-            x_column = self.x_col_menu.get()
-            y_column = self.y_col_menu.get()
-            if not x_column or not y_column:
-                messagebox.showerror("Error", "Please select both X-Axis and Y-Axis columns for prediction.")
-                self.prediction_var.set(False)
-                self.update_status("Prediction failed: columns not selected.", error=True)
-                return
+            self.run_forecast()
+        else:
+            self.cancel_forecasts()
+            messagebox.showinfo("Prediction", "Prediction mode is now disabled.")
+            self.update_status("Prediction mode disabled.")
+
+    # Queue a forecast for the current selections; the fit runs on the forecast worker
+    def run_forecast(self):
+        if not self.has_data():
+            messagebox.showerror("Error", "Please upload a dataset first.")
+            self.prediction_var.set(bool(self.forecast_jobs))
+            self.update_status("Prediction failed: no dataset loaded.", error=True)
+            return
+        x_column = self.x_col_menu.get()
+        y_column = self.y_col_menu.get()
+        if not x_column or not y_column:
+            messagebox.showerror("Error", "Please select both X-Axis and Y-Axis columns for prediction.")
+            self.prediction_var.set(bool(self.forecast_jobs))
+            self.update_status("Prediction failed: columns not selected.", error=True)
+            return
+        model_choice = self.forecast_model_var.get()
+        forecast_horizon = int(self.forecast_horizon_var.get()) if self.forecast_horizon_var.get().isdigit() else 5
+        group_column = self.forecast_group_var.get()
+        criterion = self.arima_criterion_var.get()
+        columns = list(dict.fromkeys(c for c in [x_column, y_column, group_column] if c))
+        source = self.dataset if self.dataset is not None else self.data
+        # In-memory fits read the column index's numeric views, limited to the rows present now so that rows
+        # appended meanwhile can be folded in afterwards; out-of-core fits load their columns
+        index = None if self.dataset is not None else self.column_index
+        rows = None if self.dataset is not None else len(self.data)
+        cancel_event = threading.Event()
+        label = f"{model_choice} forecast of '{y_column}' by '{x_column}'"
+        if group_column:
+            label += f" per '{group_column}'"
+            future = self.forecast_executor.submit(self._group_forecast_worker, source, index, columns, group_column,
+                                                   x_column, y_column, model_choice, forecast_horizon,
+                                                   self.conf_int_var.get(), criterion, cancel_event)
+            apply = self._apply_group_forecast
+        else:
+            future = self.forecast_executor.submit(self._forecast_worker, source, index, x_column, y_column,
+                                                   model_choice, forecast_horizon, self.conf_int_var.get(),
+                                                   criterion, cancel_event, rows)
+            apply = self._apply_forecast
+        self.prediction_var.set(True)
+        self._queue_forecast_job(ForecastJob(label, self.load_generation, future, cancel_event, apply))
+
+    # Queue a rolling-origin comparison of every forecast model on the selected X/Y columns
+    def run_backtest(self):
+        if not self.has_data():
+            messagebox.showerror("Error", "Please upload a dataset first.")
+            self.update_status("Backtest failed: no dataset loaded.", error=True)
+            return
+        x_column = self.x_col_menu.get()
+        y_column = self.y_col_menu.get()
+        if not x_column or not y_column:
+            messagebox.showerror("Error", "Please select both X-Axis and Y-Axis columns for the backtest.")
+            self.update_status("Backtest failed: columns not selected.", error=True)
+            return
+        folds = int(self.backtest_folds_var.get()) if self.backtest_folds_var.get().isdigit() else BACKTEST_FOLDS
+        forecast_horizon = int(self.forecast_horizon_var.get()) if self.forecast_horizon_var.get().isdigit() else 5
+        source = self.dataset if self.dataset is not None else self.data
+        index = None if self.dataset is not None else self.column_index
+        cancel_event = threading.Event()
+        future = self.forecast_executor.submit(self._backtest_worker, source, index, x_column, y_column, max(folds, 1),
+                                               max(forecast_horizon, 1), self.backtest_window_var.get(),
+                                               self.arima_criterion_var.get(), cancel_event)
+        label = f"Backtest of '{y_column}' by '{x_column}' ({folds} folds)"
+        self._queue_forecast_job(ForecastJob(label, self.load_generation, future, cancel_event,
+                                             self._apply_backtest))
+
+    def _queue_forecast_job(self, job):
+        self.forecast_jobs.append(job)
+        self.cancel_forecast_btn.config(state="normal")
+        if len(self.forecast_jobs) == 1:
+            self.forecast_progress.start()
+            self.master.after(FORECAST_POLL_MS, self._poll_forecasts)
+        self._update_forecast_status()
+
+    def cancel_forecasts(self):
+        for job in self.forecast_jobs:
+            job.cancel_event.set()
+            job.future.cancel()
+        if self.forecast_jobs:
+            self.update_status("Cancelling forecasts...")
+
+    # Runs on the forecast worker: never touch Tk widgets here
+    def _forecast_worker(self, source, index, x_column, y_column, model_choice, forecast_horizon, conf_int,
+                         criterion, cancel_event, rows=None):
+        index = index or ColumnIndex(source.load(list(dict.fromkeys([x_column, y_column]))))
+        if cancel_event.is_set():
+            raise ForecastCancelled()
+        valid_mask, X, y = forecast_inputs(index, x_column, y_column, rows)
+        if not valid_mask.any():
+            raise ValueError("No valid numeric data available for prediction.")
+        result = fit_forecast(X, y, model_choice, forecast_horizon, conf_int, cancel_event, criterion)
+        forecaster = IncrementalForecaster.start(X, y, result, forecast_horizon, conf_int)
+        return valid_mask, result, (x_column, y_column, forecaster)
+
+    def _backtest_worker(self, source, index, x_column, y_column, folds, forecast_horizon, window, criterion,
+                         cancel_event):
+        index = index or ColumnIndex(source.load(list(dict.fromkeys([x_column, y_column]))))
+        _, X, y = forecast_inputs(index, x_column, y_column)
+        return backtest_models(X, y, folds=folds, horizon=forecast_horizon, window=window, criterion=criterion,
+                               cancel_event=cancel_event)
+
+    def _group_forecast_worker(self, source, index, columns, group_column, x_column, y_column, model_choice,
+                               forecast_horizon, conf_int, criterion, cancel_event):
+        index = index or ColumnIndex(source.load(columns))
+        frame = pd.DataFrame({group_column: index.data[group_column], x_column: index.numeric(x_column),
+                              y_column: index.numeric(y_column)})
+        return batch_forecast(frame, group_column, x_column, y_column, model_choice, forecast_horizon, conf_int,
+                              cancel_event, criterion=criterion)
+
+    def _update_forecast_status(self):
+        if not self.forecast_jobs:
+            return
+        message = f"Running {self.forecast_jobs[0].label}..."
+        if len(self.forecast_jobs) > 1:
+            message += f" ({len(self.forecast_jobs) - 1} queued)"
+        self.update_status(message)
+
+    def _poll_forecasts(self):
+        # Jobs finish in submission order (single worker), so results are applied in the order requested
+        while self.forecast_jobs and self.forecast_jobs[0].future.done():
+            job = self.forecast_jobs.pop(0)
+            if job.future.cancelled():
+                self.update_status(f"{job.label} cancelled.")
+                continue
             try:
-                X_series = self.convert_series(self.data[x_column]).dropna()
-                y_series = self.convert_series(self.data[y_column]).dropna()
-                valid_mask = X_series.notna() & y_series.notna()
-                if valid_mask.sum() == 0:
-                    messagebox.showerror("Error", "No valid numeric data available for prediction.")
-                    self.prediction_var.set(False)
-                    self.update_status("Prediction failed: no valid numeric data.", error=True)
-                    return
-
-                X = X_series[valid_mask].values.reshape(-1, 1)
-                y = y_series[valid_mask].values
-
-                model_choice = self.forecast_model_var.get()
-                forecast_horizon = int(
-                    self.forecast_horizon_var.get()) if self.forecast_horizon_var.get().isdigit() else 5
-
-                if model_choice == "Polynomial" and valid_mask.sum() >= 5:
-                    poly = PolynomialFeatures(degree=3)
-                    X_poly = poly.fit_transform(X)
-                    model = LinearRegression()
-                    model.fit(X_poly, y)
-                    y_pred = model.predict(X_poly)
-                    x_sorted = np.sort(X.ravel())
-                    diff = np.median(np.diff(x_sorted)) if len(x_sorted) > 1 else 1
-                    forecast_x = np.linspace(x_sorted[-1] + diff, x_sorted[-1] + forecast_horizon * diff,
-                                             forecast_horizon)
-                    forecast_X_poly = poly.transform(forecast_x.reshape(-1, 1))
-                    forecast_y = model.predict(forecast_X_poly)
-                    self.forecast_x = forecast_x
-                    self.forecast_y = forecast_y
-                    self.forecast_ci = None
-                elif model_choice == "ARIMA" and len(y) > 10:
-                    model = ARIMA(y, order=(1, 1, 1))
-                    model_fit = model.fit()
-                    y_pred = model_fit.fittedvalues
-                    forecast_result = model_fit.get_forecast(steps=forecast_horizon)
-                    forecast_output = forecast_result.predicted_mean
-                    if self.conf_int_var.get():
-                        conf_int = forecast_result.conf_int(alpha=0.05)
-                        lower = conf_int.iloc[:, 0].values
-                        upper = conf_int.iloc[:, 1].values
-                        self.forecast_ci = (lower, upper)
-                    else:
-                        self.forecast_ci = None
-                    self.forecast_x = np.arange(np.max(X) + 1, np.max(X) + forecast_horizon + 1)
-                    self.forecast_y = forecast_output.values
-                else:
-                    model = LinearRegression()
-                    model.fit(X, y)
-                    y_pred = model.predict(X)
-                    self.forecast_x = np.array([])
-                    self.forecast_y = np.array([])
-                    self.forecast_ci = None
-
-                self.data.loc[valid_mask, "Prediction"] = y_pred
-                messagebox.showinfo("Prediction",
-                                    f"Prediction complete for '{y_column}' using '{x_column}' with {model_choice} model.")
-                self.update_status("Prediction completed successfully.")
+                result = job.future.result()
+            except ForecastCancelled:
+                self.update_status(f"{job.label} cancelled.")
+                continue
             except Exception as e:
                 messagebox.showerror("Error", f"Prediction failed: {e}")
                 self.update_status("Prediction failed.", error=True)
-                self.prediction_var.set(False)
+                continue
+            job.apply(job, result)
+        if self.forecast_jobs:
+            self._update_forecast_status()
+            self.master.after(FORECAST_POLL_MS, self._poll_forecasts)
+            return
+        self.forecast_progress.stop()
+        self.cancel_forecast_btn.config(state="disabled")
+        if not (self.data is not None and "Prediction" in self.data.columns) and not (
+                self.dataset is not None and "Prediction" in self.dataset.columns):
+            self.prediction_var.set(False)
+
+    # Runs on the UI thread: the Prediction column and forecast traces are replaced together. Rows appended
+    # while the fit ran (valid_mask covers the rows it was queued with) are folded in without refitting.
+    def _apply_forecast(self, job, payload):
+        valid_mask, result, forecaster = payload
+        if job.generation != self.load_generation:
+            self.update_status(f"{job.label} discarded: a different dataset was loaded.", error=True)
+            return
+        if self.dataset is not None:
+            prediction = np.full(len(self.dataset), np.nan)
+            prediction[valid_mask] = result.y_pred
+            self.dataset.set_column("Prediction", prediction)
         else:
-            messagebox.showinfo("Prediction", "Prediction mode is now disabled.")
-            self.update_status("Prediction mode disabled.")
+            fitted = np.zeros(len(self.data), dtype=bool)
+            fitted[:len(valid_mask)] = valid_mask
+            self.data.loc[fitted, "Prediction"] = result.y_pred
+        self.forecast_x, self.forecast_y, self.forecast_ci = result.forecast_x, result.forecast_y, result.forecast_ci
+        # Out-of-core datasets can't be appended to, so there is nothing to update incrementally
+        self.forecaster = forecaster if self.dataset is None else None
+        self.bump_data_version(columns=["Prediction"])
+        if self.forecaster is not None and len(self.data) > len(valid_mask):
+            self.update_forecast(len(valid_mask))
+        messagebox.showinfo("Prediction", f"Prediction complete: {job.label} ({result.model}).")
+        self.update_status(f"{job.label} completed successfully ({result.model}).")
+
+    def _apply_group_forecast(self, job, payload):
+        self.group_forecasts, self.group_forecast_metrics = payload
+        n_groups = len(self.group_forecast_metrics)
+        self.update_status(f"{job.label} completed successfully ({n_groups:,} groups, median RMSE "
+                           f"{self.group_forecast_metrics['RMSE'].median():.4g}).")
+        self.show_group_forecast_metrics()
+
+    def _apply_backtest(self, job, payload):
+        fold_scores, summary, n_fitted = payload
+        self.show_figure(backtest_figure(summary, title=job.label))
+        self.show_text_window("Backtest Results", "Mean over folds:\n" + summary.to_string(index=False) +
+                              "\n\nPer fold:\n" + fold_scores.to_string(index=False))
+        self.update_status(f"{job.label} completed: {n_fitted} of {len(fold_scores)} fold fits computed, "
+                           f"the rest reused from earlier runs.")
+
+    def show_group_forecast_metrics(self):
+        if self.group_forecast_metrics is None:
+            messagebox.showinfo("Group Forecasts", "No group forecast yet. Pick a Group By column and run a forecast.")
+            return
+        self.show_text_window("Group Forecast Metrics", self.group_forecast_metrics.to_string(index=False))
+
+    def export_group_forecasts(self):
+        if self.group_forecasts is None:
+            messagebox.showerror("Error", "No group forecast to export.")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        if file_path:
+            try:
+                self.group_forecasts.to_csv(file_path, index=False)
+                metrics_path = os.path.splitext(file_path)[0] + "_metrics.csv"
+                self.group_forecast_metrics.to_csv(metrics_path, index=False)
+                messagebox.showinfo("Export", f"Group forecasts exported to {file_path} (metrics: {metrics_path})")
+                self.update_status(f"Group forecasts exported to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Export failed: {e}")
+                self.update_status("Export failed.", error=True)
+
+    # ------------------ Anomaly Detection ------------------
+    def run_anomaly_detection(self):
+        if not self.has_data():
+            messagebox.showerror("Error", "Please upload a dataset first.")
+            self.update_status("Anomaly detection failed: no dataset loaded.", error=True)
+            return
+        if self.anomaly_future is not None and not self.anomaly_future.done():
+            messagebox.showinfo("Anomaly Detection", "Anomaly detection is already running.")
+            return
+        columns = [self.anomaly_columns_list.get(i) for i in self.anomaly_columns_list.curselection()]
+        if not columns:
+            columns = [c for c in dict.fromkeys([self.x_col_menu.get(), self.y_col_menu.get()]) if c]
+        if not columns:
+            messagebox.showerror("Error", "Please select columns for anomaly detection (or X/Y columns).")
+            self.update_status("Anomaly detection failed: no columns selected.", error=True)
+            return
+        try:
+            contamination = float(self.anomaly_contamination_var.get())
+            if not 0 < contamination <= 0.5:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Contamination must be a number between 0 and 0.5.")
+            self.update_status("Anomaly detection failed: invalid contamination.", error=True)
+            return
+        key = (self.data_version, tuple(columns), contamination)
+        cached = self.anomaly_cache.get(key)
+        if cached is not None:
+            self._apply_anomalies(cached, from_cache=True)
+            return
+        source = self.dataset if self.dataset is not None else self.data
+        if self.dataset is not None:
+            dataset = self.dataset
+
+            def sample():
+                return dataset.load(columns, max_rows=ANOMALY_FIT_ROWS)
+
+            def chunks():
+                return dataset.iter_chunks(ANOMALY_CHUNK_ROWS, columns)
+        else:
+            # Copy the columns now so later edits to self.data can't race with the worker
+            frame = self.data[columns].copy()
+
+            def sample():
+                return frame
+
+            def chunks():
+                return (frame.iloc[i:i + ANOMALY_CHUNK_ROWS] for i in range(0, len(frame), ANOMALY_CHUNK_ROWS))
+        cancel_event = self.anomaly_cancel_event = threading.Event()
+        progress = [0]
+        self.anomaly_future = self.anomaly_executor.submit(
+            lambda: detect_anomalies(sample(), chunks, columns, contamination, cancel_event,
+                                     progress=lambda rows: progress.__setitem__(0, rows)))
+        self.cancel_anomaly_btn.config(state="normal")
+        self.update_status(f"Detecting anomalies in {', '.join(columns)}...")
+        self.master.after(ANOMALY_POLL_MS, self._poll_anomalies, key, source, progress)
+
+    def cancel_anomaly_detection(self):
+        if self.anomaly_future is not None and not self.anomaly_future.done():
+            self.anomaly_cancel_event.set()
+            self.update_status("Cancelling anomaly detection...")
+
+    def _poll_anomalies(self, key, source, progress):
+        if not self.anomaly_future.done():
+            total = self.data_length()
+            if total:
+                self.update_status(f"Detecting anomalies... {min(progress[0] / total, 1):.0%} of rows scored")
+            self.master.after(ANOMALY_POLL_MS, self._poll_anomalies, key, source, progress)
+            return
+        self.cancel_anomaly_btn.config(state="disabled")
+        try:
+            result = self.anomaly_future.result()
+        except AnomalyCancelled:
+            self.update_status("Anomaly detection cancelled.")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Anomaly detection failed: {e}")
+            self.update_status("Anomaly detection failed.", error=True)
+            return
+        if source is not (self.dataset if self.dataset is not None else self.data):
+            self.update_status("Anomaly detection discarded: a different dataset was loaded.", error=True)
+            return
+        self.anomaly_cache.put(key, result)
+        self._apply_anomalies(result)
+
+    def _apply_anomalies(self, result, from_cache=False):
+        self.anomalies, self.anomaly_result = result.positions, result
+        # Overlays depend on the flagged rows, so cached figures are stale
+        self.figure_cache.clear()
+        message = (f"{len(result.positions):,} of {result.n_rows:,} rows flagged as anomalies "
+                   f"in {', '.join(result.columns)} (contamination {result.contamination:g})")
+        self.update_status(message + (", from cache." if from_cache else "."))
+
+    def clear_anomalies(self):
+        self.anomalies = self.anomaly_result = None
+        self.figure_cache.clear()
+        self.update_status("Anomalies cleared.")
+
+    # Flagged rows for the given columns, evenly thinned to max_rows
+    def anomaly_points(self, columns, max_rows=None):
+        positions = self.anomalies
+        if max_rows and len(positions) > max_rows:
+            positions = positions[np.linspace(0, len(positions) - 1, max_rows).astype(int)]
+        columns = list(dict.fromkeys(columns))
+        if self.data is not None:
+            return self.data.iloc[positions, self.data.columns.get_indexer(columns)].copy()
+        return self.dataset.load_rows(columns, positions)
+
+    def export_anomalies(self):
+        if self.anomaly_result is None:
+            messagebox.showerror("Error", "No anomalies to export. Run anomaly detection first.")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        if file_path:
+            try:
+                flagged = self.anomaly_points(self.data_columns())
+                flagged["anomaly_score"] = self.anomaly_result.scores
+                flagged.to_csv(file_path, index=False)
+                messagebox.showinfo("Export", f"{len(flagged):,} flagged rows exported to {file_path}")
+                self.update_status(f"Flagged rows exported to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Export failed: {e}")
+                self.update_status("Export failed.", error=True)
 
     # ------------------ Export Predictions ------------------
     def export_predictions(self):
-        if self.data is None:
+        if not self.has_data():
             messagebox.showerror("Error", "No data to export.")
             return
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
         if file_path:
             try:
-                self.data.to_csv(file_path, index=False)
+                if self.dataset is not None:
+                    self.write_dataset_chunks(file_path, "CSV")
+                else:
+                    self.data.to_csv(file_path, index=False)
                 messagebox.showinfo("Export", f"Data exported to {file_path}")
                 self.update_status(f"Data exported to {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Export failed: {e}")
                 self.update_status("Export failed.", error=True)
 
-    # ------------------ Helper: Convert Series ------------------
-    def convert_series(self, series):
-        s = pd.to_numeric(series, errors='coerce')
-        if s.isna().all():
-            codes, _ = pd.factorize(series)
-            s = pd.Series(codes, index=series.index)
-        return s
-
     # ------------------ Settings Methods ------------------
     def apply_settings(self):
         self._update_style_fonts()
@@ -1037,6 +2226,8 @@ class DataVizApp:
         self.chart_title_color = self.light_theme["chart_title"]
         self.axis_label_color = self.light_theme["axis_label"]
         self.default_color_palette = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A"]
+        self.chart_max_points_var.set(str(CHART_MAX_POINTS))
+        self.webgl_threshold_var.set(str(WEBGL_THRESHOLD))
         if hasattr(self, "color_palette_entry"):
             self.color_palette_entry.delete(0, tb.END)
         self.apply_settings()
@@ -0,0 +1,2925 @@
+import math
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from plotly.io.json import to_json_plotly
+import plotly.offline
+import sqlite3
+import numpy as np
+import itertools
+import abc
+import argparse
+import base64
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import heapq
+import html
+import http.server
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import warnings
+
+# Heavy modules are imported on first use rather than at startup: pandas and plotly.express through LazyModule,
+# scikit-learn and statsmodels through lazy_import inside the functions that need them.
+# IMPORT_TIMINGS records how long each deferred import took, for the startup report.
+IMPORT_TIMINGS = {}
+DEFERRED_MODULES = ("pandas", "plotly.express", "sklearn", "statsmodels")
+
+
+def lazy_import(name):
+    loaded = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not loaded:
+        IMPORT_TIMINGS.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(lazy_import(self._name), attr)
+
+
+pd = LazyModule("pandas")
+px = LazyModule("plotly.express")
+
+# Background file loading
+LOAD_CHUNK_ROWS = 200_000
+LOAD_POLL_MS = 100
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+# Streaming ingest: schema is inferred from a sample, then each chunk is downcast as it arrives
+INGEST_SAMPLE_ROWS = 10_000
+CATEGORY_MAX_UNIQUE = 1000
+CATEGORY_MAX_RATIO = 0.5
+
+
+# Helper: Classify each column of a sample as integer, float, category, string or other
+def infer_schema(sample):
+    schema = {}
+    for col in sample.columns:
+        s = sample[col]
+        if pd.api.types.is_bool_dtype(s):
+            schema[col] = "other"
+        elif pd.api.types.is_integer_dtype(s):
+            schema[col] = "integer"
+        elif pd.api.types.is_float_dtype(s):
+            schema[col] = "float"
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            n_unique = s.nunique(dropna=True)
+            if n_unique <= CATEGORY_MAX_UNIQUE and n_unique <= max(1, len(s)) * CATEGORY_MAX_RATIO:
+                schema[col] = "category"
+            else:
+                schema[col] = "string"
+        else:
+            schema[col] = "other"
+    return schema
+
+
+# Helper: Downcast numeric columns and convert low-cardinality strings to category, in place
+def optimize_dtypes(df, schema):
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if kind in ("integer", "float"):
+            if pd.api.types.is_integer_dtype(s) and not pd.api.types.is_bool_dtype(s):
+                df[col] = pd.to_numeric(s, downcast="integer")
+            elif pd.api.types.is_float_dtype(s):
+                df[col] = s.astype(np.float32)
+        elif kind == "category" and not isinstance(s.dtype, pd.CategoricalDtype):
+            df[col] = s.astype("category")
+    return df
+
+
+# Helper: Concatenate optimized chunks, unifying categories so category columns stay categorical
+def concat_chunks(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        if all(isinstance(c[col].dtype, pd.CategoricalDtype) for c in chunks):
+            try:
+                categories = pd.api.types.union_categoricals([c[col] for c in chunks]).categories
+            except TypeError:
+                # Chunks disagree on the category value type (e.g. an all-empty chunk); keep plain values
+                for c in chunks:
+                    c[col] = c[col].astype(object)
+                continue
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Helper: Per-column memory table (bytes before/after optimization)
+def build_memory_report(before, data):
+    after = data.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"before": before.reindex(after.index).fillna(0).astype("int64"), "after": after})
+    report["dtype"] = [str(data[c].dtype) for c in report.index]
+    return report
+
+
+def format_memory_report(report):
+    lines = [f"{'Column':<30}{'Dtype':<14}{'Before (MB)':>14}{'After (MB)':>14}{'Ratio':>8}"]
+    for col, row in report.iterrows():
+        ratio = row["before"] / row["after"] if row["after"] else float("inf")
+        lines.append(f"{str(col)[:29]:<30}{row['dtype']:<14}{row['before'] / 1e6:>14.2f}"
+                     f"{row['after'] / 1e6:>14.2f}{ratio:>7.1f}x")
+    total_before, total_after = report["before"].sum(), report["after"].sum()
+    total_ratio = total_before / total_after if total_after else float("inf")
+    lines.append(f"{'TOTAL':<44}{total_before / 1e6:>14.2f}{total_after / 1e6:>14.2f}{total_ratio:>7.1f}x")
+    return "\n".join(lines)
+
+
+# Helper: Drain an iterator of chunks with cancel checks and progress (fraction(rows) gives the share done),
+# optionally downcasting each chunk. Returns (chunks, memory usage before optimization).
+def collect_chunks(chunks, fraction, cancel_event=None, progress=None, optimize=False, schema=None):
+    collected = []
+    before = None
+    rows = 0
+    for chunk in chunks:
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+        if optimize:
+            if schema is None:
+                schema = infer_schema(chunk.head(INGEST_SAMPLE_ROWS))
+            usage = chunk.memory_usage(deep=True, index=False)
+            before = usage if before is None else before.add(usage, fill_value=0)
+            chunk = optimize_dtypes(chunk, schema)
+        collected.append(chunk)
+        rows += len(chunk)
+        if progress is not None:
+            progress(min(fraction(rows), 1.0), rows)
+    return collected, before
+
+
+# SQLite databases as an input source: one table or view, with the column projection and row filter
+# pushed down into the SELECT
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+SQLiteQuery = collections.namedtuple("SQLiteQuery", "table columns where")
+
+
+def is_sqlite_file(file_path):
+    return file_path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def sqlite_tables(db_path):
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                            "AND name NOT LIKE 'sqlite_%' ORDER BY name").fetchall()
+    return [name for name, in rows]
+
+
+# Helper: The query used when none was chosen: every column and row of the database's first table
+def default_sqlite_query(db_path):
+    tables = sqlite_tables(db_path)
+    if not tables:
+        raise ValueError(f"{os.path.basename(db_path)} contains no tables.")
+    return SQLiteQuery(tables[0], None, None)
+
+
+# Helper: The WHERE text is spliced into the SELECT, so it must be a single expression
+def validate_sqlite_where(where):
+    if where and any(token in where for token in (";", "--", "/*")):
+        raise ValueError("The row filter must be a single SQL expression (no ';' or comments).")
+    return where
+
+
+def sqlite_table_columns(db_path, table):
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table)})")]
+
+
+# Helper: SELECT statement for a query; schema prefixes the table (e.g. an ATTACHed database)
+def sqlite_select(query, schema=None):
+    columns = ", ".join(quote_identifier(c) for c in query.columns) if query.columns else "*"
+    table = (f"{quote_identifier(schema)}." if schema else "") + quote_identifier(query.table)
+    sql = f"SELECT {columns} FROM {table}"
+    if query.where:
+        sql += f" WHERE {validate_sqlite_where(query.where)}"
+    return sql
+
+
+# Helper: Read a data file, reporting progress and honouring a cancel event between chunks.
+# Returns (data, memory_report); memory_report is None unless optimize is set.
+def read_data_file(file_path, cancel_event=None, progress=None, optimize=False, sqlite_query=None):
+    if file_path.endswith(".csv"):
+        total_bytes = os.path.getsize(file_path) or 1
+        schema = infer_schema(pd.read_csv(file_path, nrows=INGEST_SAMPLE_ROWS)) if optimize else None
+        with open(file_path, "rb") as fh:
+            chunks, before = collect_chunks(pd.read_csv(fh, chunksize=LOAD_CHUNK_ROWS),
+                                            lambda rows: fh.tell() / total_bytes, cancel_event, progress, optimize,
+                                            schema)
+        if not chunks:
+            return pd.read_csv(file_path), None
+        data = concat_chunks(chunks)
+        return data, build_memory_report(before, data) if optimize else None
+    elif is_sqlite_file(file_path):
+        query = sqlite_query or default_sqlite_query(file_path)
+        sql = sqlite_select(query)
+        with contextlib.closing(sqlite3.connect(file_path)) as conn:
+            total_rows = conn.execute(f"SELECT COUNT(*) FROM ({sql})").fetchone()[0] or 1
+            chunks, before = collect_chunks(pd.read_sql_query(sql, conn, chunksize=LOAD_CHUNK_ROWS),
+                                            lambda rows: rows / total_rows, cancel_event, progress, optimize)
+            if not chunks:
+                return pd.read_sql_query(sql + " LIMIT 0", conn), None
+        data = concat_chunks(chunks)
+        return data, build_memory_report(before, data) if optimize else None
+    elif file_path.endswith(".xlsx"):
+        if progress is not None:
+            progress(None, 0)
+        data = pd.read_excel(file_path)
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+        if not optimize:
+            return data, None
+        before = data.memory_usage(deep=True, index=False)
+        data = optimize_dtypes(data, infer_schema(data.head(INGEST_SAMPLE_ROWS)))
+        return data, build_memory_report(before, data)
+    raise ValueError(f"Unsupported file type: {os.path.basename(file_path)}")
+
+
+# Columnar (Feather) cache of parsed files, keyed by path + mtime + size + ingest mode
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".sportscope", "cache")
+CACHE_MAX_BYTES = 5 * 1024 ** 3
+OUT_OF_CORE_CACHE_MAX_BYTES = 100 * 1024 ** 3
+
+
+def cache_key(file_path, optimize, sqlite_query=None):
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{int(optimize)}"
+    if sqlite_query is not None:
+        raw += f"|{tuple(sqlite_query)!r}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def read_cached(key, cache_dir=CACHE_DIR):
+    data_path = os.path.join(cache_dir, key + ".feather")
+    if not os.path.exists(data_path):
+        return None
+    try:
+        data = pd.read_feather(data_path)
+    except Exception:
+        return None
+    report = None
+    report_path = os.path.join(cache_dir, key + ".report.json")
+    if os.path.exists(report_path):
+        report = pd.read_json(report_path, orient="split")
+    # Touch the entry so eviction treats it as recently used
+    os.utime(data_path)
+    return data, report
+
+
+def write_cached(key, data, report, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path = os.path.join(cache_dir, key + ".feather")
+    tmp_path = data_path + ".tmp"
+    try:
+        data.to_feather(tmp_path)
+        os.replace(tmp_path, data_path)
+        if report is not None:
+            report.to_json(os.path.join(cache_dir, key + ".report.json"), orient="split")
+    except Exception:
+        # Caching is best-effort (e.g. pyarrow missing or non-string column names)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    evict_cache(cache_dir, max_bytes)
+    return True
+
+
+# Helper: Delete least recently used cache entries until the cache fits in max_bytes
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, suffixes=(".feather",), keep=()):
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(suffixes):
+            path = os.path.join(cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        os.remove(path)
+        report_path = os.path.splitext(path)[0] + ".report.json"
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        total -= size
+
+
+def clear_cache(cache_dir=CACHE_DIR, keep=()):
+    if os.path.isdir(cache_dir):
+        evict_cache(cache_dir, 0, suffixes=(".feather", ".db"), keep=keep)
+
+
+# Helper: Load a data file through the columnar cache. Returns (data, memory_report, from_cache).
+def load_dataset(file_path, cancel_event=None, progress=None, optimize=False, use_cache=True, sqlite_query=None):
+    key = cache_key(file_path, optimize, sqlite_query) if use_cache else None
+    if key is not None:
+        cached = read_cached(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+    data, report = read_data_file(file_path, cancel_event, progress, optimize, sqlite_query)
+    if key is not None:
+        write_cached(key, data, report)
+    return data, report, False
+
+
+# Out-of-core backend: the dataset lives in a local SQLite file and only requested columns/rows are read
+OUT_OF_CORE_TABLE = "data"
+OUT_OF_CORE_CHART_ROWS = 1_000_000
+OUT_OF_CORE_PREVIEW_ROWS = 10_000
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+# Bulk SQLite export: typed columns, executemany batches inside one transaction, and journaling/fsync
+# switched off while writing. The target file is recreated from scratch, so a failed export leaves an
+# incomplete file behind rather than a half-updated database.
+SQLITE_EXPORT_TABLE = "converted_data"
+SQLITE_BATCH_ROWS = 50_000
+SQLITE_PAGE_SIZE = 65536
+SQLITE_CACHE_KIB = 256 * 1024
+
+
+def sqlite_affinity(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+# Helper: Row tuples of plain Python values (None for missing) ready for executemany
+def sqlite_rows(chunk):
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+            # NaN floats are stored as NULL by SQLite itself
+            columns.append(values.tolist())
+        else:
+            columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return zip(*columns)
+
+
+# Base for the chunked output writers: write(chunk) any number of times, then close(); abort() on failure
+class ChunkWriter(abc.ABC):
+    @abc.abstractmethod
+    def write(self, chunk):
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    def abort(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb_):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class SQLiteWriter(ChunkWriter):
+    def __init__(self, db_path, table=SQLITE_EXPORT_TABLE, index_columns=()):
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        self.table = table
+        self.index_columns = list(index_columns)
+        self.columns = None
+        self.insert_sql = None
+        self.rows = 0
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute(f"PRAGMA page_size = {SQLITE_PAGE_SIZE}")
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_KIB}")
+        self.conn.execute("BEGIN")
+
+    def write(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            missing = [c for c in self.index_columns if c not in self.columns]
+            if missing:
+                raise ValueError(f"Index columns not in the data: {', '.join(map(str, missing))}")
+            definitions = ", ".join(f"{quote_identifier(c)} {sqlite_affinity(chunk[c].dtype)}" for c in self.columns)
+            self.conn.execute(f"CREATE TABLE {quote_identifier(self.table)} ({definitions})")
+            self.insert_sql = (f"INSERT INTO {quote_identifier(self.table)} "
+                               f"VALUES ({', '.join('?' * len(self.columns))})")
+        for start in range(0, len(chunk), SQLITE_BATCH_ROWS):
+            self.conn.executemany(self.insert_sql, sqlite_rows(chunk.iloc[start:start + SQLITE_BATCH_ROWS]))
+        self.rows += len(chunk)
+
+    def close(self):
+        for col in self.index_columns:
+            self.conn.execute(f"CREATE INDEX {quote_identifier(f'idx_{self.table}_{col}')} "
+                              f"ON {quote_identifier(self.table)} ({quote_identifier(col)})")
+        self.conn.execute("COMMIT")
+        self.conn.close()
+
+    def abort(self):
+        self.conn.close()
+
+
+class SQLiteDataset:
+    def __init__(self, db_path, table=OUT_OF_CORE_TABLE):
+        self.db_path = db_path
+        self.table = table
+        # Derived columns (e.g. Prediction) are kept in memory, aligned to row position
+        self.extra_columns = {}
+        with contextlib.closing(self._connect()) as conn:
+            cursor = conn.execute(f"SELECT * FROM {quote_identifier(table)} LIMIT 0")
+            self.stored_columns = [d[0] for d in cursor.description]
+            # Rows are only ever appended, so MAX(rowid) is the row count without a full scan
+            self.n_rows = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {quote_identifier(table)}").fetchone()[0]
+        self.preview = self.load(self.stored_columns, stop=OUT_OF_CORE_PREVIEW_ROWS)
+
+    def _connect(self):
+        # One short-lived connection per query keeps the dataset usable from worker threads
+        return sqlite3.connect(self.db_path)
+
+    @property
+    def columns(self):
+        return self.stored_columns + [c for c in self.extra_columns if c not in self.stored_columns]
+
+    def __len__(self):
+        return self.n_rows
+
+    # Load the given columns for rows [start, stop), evenly thinned to at most max_rows rows.
+    # The result is indexed by 0-based row position.
+    def load(self, columns, start=None, stop=None, max_rows=None):
+        start = 0 if start is None else max(start, 0)
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        stored = [c for c in columns if c in self.stored_columns and c not in self.extra_columns]
+        select = ", ".join(["rowid - 1 AS __row__"] + [quote_identifier(c) for c in stored])
+        sql = f"SELECT {select} FROM {quote_identifier(self.table)} WHERE rowid > ? AND rowid <= ?"
+        params = [start, stop]
+        if max_rows and stop - start > max_rows:
+            sql += " AND (rowid - 1 - ?) % ? = 0"
+            params += [start, int(math.ceil((stop - start) / max_rows))]
+        with contextlib.closing(self._connect()) as conn:
+            frame = pd.read_sql_query(sql, conn, params=params, index_col="__row__")
+        return self._with_extra_columns(frame, columns)
+
+    # Load the given columns for specific 0-based row positions (e.g. flagged anomalies)
+    def load_rows(self, columns, positions):
+        stored = [c for c in columns if c in self.stored_columns and c not in self.extra_columns]
+        select = ", ".join(["d.rowid - 1 AS __row__"] + [f"d.{quote_identifier(c)}" for c in stored])
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE wanted (rid INTEGER PRIMARY KEY)")
+            conn.executemany("INSERT INTO wanted VALUES (?)", ((int(p) + 1,) for p in np.unique(positions)))
+            frame = pd.read_sql_query(f"SELECT {select} FROM wanted w JOIN {quote_identifier(self.table)} d "
+                                      f"ON d.rowid = w.rid ORDER BY w.rid", conn, index_col="__row__")
+        return self._with_extra_columns(frame, columns)
+
+    def _with_extra_columns(self, frame, columns):
+        frame.index.name = None
+        positions = frame.index.to_numpy()
+        for col in columns:
+            if col in self.extra_columns:
+                frame[col] = self.extra_columns[col].to_numpy()[positions]
+        return frame[[c for c in columns if c in frame.columns]]
+
+    def iter_chunks(self, chunk_rows=LOAD_CHUNK_ROWS, columns=None):
+        for start in range(0, self.n_rows, chunk_rows):
+            yield self.load(columns or self.columns, start=start, stop=start + chunk_rows)
+
+    def set_column(self, name, values):
+        self.extra_columns[name] = pd.Series(np.asarray(values), index=pd.RangeIndex(self.n_rows))
+
+    # Stream a CSV/Excel file into a SQLite file under the cache directory, reusing an existing copy
+    @classmethod
+    def from_file(cls, file_path, cancel_event=None, progress=None, cache_dir=CACHE_DIR, sqlite_query=None):
+        os.makedirs(cache_dir, exist_ok=True)
+        db_path = os.path.join(cache_dir, cache_key(file_path, False, sqlite_query) + ".db")
+        if os.path.exists(db_path):
+            os.utime(db_path)
+            return cls(db_path)
+        tmp_path = db_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            if is_sqlite_file(file_path):
+                # Copy the projected/filtered rows inside SQLite itself, so rowids are dense again
+                query = sqlite_query or default_sqlite_query(file_path)
+                if progress is not None:
+                    progress(None, 0)
+                with contextlib.closing(sqlite3.connect(tmp_path)) as conn:
+                    conn.execute("ATTACH DATABASE ? AS src", (file_path,))
+                    conn.execute(f"CREATE TABLE {quote_identifier(OUT_OF_CORE_TABLE)} AS "
+                                 f"{sqlite_select(query, 'src')}")
+                    conn.commit()
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled()
+            else:
+                with SQLiteWriter(tmp_path, OUT_OF_CORE_TABLE) as writer:
+                    if file_path.endswith(".csv"):
+                        total_bytes = os.path.getsize(file_path) or 1
+                        with open(file_path, "rb") as fh:
+                            for chunk in pd.read_csv(fh, chunksize=LOAD_CHUNK_ROWS):
+                                if cancel_event is not None and cancel_event.is_set():
+                                    raise LoadCancelled()
+                                writer.write(chunk)
+                                if progress is not None:
+                                    progress(min(fh.tell() / total_bytes, 1.0), writer.rows)
+                    else:
+                        data, _ = read_data_file(file_path, cancel_event, progress)
+                        writer.write(data)
+            os.replace(tmp_path, db_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        evict_cache(cache_dir, OUT_OF_CORE_CACHE_MAX_BYTES, suffixes=(".db",), keep=(db_path,))
+        return cls(db_path)
+
+
+# ------------------ Streaming Conversion ------------------
+# Input is read and written chunk by chunk, so converting a file needs memory for one chunk, not the whole file
+CONVERT_FORMATS = {"CSV": ".csv", "Excel": ".xlsx", "SQLite": ".db", "Parquet": ".parquet", "Feather": ".feather"}
+CONVERT_INPUT_EXTENSIONS = (".csv", ".xlsx") + SQLITE_EXTENSIONS
+CONVERT_PROCESSES = os.cpu_count() or 1
+CONVERT_POLL_MS = 200
+EXCEL_MAX_ROWS = 1_048_576
+
+ConvertStats = collections.namedtuple("ConvertStats", "rows bytes_read seconds")
+
+
+class CSVChunkWriter(ChunkWriter):
+    def __init__(self, file_path):
+        self.files = contextlib.ExitStack()
+        self.fh = self.files.enter_context(open(file_path, "w", newline="", encoding="utf-8"))
+        self.header = True
+
+    def write(self, chunk):
+        try:
+            chunk.to_csv(self.fh, header=self.header, index=False)
+        except BaseException:
+            # Don't leave the file open when the writer is used without a with block
+            self.close()
+            raise
+        self.header = False
+
+    def close(self):
+        self.files.close()
+
+
+# Write-only workbooks stream rows to a temporary file instead of keeping cells in memory; data past the
+# sheet row limit continues on a new sheet
+class ExcelChunkWriter(ChunkWriter):
+    def __init__(self, file_path):
+        import openpyxl
+        self.file_path = file_path
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+
+    def write(self, chunk):
+        rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        for row in rows:
+            if self.sheet is None or self.sheet_rows >= EXCEL_MAX_ROWS:
+                self.sheet = self.workbook.create_sheet(f"Sheet{len(self.workbook.worksheets) + 1}")
+                self.sheet.append([str(c) for c in chunk.columns])
+                self.sheet_rows = 1
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        if self.sheet is None:
+            self.workbook.create_sheet("Sheet1")
+        self.workbook.save(self.file_path)
+
+
+# Parquet and Feather need one schema for the whole file: it is taken from the first chunk (columns that are
+# empty there become text) and later chunks are cast to it
+class ArrowChunkWriter(ChunkWriter):
+    def __init__(self, file_path):
+        import pyarrow
+        self.pa = pyarrow
+        self.file_path = file_path
+        self.schema = None
+        self.writer = None
+
+    # The format's writer for the schema taken from the first chunk
+    @abc.abstractmethod
+    def open(self, schema):
+        pass
+
+    def table(self, chunk):
+        table = self.pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.schema is None:
+            self.schema = self.pa.schema([f.with_type(self.pa.string()) if column.null_count == len(column) else f
+                                          for f, column in zip(table.schema, table.columns)]).remove_metadata()
+            self.writer = self.open(self.schema)
+        try:
+            return table.cast(self.schema)
+        except (self.pa.ArrowInvalid, self.pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Column types changed partway through the file ({e}).") from e
+
+    def write(self, chunk):
+        table = self.table(chunk)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ParquetChunkWriter(ArrowChunkWriter):
+    def open(self, schema):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self.file_path, schema)
+
+
+class FeatherChunkWriter(ArrowChunkWriter):
+    def open(self, schema):
+        return self.pa.ipc.new_file(self.file_path, schema,
+                                    options=self.pa.ipc.IpcWriteOptions(compression="lz4"))
+
+
+def make_chunk_writer(output_format, file_path, index_columns=()):
+    if output_format == "CSV":
+        return CSVChunkWriter(file_path)
+    if output_format == "Excel":
+        return ExcelChunkWriter(file_path)
+    if output_format == "SQLite":
+        return SQLiteWriter(file_path, index_columns=index_columns)
+    if output_format == "Parquet":
+        return ParquetChunkWriter(file_path)
+    if output_format == "Feather":
+        return FeatherChunkWriter(file_path)
+    raise ValueError(f"Unsupported output format: {output_format}")
+
+
+# Helper: Yield (chunk, bytes of input consumed so far) from a CSV, Excel or SQLite file
+def iter_source_chunks(file_path, chunk_rows=LOAD_CHUNK_ROWS, sqlite_query=None):
+    total_bytes = os.path.getsize(file_path)
+    if file_path.endswith(".csv"):
+        with open(file_path, "rb") as fh:
+            for chunk in pd.read_csv(fh, chunksize=chunk_rows):
+                yield chunk, fh.tell()
+    elif is_sqlite_file(file_path):
+        sql = sqlite_select(sqlite_query or default_sqlite_query(file_path))
+        with contextlib.closing(sqlite3.connect(file_path)) as conn:
+            total_rows = conn.execute(f"SELECT COUNT(*) FROM ({sql})").fetchone()[0] or 1
+            rows = 0
+            for chunk in pd.read_sql_query(sql, conn, chunksize=chunk_rows):
+                rows += len(chunk)
+                yield chunk, total_bytes * min(rows / total_rows, 1.0)
+    elif file_path.endswith(".xlsx"):
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            total_rows = sheet.max_row or 1
+            values = sheet.iter_rows(values_only=True)
+            header = next(values, None)
+            if header is None:
+                return
+            rows = 1
+            while True:
+                batch = list(itertools.islice(values, chunk_rows))
+                if not batch:
+                    break
+                rows += len(batch)
+                # Read-only sheets drop trailing empty cells, so rows can be shorter than the header
+                chunk = pd.DataFrame(batch).reindex(columns=range(len(header)))
+                chunk.columns = header
+                yield chunk, total_bytes * min(rows / total_rows, 1.0)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported input file: {os.path.basename(file_path)}")
+
+
+# Convert one file without loading it; progress(rows, bytes_read) is called after every chunk.
+# A cancelled or failed conversion removes the partial output. sqlite_query picks the table, columns and filter
+# of a SQLite input (default: the first table); other inputs ignore it.
+def stream_convert(file_path, output_path, output_format, cancel_event=None, progress=None, index_columns=(),
+                   chunk_rows=LOAD_CHUNK_ROWS, sqlite_query=None):
+    start = time.perf_counter()
+    rows = 0
+    bytes_read = 0
+    try:
+        with make_chunk_writer(output_format, output_path, index_columns) as writer:
+            for chunk, bytes_read in iter_source_chunks(file_path, chunk_rows, sqlite_query):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled()
+                writer.write(chunk)
+                rows += len(chunk)
+                if progress is not None:
+                    progress(rows, bytes_read)
+            if rows == 0:
+                raise ValueError(f"{os.path.basename(file_path)} contains no rows.")
+    except BaseException:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    return ConvertStats(rows, bytes_read, time.perf_counter() - start)
+
+
+# Runs in a worker process: cancel_event and updates are manager proxies shared with the parent
+def _convert_task(file_path, output_path, output_format, index_columns, cancel_event, updates, sqlite_query=None):
+    return stream_convert(file_path, output_path, output_format, cancel_event,
+                          lambda rows, bytes_read: updates.put((file_path, rows, bytes_read)), index_columns,
+                          sqlite_query=sqlite_query)
+
+
+# Convert (input, output) pairs, one file per process. progress(file_path, rows, bytes_read) reports each
+# file's position; returns {file_path: ConvertStats or the exception that file failed with}.
+# sqlite_query, if given, is used for every SQLite input.
+def convert_files(jobs, output_format, cancel_event=None, progress=None, index_columns=(),
+                  processes=CONVERT_PROCESSES, sqlite_query=None):
+    results = {}
+    if processes <= 1 or len(jobs) == 1:
+        for file_path, output_path in jobs:
+            report = (lambda rows, bytes_read, path=file_path: progress(path, rows, bytes_read)) if progress else None
+            try:
+                results[file_path] = stream_convert(file_path, output_path, output_format, cancel_event, report,
+                                                    index_columns, sqlite_query=sqlite_query)
+            except LoadCancelled:
+                raise
+            except Exception as e:
+                results[file_path] = e
+        return results
+
+    with multiprocessing.Manager() as manager:
+        remote_cancel, updates = manager.Event(), manager.Queue()
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=min(processes, len(jobs)))
+        try:
+            futures = {pool.submit(_convert_task, file_path, output_path, output_format, index_columns,
+                                   remote_cancel, updates, sqlite_query): file_path
+                       for file_path, output_path in jobs}
+            pending = set(futures)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    # Let running conversions see the flag and remove their partial output before tearing down
+                    remote_cancel.set()
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise LoadCancelled()
+                done, pending = concurrent.futures.wait(pending, timeout=CONVERT_POLL_MS / 1000)
+                while not updates.empty():
+                    update = updates.get()
+                    if progress is not None:
+                        progress(*update)
+                for future in done:
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        results[futures[future]] = e
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+# Chart data reduction: keep figure size bounded regardless of dataset size
+CHART_MAX_POINTS = 20_000
+DENSITY_BINS = 200
+HISTOGRAM_BINS = 100
+# Label of the bucket that categories outside the largest max_points - 1 are summed into
+OTHER_CATEGORY = "Other"
+WEBGL_THRESHOLD = 10_000
+
+
+# Helper: Largest-Triangle-Three-Buckets downsampling; returns the positions of the points to keep
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def is_numeric_like(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) \
+        or pd.api.types.is_datetime64_any_dtype(series)
+
+
+# Helper: Downsample an x/y line to max_points with LTTB, sorted by x when x is numeric
+def reduce_line(data, x_column, y_column, max_points):
+    frame = data.dropna(subset=[y_column])
+    if is_numeric_like(frame[x_column]):
+        frame = frame.sort_values(by=x_column)
+        x = frame[x_column].to_numpy()
+        x = x.astype("int64").astype(float) if np.issubdtype(x.dtype, np.datetime64) else x.astype(float)
+    else:
+        x = np.arange(len(frame), dtype=float)
+    return frame.iloc[lttb_indices(x, frame[y_column].to_numpy(dtype=float), max_points)]
+
+
+# Helper: Sum y per x (and per z when given), keeping the original column names
+def group_sum(data, x_column, y_column, z_column=None):
+    keys = [x_column] + ([z_column] if z_column else [])
+    return data.groupby(keys, observed=True, sort=True)[y_column].sum().reset_index()
+
+
+# Helper: Shrink the data behind a chart to at most max_points marks using the chart's reduction kind
+# ("line", "density", "histogram", "group" or "sample"). Returns (data, method); method is None when
+# no reduction was needed.
+def reduce_chart_data(data, kind, x_column, y_column, max_points=CHART_MAX_POINTS, z_column=None):
+    if kind is None or len(data) <= max_points:
+        return data, None
+    x_numeric = x_column in data.columns and is_numeric_like(data[x_column])
+    y_numeric = y_column in data.columns and pd.api.types.is_numeric_dtype(data[y_column])
+    if kind == "line" and y_numeric:
+        return reduce_line(data, x_column, y_column, max_points), "LTTB"
+    if kind == "density" and x_numeric and y_numeric:
+        frame = data[[x_column, y_column]].dropna()
+        # bins x bins cells, so at most max_points of them can be non-empty
+        bins = min(DENSITY_BINS, max(1, int(math.sqrt(max_points))))
+        counts, x_edges, y_edges = np.histogram2d(frame[x_column].astype(float), frame[y_column].astype(float),
+                                                  bins=bins)
+        xi, yi = np.nonzero(counts)
+        binned = pd.DataFrame({x_column: (x_edges[xi] + x_edges[xi + 1]) / 2,
+                               y_column: (y_edges[yi] + y_edges[yi + 1]) / 2,
+                               "count": counts[xi, yi]})
+        return binned, "density"
+    if kind == "histogram" and x_numeric:
+        counts, edges = np.histogram(data[x_column].dropna().astype(float), bins=HISTOGRAM_BINS)
+        return pd.DataFrame({x_column: (edges[:-1] + edges[1:]) / 2, "count": counts}), "binned"
+    if kind == "group" and y_numeric:
+        frame = data
+        method = "grouped sum"
+        if data[x_column].nunique() > max_points:
+            if x_numeric:
+                frame = data.assign(**{x_column: pd.cut(data[x_column], bins=max_points)
+                                       .apply(lambda interval: interval.mid).astype(float)})
+            else:
+                # e.g. player IDs: keep the categories with the largest sums and fold the rest into one bucket
+                top = data.groupby(x_column, observed=True)[y_column].sum().nlargest(max(max_points - 1, 1)).index
+                keys = data[x_column].astype(object)
+                frame = data.assign(**{x_column: keys.where(keys.isin(top), OTHER_CATEGORY)})
+                method = f"grouped sum, top {len(top):,} categories + {OTHER_CATEGORY}"
+        return group_sum(frame, x_column, y_column, z_column), method
+    step = int(math.ceil(len(data) / max_points))
+    return data.iloc[::step], "sampled"
+
+
+def density_figure(data, x_column, y_column, title):
+    grid = data.pivot_table(index=y_column, columns=x_column, values="count", aggfunc="sum")
+    fig = go.Figure(go.Heatmap(x=grid.columns.to_numpy(), y=grid.index.to_numpy(), z=grid.to_numpy(),
+                               colorscale="Viridis", colorbar=dict(title="Count")))
+    fig.update_layout(title=title, xaxis_title=x_column, yaxis_title=y_column)
+    return fig
+
+
+def add_reduction_note(fig, total_rows, shown_rows, method):
+    fig.add_annotation(text=f"Reduced {total_rows:,} rows to {shown_rows:,} ({method})", showarrow=False,
+                       xref="paper", yref="paper", x=1, y=1.06, xanchor="right", font=dict(size=11, color="gray"))
+
+
+# ------------------ Chart Engine ------------------
+# Every chart type is registered once with its builder, the column roles it needs (x, y, z), how its data
+# is reduced for large datasets and whether it takes the prediction/anomaly overlays and WebGL rendering.
+class ChartType:
+    def __init__(self, name, builder, requires=("x", "y"), optional=(), reduction="sample", overlays=False,
+                 webgl=False, dashboard=True):
+        self.name = name
+        self.builder = builder
+        self.requires = requires
+        self.optional = optional
+        self.reduction = reduction
+        self.overlays = overlays
+        self.webgl = webgl
+        # Whether the chart's traces can be placed in a dashboard subplot cell
+        self.dashboard = dashboard
+
+    @property
+    def roles(self):
+        return self.requires + self.optional
+
+    def missing_roles(self, columns):
+        return [role for role in self.requires if not columns.get(role)]
+
+    def used_columns(self, columns):
+        return [columns[role] for role in self.roles if columns.get(role)]
+
+    def default_title(self, columns):
+        return f"{self.name}: " + " vs ".join(columns[role] for role in self.requires if columns.get(role))
+
+
+CHART_TYPES = {}
+
+
+def register_chart(name, **kwargs):
+    def decorator(builder):
+        CHART_TYPES[name] = ChartType(name, builder, **kwargs)
+        return builder
+    return decorator
+
+
+def get_chart_type(name):
+    if name in CHART_TYPES:
+        return CHART_TYPES[name]
+    name_lower = (name or "").strip().lower()
+    for chart_name, chart_type in CHART_TYPES.items():
+        if chart_name.lower() == name_lower:
+            return chart_type
+    return None
+
+
+# Builders take (data, columns, options) and return a Plotly figure. options carries title, palette,
+# continuous_scale, render_mode and reduction.
+@register_chart("Scatter", reduction="density", overlays=True, webgl=True)
+def build_scatter(data, cols, opts):
+    if opts["reduction"] == "density":
+        return density_figure(data, cols["x"], cols["y"], opts["title"])
+    return px.scatter(data, x=cols["x"], y=cols["y"], title=opts["title"], render_mode=opts["render_mode"],
+                      color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Line", reduction="line", overlays=True, webgl=True)
+def build_line(data, cols, opts):
+    return px.line(data, x=cols["x"], y=cols["y"], title=opts["title"], render_mode=opts["render_mode"],
+                   color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Bar", reduction="group")
+def build_bar(data, cols, opts):
+    return px.bar(data, x=cols["x"], y=cols["y"], title=opts["title"], color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Clustered Bar", optional=("z",), reduction="group")
+def build_clustered_bar(data, cols, opts):
+    grouped = group_sum(data, cols["x"], cols["y"], cols.get("z"))
+    return px.bar(grouped, x=cols["x"], y=cols["y"], color=cols.get("z") or None, barmode="group", title=opts["title"],
+                  color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Pie", reduction="group")
+def build_pie(data, cols, opts):
+    return px.pie(data, names=cols["x"], values=cols["y"], title=opts["title"],
+                  color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Donut", reduction="group")
+def build_donut(data, cols, opts):
+    return px.pie(data, names=cols["x"], values=cols["y"], hole=0.45, title=opts["title"],
+                  color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Area", reduction="line")
+def build_area(data, cols, opts):
+    return px.area(data, x=cols["x"], y=cols["y"], title=opts["title"], color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Bubble", overlays=True, webgl=True)
+def build_bubble(data, cols, opts):
+    return px.scatter(data, x=cols["x"], y=cols["y"], title=opts["title"], render_mode=opts["render_mode"],
+                      size=data.index, color=data.index, color_continuous_scale=opts["continuous_scale"])
+
+
+@register_chart("Waterfall", reduction="group")
+def build_waterfall(data, cols, opts):
+    fig = go.Figure(go.Waterfall(x=data[cols["x"]], y=data[cols["y"]]))
+    fig.update_layout(title=opts["title"])
+    return fig
+
+
+@register_chart("Histogram", requires=("x",), reduction="histogram")
+def build_histogram(data, cols, opts):
+    if opts["reduction"] == "binned":
+        return px.bar(data, x=cols["x"], y="count", title=opts["title"], color_discrete_sequence=opts["palette"])
+    return px.histogram(data, x=cols["x"], title=opts["title"], color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Funnel", reduction="group")
+def build_funnel(data, cols, opts):
+    grouped = group_sum(data, cols["x"], cols["y"]).sort_values(by=cols["y"], ascending=False)
+    return px.funnel(grouped, x=cols["y"], y=cols["x"], title=opts["title"], color_discrete_sequence=opts["palette"])
+
+
+# Gantt: X is the start, Y the finish and Z the task label
+@register_chart("Gantt", requires=("x", "y", "z"))
+def build_gantt(data, cols, opts):
+    frame = data.copy()
+    for role in ("x", "y"):
+        if not pd.api.types.is_datetime64_any_dtype(frame[cols[role]]):
+            frame[cols[role]] = pd.to_datetime(frame[cols[role]], errors="coerce")
+    return px.timeline(frame, x_start=cols["x"], x_end=cols["y"], y=cols["z"], title=opts["title"],
+                       color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Radar", reduction="group")
+def build_radar(data, cols, opts):
+    grouped = group_sum(data, cols["x"], cols["y"])
+    return px.line_polar(grouped, r=cols["y"], theta=cols["x"], line_close=True, title=opts["title"],
+                         color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Treemap", reduction="group")
+def build_treemap(data, cols, opts):
+    grouped = group_sum(data, cols["x"], cols["y"])
+    return px.treemap(grouped, path=[cols["x"]], values=cols["y"], title=opts["title"],
+                      color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Box Plot", requires=("y",))
+def build_box(data, cols, opts):
+    return px.box(data, y=cols["y"], title=opts["title"], color_discrete_sequence=opts["palette"])
+
+
+@register_chart("Heatmap", reduction="density")
+def build_heatmap(data, cols, opts):
+    if opts["reduction"] == "density":
+        return density_figure(data, cols["x"], cols["y"], opts["title"])
+    return px.density_heatmap(data, x=cols["x"], y=cols["y"], title=opts["title"])
+
+
+# Bullet Graph: one bullet per X category (top 8 by total Y), with the mean category total as the target
+@register_chart("Bullet Graph", reduction="group", dashboard=False)
+def build_bullet(data, cols, opts):
+    grouped = group_sum(data, cols["x"], cols["y"]).nlargest(8, cols["y"])
+    target = grouped[cols["y"]].mean()
+    axis_max = grouped[cols["y"]].max()
+    fig = go.Figure()
+    n = len(grouped)
+    for i, (label, value) in enumerate(zip(grouped[cols["x"]], grouped[cols["y"]])):
+        top = 1 - i / n
+        fig.add_trace(go.Indicator(
+            mode="number+gauge", value=value, title=dict(text=str(label)),
+            domain=dict(x=[0.25, 1], y=[top - 1 / n + 0.02, top - 0.02]),
+            gauge=dict(shape="bullet", axis=dict(range=[0, axis_max]), bar=dict(color=opts["palette"][0]),
+                       threshold=dict(line=dict(color="red", width=2), thickness=0.75, value=target))))
+    fig.update_layout(title=opts["title"], height=max(300, 80 * n))
+    return fig
+
+
+@register_chart("3D Scatter", requires=("x", "y", "z"))
+def build_scatter_3d(data, cols, opts):
+    return px.scatter_3d(data, x=cols["x"], y=cols["y"], z=cols["z"], title=opts["title"],
+                         color_discrete_sequence=opts["palette"])
+
+
+@register_chart("3D Bubble", requires=("x", "y", "z"))
+def build_bubble_3d(data, cols, opts):
+    return px.scatter_3d(data, x=cols["x"], y=cols["y"], z=cols["z"], size=data.index, title=opts["title"],
+                         color_discrete_sequence=opts["palette"])
+
+
+@register_chart("3D Line", requires=("x", "y", "z"))
+def build_line_3d(data, cols, opts):
+    return px.line_3d(data, x=cols["x"], y=cols["y"], z=cols["z"], title=opts["title"],
+                      color_discrete_sequence=opts["palette"])
+
+
+# 3D Surface: Z is averaged over an X/Y grid, binned when X or Y has many distinct values
+@register_chart("3D Surface", requires=("x", "y", "z"), reduction=None)
+def build_surface(data, cols, opts):
+    frame = data[[cols["x"], cols["y"], cols["z"]]].dropna()
+    for role in ("x", "y"):
+        column = frame[cols[role]]
+        if is_numeric_like(column) and column.nunique() > DENSITY_BINS:
+            frame[cols[role]] = pd.cut(column, bins=DENSITY_BINS).apply(lambda interval: interval.mid).astype(float)
+    grid = frame.pivot_table(index=cols["y"], columns=cols["x"], values=cols["z"], aggfunc="mean", observed=True)
+    fig = go.Figure(go.Surface(x=grid.columns.to_numpy(), y=grid.index.to_numpy(), z=grid.to_numpy()))
+    fig.update_layout(title=opts["title"])
+    return fig
+
+
+# Venn Diagram: overlap between the distinct values of the X and Y columns
+@register_chart("Venn Diagram", reduction=None, dashboard=False)
+def build_venn(data, cols, opts):
+    left = set(data[cols["x"]].dropna().unique())
+    right = set(data[cols["y"]].dropna().unique())
+    colors = opts["palette"] + ["#EF553B"]
+    fig = go.Figure()
+    fig.add_shape(type="circle", x0=0, y0=0, x1=2, y1=2, fillcolor=colors[0], opacity=0.4, line_width=1)
+    fig.add_shape(type="circle", x0=1.2, y0=0, x1=3.2, y1=2, fillcolor=colors[1], opacity=0.4, line_width=1)
+    for x, text in ((0.6, len(left - right)), (1.6, len(left & right)), (2.6, len(right - left))):
+        fig.add_annotation(x=x, y=1, text=f"{text:,}", showarrow=False, font=dict(size=18))
+    fig.add_annotation(x=1, y=2.2, text=cols["x"], showarrow=False)
+    fig.add_annotation(x=2.2, y=2.2, text=cols["y"], showarrow=False)
+    fig.update_xaxes(visible=False, range=[-0.2, 3.4])
+    fig.update_yaxes(visible=False, range=[-0.2, 2.5], scaleanchor="x")
+    fig.update_layout(title=opts["title"], plot_bgcolor="rgba(0,0,0,0)")
+    return fig
+
+
+# Helper: Shared theming/layout applied to every chart
+def apply_chart_theme(fig, theme):
+    fig.update_layout(title_font=dict(family=theme["font_family"], size=theme["title_size"],
+                                      color=theme["title_color"]),
+                      xaxis=dict(title_font=dict(color=theme["axis_color"])),
+                      yaxis=dict(title_font=dict(color=theme["axis_color"])),
+                      font=dict(color=theme["axis_color"]),
+                      margin=dict(l=60, r=80, t=60, b=60))
+    return fig
+
+
+ChartResult = collections.namedtuple("ChartResult", "figure reduction total_rows shown_rows render_mode seconds")
+# The data a chart is drawn from after reduction, with the reduction method and the row count it came from
+ReducedChart = collections.namedtuple("ReducedChart", "data reduction total_rows")
+
+
+class ChartEngine:
+    def __init__(self):
+        # chart type -> [builds, total seconds, last seconds]
+        self.timings = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def resolve(chart_type, columns):
+        spec = get_chart_type(chart_type)
+        if spec is None:
+            raise ValueError(f"Chart type '{chart_type}' is not implemented.")
+        missing = spec.missing_roles(columns)
+        if missing:
+            raise ValueError(f"{spec.name} charts need a column for: {', '.join(r.upper() for r in missing)}.")
+        return spec
+
+    def reduce(self, chart_type, data, columns, max_points=CHART_MAX_POINTS):
+        spec = self.resolve(chart_type, columns)
+        reduced, reduction = reduce_chart_data(data, spec.reduction, columns.get("x"), columns.get("y"), max_points,
+                                               columns.get("z") if "z" in spec.roles else None)
+        return ReducedChart(reduced, reduction, len(data))
+
+    def build(self, chart_type, data, columns, theme, title=None, palette=None, continuous_scale="Viridis",
+              max_points=CHART_MAX_POINTS, webgl_threshold=WEBGL_THRESHOLD):
+        start = time.perf_counter()
+        reduced = self.reduce(chart_type, data, columns, max_points)
+        return self.build_reduced(chart_type, reduced, columns, theme, title, palette, continuous_scale,
+                                  webgl_threshold, start)
+
+    # Build from already reduced data, e.g. aggregates persisted with a saved dashboard
+    def build_reduced(self, chart_type, reduced, columns, theme, title=None, palette=None,
+                      continuous_scale="Viridis", webgl_threshold=WEBGL_THRESHOLD, start=None):
+        start = start or time.perf_counter()
+        spec = self.resolve(chart_type, columns)
+        data, reduction, total_rows = reduced
+        # Decided on the reduced data: a density-binned scatter is a heatmap, and its overlays stay SVG on top of it
+        webgl = spec.webgl and reduction != "density" and len(data) > webgl_threshold
+        render_mode = "webgl" if webgl else "svg"
+        options = dict(title=title or spec.default_title(columns), palette=palette or px.colors.qualitative.Plotly,
+                       continuous_scale=continuous_scale, render_mode=render_mode, reduction=reduction)
+        fig = apply_chart_theme(spec.builder(data, columns, options), theme)
+        if reduction:
+            add_reduction_note(fig, total_rows, len(data), reduction)
+        seconds = time.perf_counter() - start
+        with self.lock:
+            stats = self.timings.setdefault(spec.name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = seconds
+        return ChartResult(fig, reduction, total_rows, len(data), render_mode, seconds)
+
+    def timing_report(self):
+        lines = [f"{'Chart type':<16}{'Builds':>8}{'Avg (ms)':>12}{'Last (ms)':>12}"]
+        for name, (count, total, last) in sorted(self.timings.items()):
+            lines.append(f"{name:<16}{count:>8}{total / count * 1000:>12.1f}{last * 1000:>12.1f}")
+        return "\n".join(lines)
+
+
+# Helper: Fitted-prediction, forecast and confidence-band traces. fitted holds x_column and a "Prediction" column;
+# overlay traces follow the same SVG/WebGL switch as the main chart.
+def add_forecast_traces(fig, render_mode, fitted, x_column, forecast_x=None, forecast_y=None, forecast_ci=None,
+                        max_points=CHART_MAX_POINTS):
+    scatter_cls = go.Scattergl if render_mode == "webgl" else go.Scatter
+    if len(fitted) > max_points:
+        sorted_df = reduce_line(fitted, x_column, "Prediction", max_points)
+    else:
+        sorted_df = fitted.sort_values(by=x_column)
+    pred_trace = scatter_cls(
+        x=sorted_df[x_column],
+        y=sorted_df["Prediction"],
+        mode="lines",
+        name="Fitted Prediction",
+        line=dict(color="red", width=2)
+    )
+    fig.add_trace(pred_trace)
+    if forecast_x is not None and forecast_y is not None and len(forecast_x) > 0:
+        forecast_trace = scatter_cls(
+            x=forecast_x,
+            y=forecast_y,
+            mode="lines",
+            name="Forecast",
+            line=dict(color="red", width=2, dash="dash")
+        )
+        fig.add_trace(forecast_trace)
+        if forecast_ci is not None:
+            lower, upper = forecast_ci
+            fig.add_trace(scatter_cls(
+                x=list(forecast_x) + list(forecast_x[::-1]),
+                y=list(upper) + list(lower[::-1]),
+                fill='toself',
+                fillcolor='rgba(255,0,0,0.2)',
+                line=dict(color='rgba(255,255,255,0)'),
+                hoverinfo="skip",
+                showlegend=True,
+                name="95% CI"
+            ))
+    return fig
+
+
+def add_anomaly_trace(fig, render_mode, anomaly_points, x_column, y_column):
+    if anomaly_points.empty:
+        return fig
+    scatter_cls = go.Scattergl if render_mode == "webgl" else go.Scatter
+    anom_trace = scatter_cls(
+        x=anomaly_points[x_column],
+        y=anomaly_points[y_column],
+        mode="markers",
+        name="Anomalies",
+        marker=dict(color="black", size=10, symbol="x")
+    )
+    fig.add_trace(anom_trace)
+    return fig
+
+
+# ------------------ Figure Cache ------------------
+FIGURE_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
+# Dashboard charts are built concurrently; pandas/numpy release the GIL for most of the heavy work
+CHART_WORKERS = min(8, os.cpu_count() or 1)
+DASHBOARD_POLL_MS = 100
+
+
+# Helper: Rough size of a figure, counting the arrays held by its traces
+def estimate_figure_bytes(fig):
+    def walk(value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (list, tuple)):
+            return 8 * len(value)
+        if isinstance(value, dict):
+            return sum(walk(v) for v in value.values())
+        return 0
+
+    return 4096 + sum(walk(trace.to_plotly_json()) for trace in fig.data)
+
+
+# LRU cache of built figures, bounded by total estimated size. Callers always receive a copy.
+class FigureCache:
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Dashboard charts read and fill the cache from worker threads
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return go.Figure(entry[0])
+
+    def put(self, key, fig):
+        size = estimate_figure_bytes(fig)
+        if size > self.max_bytes:
+            return
+        copy = go.Figure(fig)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (copy, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats_text(self):
+        return (f"figure cache: {self.hits} hits / {self.misses} misses, "
+                f"{len(self.entries)} figures, {self.total_bytes / 1e6:.1f} MB")
+
+
+# Helper: Combine chart figures into one roughly square subplot grid (None leaves a cell empty)
+def dashboard_figure(figures, title="Custom Dashboard"):
+    num_charts = len(figures)
+    cols = int(math.ceil(math.sqrt(num_charts)))
+    rows = int(math.ceil(num_charts / cols))
+
+    # Each cell takes the subplot type of its chart's first trace (xy, domain for pies, polar for radar...)
+    specs = [[{"type": "xy"} for _ in range(cols)] for _ in range(rows)]
+    for index, fig in enumerate(figures):
+        if fig is not None and fig.data:
+            specs[index // cols][index % cols] = {"type": fig.data[0].type}
+
+    subplot_titles = [f"Chart {i + 1}" for i in range(num_charts)]
+    combined_fig = make_subplots(rows=rows, cols=cols, subplot_titles=subplot_titles, specs=specs)
+    for index, fig in enumerate(figures):
+        if fig is None:
+            continue
+        for trace in fig.data:
+            combined_fig.add_trace(trace, row=index // cols + 1, col=index % cols + 1)
+
+    combined_fig.update_layout(height=rows * 400, width=cols * 600, title_text=title)
+    return combined_fig
+
+
+# ------------------ Dashboard HTML Export ------------------
+# Arrays shorter than this stay inline in the trace JSON
+EXPORT_MIN_ARRAY = 16
+
+EXPORT_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{plotly_tag}
+</head>
+<body>
+<div id="dashboard"></div>
+<script>
+const DATA = {payload};
+const FIGURE = {figure};
+const decoded = {{}};
+function decode(entry) {{
+  if (entry.dtype === "json") return entry.values;
+  const bytes = Uint8Array.from(atob(entry.b64), c => c.charCodeAt(0));
+  const values = entry.dtype === "f4" ? new Float32Array(bytes.buffer) : new Float64Array(bytes.buffer);
+  if (!entry.shape) return values;
+  const rows = [];
+  for (let i = 0; i < entry.shape[0]; i++) rows.push(values.subarray(i * entry.shape[1], (i + 1) * entry.shape[1]));
+  return rows;
+}}
+function resolve(value) {{
+  if (Array.isArray(value)) return value.map(resolve);
+  if (value && typeof value === "object") {{
+    if ("__ref__" in value) {{
+      const key = value.__ref__;
+      if (!(key in decoded)) decoded[key] = decode(DATA[key]);
+      return decoded[key];
+    }}
+    const out = {{}};
+    for (const k in value) out[k] = resolve(value[k]);
+    return out;
+  }}
+  return value;
+}}
+const figure = resolve(FIGURE);
+Plotly.newPlot("dashboard", figure.data, figure.layout, {{responsive: true}});
+</script>
+</body>
+</html>
+"""
+
+
+# Helper: Turn a trace array (list, numpy array or Plotly's {dtype, bdata} encoding) into a numpy array
+def _as_trace_array(value):
+    if isinstance(value, dict):
+        if "bdata" not in value or "dtype" not in value:
+            return None
+        array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=np.dtype(value["dtype"]))
+        if value.get("shape"):
+            array = array.reshape([int(n) for n in str(value["shape"]).split(",")])
+        return array
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+        array = np.asarray(value)
+        if array.dtype == object and any(isinstance(v, (dict, list, tuple)) for v in array.ravel()[:EXPORT_MIN_ARRAY]):
+            return None
+        return array
+    return None
+
+
+# Helper: Store an array once in the shared payload (deduplicated by content) and return a reference to it
+def _shared_array_ref(array, payload, index):
+    if array.dtype.kind in "iuf" and array.ndim <= 2:
+        data = array.astype(np.float32)
+        if not np.allclose(data, array, rtol=1e-6, equal_nan=True):
+            data = array.astype(np.float64)
+        raw = data.tobytes()
+        key = hashlib.sha1(data.dtype.str.encode() + str(data.shape).encode() + raw).hexdigest()
+        if key not in index:
+            entry = {"dtype": "f4" if data.dtype == np.float32 else "f8",
+                     "b64": base64.b64encode(raw).decode("ascii")}
+            if data.ndim == 2:
+                entry["shape"] = list(data.shape)
+            index[key] = f"a{len(payload)}"
+            payload[index[key]] = entry
+    else:
+        if array.dtype.kind == "M":
+            values = np.datetime_as_string(array).tolist()
+        else:
+            values = array.tolist()
+        text = to_json_plotly(values)
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if key not in index:
+            index[key] = f"a{len(payload)}"
+            payload[index[key]] = {"dtype": "json", "values": values}
+    return {"__ref__": index[key]}
+
+
+def _share_trace_arrays(value, payload, index):
+    array = _as_trace_array(value)
+    if array is not None and array.size >= EXPORT_MIN_ARRAY:
+        return _shared_array_ref(array, payload, index)
+    if isinstance(value, dict):
+        return {k: _share_trace_arrays(v, payload, index) for k, v in value.items()}
+    return value
+
+
+# Write a figure as one static HTML file. Every distinct data array is serialized once as a typed
+# (base64 float32/float64) array and referenced by the traces that use it. Plotly.js is inlined once,
+# or with plotly_js="directory" written next to the HTML file as plotly.min.js and loaded from there.
+def export_dashboard_html(fig, file_path, title="Custom Dashboard", plotly_js="inline"):
+    spec = fig.to_plotly_json()
+    payload, index = {}, {}
+    figure = {"data": [_share_trace_arrays(trace, payload, index) for trace in spec["data"]],
+              "layout": spec["layout"]}
+    if plotly_js == "directory":
+        js_path = os.path.join(os.path.dirname(os.path.abspath(file_path)), "plotly.min.js")
+        if not os.path.exists(js_path):
+            with open(js_path, "w", encoding="utf-8") as fh:
+                fh.write(plotly.offline.get_plotlyjs())
+        plotly_tag = '<script src="plotly.min.js"></script>'
+    else:
+        plotly_tag = f"<script>{plotly.offline.get_plotlyjs()}</script>"
+    page = EXPORT_HTML_TEMPLATE.format(title=html.escape(title), plotly_tag=plotly_tag,
+                                       payload=to_json_plotly(payload), figure=to_json_plotly(figure))
+    with open(file_path, "w", encoding="utf-8") as fh:
+        fh.write(page)
+    return len(payload)
+
+
+# ------------------ Saved Dashboards ------------------
+# A saved dashboard is a JSON spec (charts, chart settings and the dataset it was built from) plus the reduced
+# data behind each chart, kept as Parquet files in <spec>_data/. The reduced data is reused only while the
+# dataset fingerprint and the max points setting are the ones it was computed with.
+DASHBOARD_SPEC_VERSION = 1
+DASHBOARD_TITLE = "Custom Dashboard"
+# Columns the app writes into the data itself (forecast predictions); charts on them are never persisted
+DERIVED_COLUMNS = ("Prediction",)
+
+DashboardChart = collections.namedtuple("DashboardChart", "chart x y")
+# skipped names the charts whose saved data could not be read when the spec was loaded
+DashboardSpec = collections.namedtuple("DashboardSpec", "charts settings dataset aggregates title skipped",
+                                       defaults=(None, None, DASHBOARD_TITLE, ()))
+# What writing or reading a chart's Parquet file can raise; pyarrow's own errors derive from these
+PARQUET_ERRORS = (ImportError, OSError, ValueError, TypeError, NotImplementedError)
+
+
+def dashboard_chart_label(chart):
+    return f"{chart.chart} of {chart.y} by {chart.x}"
+
+
+# Helper: Identify a dataset by its file (path, size, modification time and SQLite query) without reading it
+def dataset_fingerprint(file_path, sqlite_query=None):
+    return cache_key(file_path, False, sqlite_query)
+
+
+# Reduced chart data for one dataset fingerprint and max points setting; filled from dashboard worker threads
+class DashboardAggregates:
+    def __init__(self, fingerprint=None, max_points=CHART_MAX_POINTS, charts=None):
+        self.fingerprint = fingerprint
+        self.max_points = max_points
+        self.charts = dict(charts or {})
+        self.lock = threading.Lock()
+
+    def matches(self, fingerprint, max_points):
+        return fingerprint is not None and fingerprint == self.fingerprint and max_points == self.max_points
+
+    # These aggregates if they still apply, otherwise an empty set for the given dataset and setting
+    def for_dataset(self, fingerprint, max_points):
+        return self if self.matches(fingerprint, max_points) else DashboardAggregates(fingerprint, max_points)
+
+    def get(self, chart):
+        with self.lock:
+            return self.charts.get(chart)
+
+    def put(self, chart, reduced):
+        if self.fingerprint is None or any(c in DERIVED_COLUMNS for c in chart[1:]):
+            return
+        with self.lock:
+            self.charts[chart] = reduced
+
+
+def reduce_dashboard_chart(engine, chart, max_points, load_columns):
+    columns = {"x": chart.x, "y": chart.y}
+    spec = engine.resolve(chart.chart, columns)
+    return engine.reduce(spec.name, load_columns(spec.used_columns(columns)), columns, max_points)
+
+
+# Helper: Build one dashboard chart from its persisted aggregate when there is one, otherwise by reducing the
+# columns returned by load_columns (and recording the result). Returns (figure, reused).
+def build_dashboard_chart(engine, chart, settings, aggregates=None, load_columns=None):
+    reduced = aggregates.get(chart) if aggregates is not None else None
+    reused = reduced is not None
+    if reduced is None:
+        if load_columns is None:
+            raise ValueError("its saved data is out of date and the dataset is not loaded.")
+        reduced = reduce_dashboard_chart(engine, chart, settings["max_points"], load_columns)
+        if aggregates is not None:
+            aggregates.put(chart, reduced)
+    fig = engine.build_reduced(chart.chart, reduced, {"x": chart.x, "y": chart.y}, settings["theme"],
+                               palette=settings["palette"], webgl_threshold=settings["webgl_threshold"]).figure
+    return fig, reused
+
+
+def dashboard_data_dir(file_path):
+    return os.path.splitext(file_path)[0] + "_data"
+
+
+# Write the spec JSON and the Parquet file of every chart held in spec.aggregates; data files of charts no
+# longer in the dashboard are removed. Returns (number of charts saved with their data, labels of the charts
+# whose data could not be written).
+def save_dashboard_spec(file_path, spec):
+    data_dir = dashboard_data_dir(file_path)
+    aggregates = spec.aggregates
+    entries, skipped = {}, []
+    for chart in spec.charts:
+        reduced = aggregates.get(chart) if aggregates is not None else None
+        if reduced is None or chart in entries:
+            continue
+        name = hashlib.sha1(json.dumps(list(chart)).encode("utf-8")).hexdigest()[:16] + ".parquet"
+        os.makedirs(data_dir, exist_ok=True)
+        try:
+            reduced.data.to_parquet(os.path.join(data_dir, name))
+        except PARQUET_ERRORS:
+            # e.g. mixed-type columns: the chart is rebuilt from the dataset on open instead
+            skipped.append(dashboard_chart_label(chart))
+            continue
+        entries[chart] = dict(chart._asdict(), file=name, reduction=reduced.reduction,
+                              total_rows=int(reduced.total_rows))
+    dataset = spec.dataset
+    if dataset is not None and dataset.get("sqlite_query") is not None:
+        dataset = dict(dataset, sqlite_query=dataset["sqlite_query"]._asdict())
+    raw = {"version": DASHBOARD_SPEC_VERSION, "title": spec.title,
+           "charts": [chart._asdict() for chart in spec.charts], "settings": spec.settings, "dataset": dataset,
+           "aggregates": None if not entries else {"fingerprint": aggregates.fingerprint,
+                                                   "max_points": aggregates.max_points,
+                                                   "charts": list(entries.values())}}
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(raw, fh, indent=2)
+    os.replace(tmp_path, file_path)
+    if os.path.isdir(data_dir):
+        keep = {entry["file"] for entry in entries.values()}
+        for name in os.listdir(data_dir):
+            if name.endswith(".parquet") and name not in keep:
+                os.remove(os.path.join(data_dir, name))
+    return len(entries), skipped
+
+
+# Read a saved dashboard; aggregates whose Parquet file is missing or unreadable are left out and their charts
+# listed in the spec's skipped field
+def load_dashboard_spec(file_path):
+    with open(file_path, encoding="utf-8") as fh:
+        raw = json.load(fh)
+    if raw.get("version") != DASHBOARD_SPEC_VERSION:
+        raise ValueError(f"Unsupported dashboard spec version: {raw.get('version')}")
+    try:
+        charts = [DashboardChart(**entry) for entry in raw["charts"]]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid chart list: {e}") from e
+    if not charts:
+        raise ValueError("The dashboard has no charts.")
+    dataset = raw.get("dataset")
+    if dataset is not None and dataset.get("sqlite_query") is not None:
+        query = dataset["sqlite_query"]
+        dataset = dict(dataset, sqlite_query=SQLiteQuery(query["table"], tuple(query["columns"] or ()) or None,
+                                                         query["where"]))
+    settings = dict(DEFAULT_RENDER_SETTINGS)
+    settings.update(raw.get("settings") or {})
+    settings["theme"] = {**DEFAULT_RENDER_SETTINGS["theme"], **settings["theme"]}
+    aggregates, skipped = None, []
+    saved = raw.get("aggregates")
+    if saved:
+        aggregates = DashboardAggregates(saved["fingerprint"], saved["max_points"])
+        data_dir = dashboard_data_dir(file_path)
+        for entry in saved["charts"]:
+            chart = DashboardChart(entry["chart"], entry["x"], entry["y"])
+            try:
+                data = pd.read_parquet(os.path.join(data_dir, entry["file"]))
+            except PARQUET_ERRORS:
+                skipped.append(dashboard_chart_label(chart))
+                continue
+            aggregates.put(chart, ReducedChart(data, entry["reduction"], entry["total_rows"]))
+    return DashboardSpec(charts, settings, dataset, aggregates, raw.get("title") or DASHBOARD_TITLE, tuple(skipped))
+
+
+# ------------------ Chart Viewer ------------------
+# One local page (http://127.0.0.1:<port>/) shows the current figure. Plotly.js is served once and cached by the
+# browser; figures and updates reach the page as JSON over a server-sent event stream. A new figure is sent as
+# a diff against the displayed one (restyle/relayout, or new traces with only the changed layout keys). The
+# server keeps a mirror of the displayed figure so that a reloaded or newly opened page starts from the current
+# state.
+VIEWER_HOST = "127.0.0.1"
+VIEWER_HEARTBEAT_SECONDS = 15
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Sport Scope Viewer</title>
+<script src="/plotly.min.js"></script>
+</head>
+<body style="margin: 0">
+<div id="chart"></div>
+<script>
+const chart = document.getElementById("chart");
+const config = {responsive: true};
+// The layout as sent by the server; Plotly fills computed values into the copy it is given
+let layout = {};
+function mergeLayout(update) {
+  for (const key in update) {
+    if (update[key] === null) delete layout[key];
+    else layout[key] = update[key];
+  }
+}
+const events = new EventSource("/events");
+events.onmessage = (event) => {
+  const msg = JSON.parse(event.data);
+  if (msg.op === "figure") {
+    layout = msg.figure.layout;
+    Plotly.react(chart, msg.figure.data, structuredClone(layout), config);
+  } else if (msg.op === "react") {
+    mergeLayout(msg.layout);
+    Plotly.react(chart, msg.data, structuredClone(layout), config);
+  } else if (msg.op === "relayout") {
+    mergeLayout(msg.update);
+    Plotly.relayout(chart, msg.update);
+  } else if (msg.op === "extend") Plotly.extendTraces(chart, msg.update, msg.indices, msg.max_points);
+  else if (msg.op === "restyle") Plotly.restyle(chart, msg.update, msg.indices);
+};
+</script>
+</body>
+</html>
+"""
+
+
+# Helper: Top-level keys of new whose value differs from old, with None for keys that were removed. Values are
+# compared as canonical JSON, since copied figures can hold the same properties in a different order.
+def _changed_keys(old, new):
+    def canonical(value):
+        return json.dumps(json.loads(to_json_plotly(value)), sort_keys=True)
+
+    changed = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        if key not in old or canonical(old[key]) != canonical(value):
+            changed[key] = value
+    return changed
+
+
+class ChartServer:
+    def __init__(self, host=VIEWER_HOST, port=0):
+        self.lock = threading.Lock()
+        # One message queue per open page
+        self.clients = []
+        self.figure = None
+        self.plotly_js = None
+        viewer = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                viewer._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="viewer", daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def client_count(self):
+        with self.lock:
+            return len(self.clients)
+
+    def close(self):
+        with self.lock:
+            for client in self.clients:
+                client.put(None)
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # Replace the displayed figure, sending only what changed. Traces listed in plain send their x/y as plain
+    # lists instead of typed arrays, because extendTraces keeps a typed array's dtype (an int16 x would overflow).
+    def show(self, fig, plain=()):
+        figure = fig.to_plotly_json()
+        for index in plain:
+            trace = figure["data"][index]
+            for key in ("x", "y"):
+                array = _as_trace_array(trace.get(key))
+                if array is not None:
+                    # Via pandas so that datetimes stay timestamps at any resolution
+                    trace[key] = pd.Series(array).tolist()
+        with self.lock:
+            old, self.figure = self.figure, figure
+            if old is None:
+                self._broadcast(dict(op="figure", figure=figure))
+                return
+            layout = _changed_keys(old["layout"], figure["layout"])
+            if [trace.get("type") for trace in old["data"]] != [trace.get("type") for trace in figure["data"]]:
+                self._broadcast(dict(op="react", data=figure["data"], layout=layout))
+                return
+            for index, (old_trace, trace) in enumerate(zip(old["data"], figure["data"])):
+                changed = _changed_keys(old_trace, trace)
+                if changed:
+                    self._broadcast(dict(op="restyle", update={key: [value] for key, value in changed.items()},
+                                         indices=[index]))
+            if layout:
+                self._broadcast(dict(op="relayout", update=layout))
+
+    # Append points to traces (Plotly.extendTraces): update maps a trace property to one list of new values per
+    # trace in indices; with max_points each trace keeps only its newest max_points values
+    def extend(self, update, indices, max_points=None):
+        with self.lock:
+            for key, values in update.items():
+                for index, new in zip(indices, values):
+                    trace = self.figure["data"][index]
+                    old = _as_trace_array(trace.get(key))
+                    merged = (old.tolist() if old is not None else []) + list(new)
+                    trace[key] = merged[-max_points:] if max_points else merged
+            self._broadcast(dict(op="extend", update=update, indices=indices, max_points=max_points))
+
+    # Set trace properties (Plotly.restyle): update maps a property to one value per trace in indices
+    def restyle(self, update, indices):
+        with self.lock:
+            for key, values in update.items():
+                for index, value in zip(indices, values):
+                    self.figure["data"][index][key] = value
+            self._broadcast(dict(op="restyle", update=update, indices=indices))
+
+    # Caller holds the lock
+    def _broadcast(self, message):
+        text = f"data: {to_json_plotly(message)}\n\n"
+        for client in self.clients:
+            client.put(text)
+
+    def _handle(self, request):
+        if request.path == "/":
+            self._send(request, VIEWER_HTML.encode("utf-8"), "text/html; charset=utf-8")
+        elif request.path == "/plotly.min.js":
+            if self.plotly_js is None:
+                self.plotly_js = plotly.offline.get_plotlyjs().encode("utf-8")
+            self._send(request, self.plotly_js, "application/javascript", cache=True)
+        elif request.path == "/events":
+            self._stream(request)
+        else:
+            request.send_error(404)
+
+    @staticmethod
+    def _send(request, body, content_type, cache=False):
+        request.send_response(200)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(body)))
+        request.send_header("Cache-Control", "max-age=86400" if cache else "no-cache")
+        request.end_headers()
+        request.wfile.write(body)
+
+    # Runs on the request's thread until the page goes away or the server closes
+    def _stream(self, request):
+        request.send_response(200)
+        request.send_header("Content-Type", "text/event-stream")
+        request.send_header("Cache-Control", "no-cache")
+        request.end_headers()
+        client = queue.Queue()
+        with self.lock:
+            if self.figure is not None:
+                client.put(f"data: {to_json_plotly(dict(op='figure', figure=self.figure))}\n\n")
+            self.clients.append(client)
+        try:
+            while True:
+                try:
+                    text = client.get(timeout=VIEWER_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    text = ": keep-alive\n\n"
+                if text is None:
+                    break
+                request.wfile.write(text.encode("utf-8"))
+                request.wfile.flush()
+        except OSError:
+            # The page was closed or reloaded
+            pass
+        finally:
+            with self.lock:
+                self.clients.remove(client)
+
+
+# ------------------ Live Refresh ------------------
+# A CSV that is being appended to is tailed from the byte offset just past the rows already loaded; only
+# complete new lines are read. Charts of raw points get the new rows through extendTraces, keeping the newest
+# max_points points, while charts of reduced data (bins, sums) are rebuilt and only their trace data is resent.
+LIVE_POLL_MS = 1000
+LIVE_EXTEND_CHARTS = ("Scatter", "Line", "Area")
+# Trace properties resent for a rebuilt chart; placement in the dashboard grid (axes, domain) is kept
+LIVE_TRACE_KEYS = ("x", "y", "z", "values", "labels", "text", "customdata", "measure", "base")
+
+
+# Helper: Byte offset just past the header and the first n_rows lines of a CSV file. Lines are counted as raw
+# newlines, so quoted values with embedded line breaks are not supported.
+def csv_data_offset(file_path, n_rows, block_size=1 << 20):
+    remaining = n_rows + 1
+    offset = 0
+    last_byte = b""
+    with open(file_path, "rb") as fh:
+        while True:
+            block = fh.read(block_size)
+            if not block:
+                # The last loaded row may lack its newline
+                if remaining == 1 and last_byte not in (b"", b"\n"):
+                    return offset
+                raise ValueError(f"{os.path.basename(file_path)} has fewer rows than the loaded data.")
+            count = block.count(b"\n")
+            if count >= remaining:
+                position = -1
+                for _ in range(remaining):
+                    position = block.index(b"\n", position + 1)
+                return offset + position + 1
+            remaining -= count
+            offset += len(block)
+            last_byte = block[-1:]
+
+
+class CSVTail:
+    def __init__(self, file_path, offset, columns=None):
+        self.file_path = file_path
+        self.offset = offset
+        self.columns = list(pd.read_csv(file_path, nrows=0).columns) if columns is None else list(columns)
+
+    # The complete rows appended since the last read, or None; a partly written last line waits for the next read
+    def read(self):
+        with open(self.file_path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < self.offset:
+                raise ValueError(f"{os.path.basename(self.file_path)} was truncated or replaced.")
+            fh.seek(self.offset)
+            block = fh.read(size - self.offset)
+        end = block.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        rows = pd.read_csv(io.BytesIO(block[:end]), header=None, names=self.columns)
+        return rows if len(rows) else None
+
+
+# A dashboard shown in the chart viewer and kept up to date as rows are appended to the data
+class LiveDashboard:
+    def __init__(self, engine, charts, settings, title=DASHBOARD_TITLE):
+        self.engine = engine
+        self.charts = charts
+        self.settings = settings
+        self.title = title
+        # (first trace index, trace count, extendable) per chart in the combined figure
+        self.traces = []
+        self.lock = threading.Lock()
+
+    def _build(self, chart, data):
+        columns = {"x": chart.x, "y": chart.y}
+        spec = self.engine.resolve(chart.chart, columns)
+        data = data[spec.used_columns(columns)]
+        extend = spec.name in LIVE_EXTEND_CHARTS
+        if extend:
+            data = data.iloc[-self.settings["max_points"]:]
+        fig = self.engine.build(spec.name, data, columns, self.settings["theme"], palette=self.settings["palette"],
+                                max_points=self.settings["max_points"],
+                                webgl_threshold=self.settings["webgl_threshold"]).figure
+        return fig, extend and len(fig.data) == 1
+
+    # Copy of what the charts are built from, so the live thread never reads a frame the UI thread writes to:
+    # the charts' columns, and only the newest max_points rows when every chart is extended in place
+    def snapshot(self, data):
+        columns, all_rows = [], False
+        for chart in self.charts:
+            spec = self.engine.resolve(chart.chart, {"x": chart.x, "y": chart.y})
+            columns += spec.used_columns({"x": chart.x, "y": chart.y})
+            all_rows = all_rows or spec.name not in LIVE_EXTEND_CHARTS
+        data = data[list(dict.fromkeys(columns))]
+        return (data if all_rows else data.iloc[-self.settings["max_points"]:]).copy()
+
+    def show(self, viewer, data):
+        with self.lock:
+            figures, self.traces, first = [], [], 0
+            for chart in self.charts:
+                fig, extend = self._build(chart, data)
+                figures.append(fig)
+                self.traces.append((first, len(fig.data), extend))
+                first += len(fig.data)
+            viewer.show(dashboard_figure(figures, self.title),
+                        plain=[first for first, _, extend in self.traces if extend])
+
+    # Send the rows of data (a snapshot) from position start onwards to the viewer
+    def push(self, viewer, data, start):
+        rows = data.iloc[start:]
+        if rows.empty:
+            return
+        with self.lock:
+            update, indices, restyles = {"x": [], "y": []}, [], []
+            for chart, (first, count, extend) in zip(self.charts, self.traces):
+                if extend:
+                    update["x"].append(rows[chart.x].tolist())
+                    update["y"].append(rows[chart.y].tolist())
+                    indices.append(first)
+                    continue
+                fig, _ = self._build(chart, data)
+                if len(fig.data) != count:
+                    break
+                for offset, trace in enumerate(fig.data):
+                    values = trace.to_plotly_json()
+                    restyles.append(({key: [values[key]] for key in LIVE_TRACE_KEYS if key in values},
+                                     [first + offset]))
+            else:
+                if indices:
+                    viewer.extend(update, indices, self.settings["max_points"])
+                for restyle_update, restyle_indices in restyles:
+                    viewer.restyle(restyle_update, restyle_indices)
+                return
+        # A rebuilt chart now has a different number of traces (e.g. a new category): resend everything
+        self.show(viewer, data)
+
+
+# ------------------ Forecasting ------------------
+FORECAST_POLL_MS = 100
+# Per-group forecasts that can't be vectorized are spread across a process pool, a few chunks per process
+FORECAST_PROCESSES = os.cpu_count() or 1
+FORECAST_CHUNKS_PER_PROCESS = 4
+# That pool is shared by every forecast call. Its workers are started with forkserver/spawn instead of fork,
+# since the GUI calls in from a thread, and only on demand, so a small Auto ARIMA round starts no more
+# processes than it has candidates.
+FORECAST_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_FORECAST_POOL = None
+_FORECAST_POOL_LOCK = threading.Lock()
+
+
+def forecast_pool():
+    global _FORECAST_POOL
+    with _FORECAST_POOL_LOCK:
+        if _FORECAST_POOL is None:
+            _FORECAST_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=FORECAST_PROCESSES, mp_context=multiprocessing.get_context(FORECAST_START_METHOD))
+        return _FORECAST_POOL
+
+# Auto ARIMA: d is picked by repeated KPSS tests, then (p, q) candidates are fitted in rounds of
+# increasing p + q and the search stops after a round that doesn't improve the criterion
+AUTO_ARIMA_MAX_P = 3
+AUTO_ARIMA_MAX_D = 2
+AUTO_ARIMA_MAX_Q = 3
+AUTO_ARIMA_CRITERIA = ("AIC", "BIC")
+ARIMA_CACHE_ENTRIES = 256
+
+
+class ForecastCancelled(Exception):
+    pass
+
+
+# Small thread-safe LRU for fitted model results
+class ResultCache:
+    def __init__(self, max_entries=ARIMA_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+# Fitted ARIMA parameters (and Auto ARIMA choices) keyed by series fingerprint and order, so re-running
+# with another horizon or confidence setting only re-filters instead of re-optimizing
+ARIMA_CACHE = ResultCache()
+
+
+def series_fingerprint(y):
+    return hashlib.sha1(np.ascontiguousarray(y, dtype=np.float64).tobytes()).hexdigest()
+
+
+# Helper: Fit ARIMA with the given order, reusing cached parameters for the same series when available
+def fit_arima(y, order, callback=None, fingerprint=None):
+    ARIMA = lazy_import("statsmodels.tsa.arima.model").ARIMA
+    key = (fingerprint or series_fingerprint(y), tuple(order))
+    model = ARIMA(y, order=order)
+    params = ARIMA_CACHE.get(key)
+    if params is not None:
+        return model.filter(params)
+    model_fit = model.fit(method_kwargs={"callback": callback} if callback else None)
+    ARIMA_CACHE.put(key, np.asarray(model_fit.params))
+    return model_fit
+
+
+# Runs in a pool process (or inline): information criteria of one candidate order; failed fits rank last
+def _arima_candidate_score(y, order, fingerprint):
+    try:
+        model_fit = fit_arima(y, order, fingerprint=fingerprint)
+        return order, model_fit.aic, model_fit.bic, np.asarray(model_fit.params)
+    except Exception:
+        return order, np.inf, np.inf, None
+
+
+# Helper: Differencing order from repeated KPSS stationarity tests
+def kpss_differencing(y, max_d=AUTO_ARIMA_MAX_D):
+    kpss = lazy_import("statsmodels.tsa.stattools").kpss
+    series = np.asarray(y, dtype=np.float64)
+    for d in range(max_d + 1):
+        if d == max_d or len(series) < 10 or np.ptp(series) == 0:
+            return d
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            p_value = kpss(series, nlags="auto")[1]
+        if p_value >= 0.05:
+            return d
+        series = np.diff(series)
+    return max_d
+
+
+# Search a bounded (p, d, q) grid and return the best order by AIC or BIC
+def auto_arima_order(y, criterion="AIC", cancel_event=None, processes=FORECAST_PROCESSES,
+                     max_p=AUTO_ARIMA_MAX_P, max_d=AUTO_ARIMA_MAX_D, max_q=AUTO_ARIMA_MAX_Q):
+    fingerprint = series_fingerprint(y)
+    search_key = (fingerprint, "auto", criterion, max_p, max_d, max_q)
+    cached = ARIMA_CACHE.get(search_key)
+    if cached is not None:
+        return cached
+    d = kpss_differencing(y, max_d)
+    score_index = 1 if criterion == "AIC" else 2
+    best_order, best_score = None, np.inf
+    pool = forecast_pool() if processes > 1 else None
+    pending = set()
+    try:
+        for complexity in range(max_p + max_q + 1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ForecastCancelled()
+            orders = [(p, d, complexity - p) for p in range(max_p + 1) if 0 <= complexity - p <= max_q]
+            if pool is None:
+                scores = [_arima_candidate_score(y, order, fingerprint) for order in orders]
+            else:
+                pending = {pool.submit(_arima_candidate_score, y, order, fingerprint) for order in orders}
+                scores = []
+                while pending:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ForecastCancelled()
+                    done, pending = concurrent.futures.wait(pending, timeout=0.2)
+                    scores.extend(f.result() for f in done)
+            round_best = min(scores, key=lambda score: score[score_index])
+            # Parameters fitted in pool processes are cached here too, so the final fit is only a filter
+            for order, _, _, params in scores:
+                if params is not None:
+                    ARIMA_CACHE.put((fingerprint, order), params)
+            if round_best[score_index] >= best_score:
+                break
+            best_order, best_score = round_best[0], round_best[score_index]
+    finally:
+        for future in pending:
+            future.cancel()
+    if best_order is None:
+        raise ValueError("Auto ARIMA could not fit any candidate order.")
+    ARIMA_CACHE.put(search_key, best_order)
+    return best_order
+
+
+ForecastResult = collections.namedtuple("ForecastResult", "y_pred forecast_x forecast_y forecast_ci model order")
+
+# A queued forecast: the dataset it was started on, its cancel switch and the UI-thread callback for its result
+# generation is the GUI's load generation when the job was queued; results from an earlier load are discarded
+ForecastJob = collections.namedtuple("ForecastJob", "label generation future cancel_event apply")
+
+
+# Helper: Fit one forecasting model on numeric x/y arrays. cancel_event is checked between stages and
+# after every ARIMA optimizer iteration.
+def fit_forecast(X, y, model_choice, horizon, conf_int=False, cancel_event=None, criterion="AIC",
+                 processes=FORECAST_PROCESSES):
+    LinearRegression = lazy_import("sklearn.linear_model").LinearRegression
+    PolynomialFeatures = lazy_import("sklearn.preprocessing").PolynomialFeatures
+
+    def check_cancel(*_):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ForecastCancelled()
+
+    check_cancel()
+    if model_choice == "Polynomial" and len(y) >= 5:
+        poly = PolynomialFeatures(degree=3)
+        X_poly = poly.fit_transform(X)
+        model = LinearRegression()
+        model.fit(X_poly, y)
+        check_cancel()
+        y_pred = model.predict(X_poly)
+        x_sorted = np.sort(X.ravel())
+        diff = np.median(np.diff(x_sorted)) if len(x_sorted) > 1 else 1
+        forecast_x = np.linspace(x_sorted[-1] + diff, x_sorted[-1] + horizon * diff, horizon)
+        forecast_y = model.predict(poly.transform(forecast_x.reshape(-1, 1)))
+        return ForecastResult(y_pred, forecast_x, forecast_y, None, "Polynomial", None)
+    if model_choice in ("ARIMA", "Auto ARIMA") and len(y) > 10:
+        order = (1, 1, 1)
+        if model_choice == "Auto ARIMA":
+            order = auto_arima_order(y, criterion, cancel_event, processes)
+        model_fit = fit_arima(y, order, callback=check_cancel)
+        check_cancel()
+        forecast_result = model_fit.get_forecast(steps=horizon)
+        forecast_ci = None
+        if conf_int:
+            ci = forecast_result.conf_int(alpha=0.05)
+            forecast_ci = (np.asarray(ci)[:, 0], np.asarray(ci)[:, 1])
+        forecast_x = np.arange(np.max(X) + 1, np.max(X) + horizon + 1)
+        return ForecastResult(np.asarray(model_fit.fittedvalues), forecast_x,
+                              np.asarray(forecast_result.predicted_mean), forecast_ci, f"ARIMA{order}", order)
+    model = LinearRegression()
+    model.fit(X, y)
+    return ForecastResult(model.predict(X), np.array([]), np.array([]), None, "Linear", None)
+
+
+# Keeps a fitted forecast up to date as rows are appended. Linear and Polynomial keep running XᵀX / Xᵀy
+# sums (on x scaled by the first fit, so the cubic terms stay well conditioned) and re-solve the small
+# normal equations; ARIMA extends the state-space results with the new observations at the fitted parameters.
+class IncrementalForecaster:
+    def __init__(self, model, horizon, conf_int=False):
+        self.model = model
+        self.horizon = horizon
+        self.conf_int = conf_int
+        self.degree = 3 if model == "Polynomial" else 1
+        self.results = None
+        self.xtx = self.xty = self.coef = None
+        self.center, self.scale = 0.0, 1.0
+        self.x_max, self.x_step = None, 1.0
+
+    # Build the update state for a model just fitted by fit_forecast on X, y
+    @classmethod
+    def start(cls, X, y, result, horizon, conf_int=False):
+        forecaster = cls(result.model if result.order is None else "ARIMA", horizon, conf_int)
+        x = X.ravel().astype(np.float64)
+        forecaster.x_max = np.max(x)
+        if result.order is not None:
+            forecaster.results = fit_arima(y, result.order)
+            return forecaster
+        x_sorted = np.sort(x)
+        forecaster.x_step = np.median(np.diff(x_sorted)) if len(x_sorted) > 1 else 1
+        forecaster.center, forecaster.scale = x.mean(), (x.std() or 1.0)
+        forecaster.xtx = np.zeros((forecaster.degree + 1, forecaster.degree + 1))
+        forecaster.xty = np.zeros(forecaster.degree + 1)
+        forecaster._accumulate(x, np.asarray(y, dtype=np.float64))
+        return forecaster
+
+    def _features(self, x):
+        return np.vander((x - self.center) / self.scale, self.degree + 1, increasing=True)
+
+    def _accumulate(self, x, y):
+        features = self._features(x)
+        self.xtx += features.T @ features
+        self.xty += features.T @ y
+        self.coef = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+
+    def predict(self, X):
+        return self._features(X.ravel().astype(np.float64)) @ self.coef
+
+    # Add new observations; returns predictions for the new rows and the refreshed forecast
+    def update(self, X_new, y_new):
+        x_new = X_new.ravel().astype(np.float64)
+        y_new = np.asarray(y_new, dtype=np.float64)
+        self.x_max = max(self.x_max, np.max(x_new))
+        if self.results is not None:
+            self.results = self.results.extend(y_new)
+            forecast_result = self.results.get_forecast(steps=self.horizon)
+            forecast_ci = None
+            if self.conf_int:
+                ci = np.asarray(forecast_result.conf_int(alpha=0.05))
+                forecast_ci = (ci[:, 0], ci[:, 1])
+            forecast_x = np.arange(self.x_max + 1, self.x_max + self.horizon + 1)
+            return np.asarray(self.results.fittedvalues), ForecastResult(
+                None, forecast_x, np.asarray(forecast_result.predicted_mean), forecast_ci, self.model, None)
+        self._accumulate(x_new, y_new)
+        if self.model != "Polynomial":
+            return self.predict(x_new), ForecastResult(None, np.array([]), np.array([]), None, self.model, None)
+        forecast_x = np.linspace(self.x_max + self.x_step, self.x_max + self.horizon * self.x_step, self.horizon)
+        return self.predict(x_new), ForecastResult(None, forecast_x, self.predict(forecast_x), None, self.model,
+                                                   None)
+
+
+# Helper: Median spacing of each group's (sorted) x values, used to place forecast points
+def group_step(codes, x, n_groups):
+    diffs = pd.Series(np.diff(x, prepend=np.nan)).where(np.r_[False, codes[1:] == codes[:-1]])
+    step = diffs.groupby(codes).median().reindex(range(n_groups)).to_numpy()
+    return np.where(np.isfinite(step) & (step != 0), step, 1.0)
+
+
+# Helper: Least-squares line for every group at once (closed form on group-centred x/y via bincount)
+def batch_linear_forecast(codes, x, y, n_groups, horizon):
+    counts = np.bincount(codes, minlength=n_groups)
+    mean_x = np.bincount(codes, x, n_groups) / counts
+    mean_y = np.bincount(codes, y, n_groups) / counts
+    xc, yc = x - mean_x[codes], y - mean_y[codes]
+    sxx = np.bincount(codes, xc * xc, n_groups)
+    slope = np.divide(np.bincount(codes, xc * yc, n_groups), sxx, out=np.zeros(n_groups), where=sxx > 0)
+    intercept = mean_y - slope * mean_x
+    y_pred = intercept[codes] + slope[codes] * x
+    last_x = x[np.cumsum(counts) - 1]
+    steps = np.arange(1, horizon + 1)
+    forecast_x = last_x[:, None] + group_step(codes, x, n_groups)[:, None] * steps
+    forecast_y = intercept[:, None] + slope[:, None] * forecast_x
+    return y_pred, forecast_x, forecast_y
+
+
+# Runs in a pool process: fit a chunk of groups one by one
+def _fit_forecast_groups(groups, model_choice, horizon, conf_int, criterion):
+    return [(code, fit_forecast(X, y, model_choice, horizon, conf_int, criterion=criterion, processes=1))
+            for code, X, y in groups]
+
+
+# Helper: RMSE, MAPE and R² of fitted values for every group at once
+def group_metrics(codes, y, y_pred, n_groups):
+    counts = np.bincount(codes, minlength=n_groups)
+    residual = y - y_pred
+    ss_res = np.bincount(codes, residual ** 2, n_groups)
+    mean_y = np.bincount(codes, y, n_groups) / counts
+    ss_tot = np.bincount(codes, (y - mean_y[codes]) ** 2, n_groups)
+    ape = np.abs(residual) / np.maximum(np.abs(y), np.finfo(np.float64).eps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return dict(rows=counts, RMSE=np.sqrt(ss_res / counts), MAPE=np.bincount(codes, ape, n_groups) / counts,
+                    R2=np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan))
+
+
+# Fit one model per group of group_column. Linear fits are batched across all groups; Polynomial and
+# ARIMA fits run in a process pool. Returns a long-format table (fitted and forecast rows per group)
+# and a per-group metrics table.
+def batch_forecast(frame, group_column, x_column, y_column, model_choice, horizon, conf_int=False,
+                   cancel_event=None, processes=FORECAST_PROCESSES, criterion="AIC"):
+    data = pd.DataFrame({"group": frame[group_column], "x": frame[x_column], "y": frame[y_column]}).dropna()
+    if data.empty:
+        raise ValueError("No valid numeric data available for prediction.")
+    data = data.sort_values(["group", "x"], kind="stable")
+    codes, groups = pd.factorize(data["group"], sort=True)
+    n_groups = len(groups)
+    x, y = data["x"].to_numpy(np.float64), data["y"].to_numpy(np.float64)
+    lower = upper = None
+    models = np.full(n_groups, model_choice, dtype=object)
+    if model_choice == "Linear":
+        y_pred, forecast_x, forecast_y = batch_linear_forecast(codes, x, y, n_groups, horizon)
+    else:
+        y_pred = np.full(len(y), np.nan)
+        forecast_x = np.full((n_groups, horizon), np.nan)
+        forecast_y = np.full((n_groups, horizon), np.nan)
+        if conf_int:
+            lower, upper = np.full((n_groups, horizon), np.nan), np.full((n_groups, horizon), np.nan)
+        bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength=n_groups))]
+        tasks = [(g, x[bounds[g]:bounds[g + 1]].reshape(-1, 1), y[bounds[g]:bounds[g + 1]]) for g in range(n_groups)]
+        chunk = max(1, math.ceil(n_groups / (processes * FORECAST_CHUNKS_PER_PROCESS)))
+
+        def store(fitted_groups):
+            for g, result in fitted_groups:
+                y_pred[bounds[g]:bounds[g + 1]] = result.y_pred
+                models[g] = result.model
+                k = len(result.forecast_x)
+                forecast_x[g, :k], forecast_y[g, :k] = result.forecast_x, result.forecast_y
+                if result.forecast_ci is not None and lower is not None:
+                    lower[g, :k], upper[g, :k] = result.forecast_ci
+
+        if processes <= 1:
+            for i in range(0, n_groups, chunk):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ForecastCancelled()
+                store(_fit_forecast_groups(tasks[i:i + chunk], model_choice, horizon, conf_int, criterion))
+        else:
+            pending = {forecast_pool().submit(_fit_forecast_groups, tasks[i:i + chunk], model_choice, horizon,
+                                              conf_int, criterion)
+                       for i in range(0, n_groups, chunk)}
+            try:
+                while pending:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ForecastCancelled()
+                    done, pending = concurrent.futures.wait(pending, timeout=0.2)
+                    for future in done:
+                        store(future.result())
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    fitted = pd.DataFrame({group_column: groups[codes], "kind": "fitted", x_column: x, y_column: y,
+                           "Prediction": y_pred})
+    forecast = pd.DataFrame({group_column: np.repeat(groups, horizon), "kind": "forecast",
+                             x_column: forecast_x.ravel(), y_column: np.nan, "Prediction": forecast_y.ravel()})
+    if lower is not None:
+        forecast["lower"], forecast["upper"] = lower.ravel(), upper.ravel()
+    table = pd.concat([fitted, forecast.dropna(subset=[x_column])], ignore_index=True)
+    metrics = pd.DataFrame({group_column: groups, "model": models,
+                            **group_metrics(codes, y, y_pred, n_groups)})
+    return table, metrics
+
+
+# ------------------ Backtesting ------------------
+BACKTEST_MODELS = ("Linear", "Polynomial", "ARIMA", "Auto ARIMA")
+BACKTEST_FOLDS = 5
+BACKTEST_WINDOWS = ("Expanding", "Sliding")
+BACKTEST_MIN_TRAIN = 20
+
+# Fold scores keyed by the exact rows a fold used, so appending data only computes the new folds
+BACKTEST_CACHE = ResultCache(max_entries=4096)
+
+
+# Helper: Rolling-origin folds as (train_start, origin, test_end) row positions. Test blocks sit on a fixed
+# grid of multiples of horizon, so existing folds keep the same rows when new rows are appended.
+def backtest_splits(n_rows, folds, horizon, window="Expanding", min_train=BACKTEST_MIN_TRAIN):
+    window_rows = max(min_train, 10 * horizon)
+    splits = []
+    test_end = n_rows - n_rows % horizon
+    while test_end - horizon >= min_train and len(splits) < folds:
+        origin = test_end - horizon
+        train_start = max(0, origin - window_rows) if window == "Sliding" else 0
+        splits.append((train_start, origin, test_end))
+        test_end -= horizon
+    return splits[::-1]
+
+
+# Helper: Fit on the training rows and predict the test rows (ARIMA models forecast len(X_test) steps ahead)
+def fit_predict(X_train, y_train, X_test, model_choice, criterion="AIC"):
+    LinearRegression = lazy_import("sklearn.linear_model").LinearRegression
+    PolynomialFeatures = lazy_import("sklearn.preprocessing").PolynomialFeatures
+    if model_choice == "Polynomial" and len(y_train) >= 5:
+        poly = PolynomialFeatures(degree=3)
+        model = LinearRegression().fit(poly.fit_transform(X_train), y_train)
+        return model.predict(poly.transform(X_test))
+    if model_choice in ("ARIMA", "Auto ARIMA") and len(y_train) > 10:
+        order = (1, 1, 1)
+        if model_choice == "Auto ARIMA":
+            order = auto_arima_order(y_train, criterion, processes=1)
+        return np.asarray(fit_arima(y_train, order).forecast(steps=len(X_test)))
+    return LinearRegression().fit(X_train, y_train).predict(X_test)
+
+
+# Runs in a pool process: score one model on one fold
+def _backtest_fold(fold_data, model_choice, criterion):
+    metrics = lazy_import("sklearn.metrics")
+    X_train, y_train, X_test, y_test = fold_data
+    start = time.perf_counter()
+    y_pred = fit_predict(X_train, y_train, X_test, model_choice, criterion)
+    fit_seconds = time.perf_counter() - start
+    return dict(RMSE=math.sqrt(metrics.mean_squared_error(y_test, y_pred)),
+                MAPE=metrics.mean_absolute_percentage_error(y_test, y_pred),
+                R2=metrics.r2_score(y_test, y_pred) if len(y_test) > 1 else np.nan,
+                fit_seconds=fit_seconds)
+
+
+# Rolling-origin backtest of several forecast models on x/y (rows ordered by x). Folds missing from
+# BACKTEST_CACHE are scored in parallel. Returns per-fold scores and a per-model summary.
+def backtest_models(X, y, models=BACKTEST_MODELS, folds=BACKTEST_FOLDS, horizon=5, window="Expanding",
+                    criterion="AIC", cancel_event=None, processes=FORECAST_PROCESSES):
+    order = np.argsort(X.ravel(), kind="stable")
+    X, y = X[order].astype(np.float64), y[order].astype(np.float64)
+    splits = backtest_splits(len(y), folds, horizon, window)
+    if not splits:
+        raise ValueError(f"Not enough rows to backtest: need at least {BACKTEST_MIN_TRAIN + horizon}.")
+    rows, tasks = [], {}
+    for fold, (train_start, origin, test_end) in enumerate(splits, start=1):
+        fold_key = hashlib.sha1(X[train_start:test_end].tobytes() + y[train_start:test_end].tobytes() +
+                                str(origin - train_start).encode()).hexdigest()
+        for model_choice in models:
+            key = (fold_key, model_choice, criterion)
+            row = dict(model=model_choice, fold=fold, train_rows=origin - train_start, test_rows=test_end - origin)
+            rows.append(row)
+            cached = BACKTEST_CACHE.get(key)
+            if cached is not None:
+                row.update(cached)
+            else:
+                fold_data = (X[train_start:origin], y[train_start:origin], X[origin:test_end], y[origin:test_end])
+                tasks[key] = (row, fold_data, model_choice)
+    if tasks and processes <= 1:
+        for key, (row, fold_data, model_choice) in tasks.items():
+            if cancel_event is not None and cancel_event.is_set():
+                raise ForecastCancelled()
+            scores = _backtest_fold(fold_data, model_choice, criterion)
+            BACKTEST_CACHE.put(key, scores)
+            row.update(scores)
+    elif tasks:
+        pending = {forecast_pool().submit(_backtest_fold, fold_data, model_choice, criterion): key
+                   for key, (_, fold_data, model_choice) in tasks.items()}
+        try:
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ForecastCancelled()
+                done, _ = concurrent.futures.wait(pending, timeout=0.2)
+                for future in done:
+                    key = pending.pop(future)
+                    scores = future.result()
+                    BACKTEST_CACHE.put(key, scores)
+                    tasks[key][0].update(scores)
+        finally:
+            for future in pending:
+                future.cancel()
+    fold_scores = pd.DataFrame(rows)
+    summary = fold_scores.groupby("model", sort=False)[["RMSE", "MAPE", "R2", "fit_seconds"]].mean().reset_index()
+    return fold_scores, summary, len(tasks)
+
+
+# Helper: One bar chart per metric, comparing models
+def backtest_figure(summary, title="Forecast Model Backtest"):
+    metrics = ["RMSE", "MAPE", "R2", "fit_seconds"]
+    fig = make_subplots(rows=1, cols=len(metrics), subplot_titles=["RMSE", "MAPE", "R²", "Fit time (s)"])
+    for i, metric in enumerate(metrics, start=1):
+        fig.add_trace(go.Bar(x=summary["model"], y=summary[metric], name=metric, showlegend=False), row=1, col=i)
+    fig.update_layout(title_text=title, height=450)
+    return fig
+
+
+# ------------------ Anomaly Detection ------------------
+ANOMALY_CONTAMINATION = 0.01
+# IsolationForest is fitted on an evenly spaced subsample; every row is then scored chunk by chunk
+ANOMALY_FIT_ROWS = 100_000
+ANOMALY_CHUNK_ROWS = 200_000
+ANOMALY_POLL_MS = 100
+
+
+class AnomalyCancelled(Exception):
+    pass
+
+
+AnomalyResult = collections.namedtuple("AnomalyResult", "positions scores columns contamination n_rows")
+
+
+# Helper: Numeric feature matrix for anomaly detection; non-numeric columns are factorized, gaps get the median
+def anomaly_features(frame, columns, medians=None):
+    features = pd.DataFrame(index=frame.index)
+    for col in columns:
+        values = pd.to_numeric(frame[col], errors="coerce")
+        if values.isna().all() and frame[col].notna().any():
+            values = pd.Series(pd.factorize(frame[col])[0], index=frame.index, dtype="float64")
+        features[col] = values
+    medians = features.median() if medians is None else medians
+    return features.fillna(medians).fillna(0).to_numpy(np.float64), medians
+
+
+# Fit IsolationForest (on StandardScaler-scaled columns) over a subsample, then score every row in
+# chunks, with the forest scoring each chunk across n_jobs threads. `chunks` is a callable returning an
+# iterator of frames in row order; `sample` is the fitting subsample.
+def detect_anomalies(sample, chunks, columns, contamination=ANOMALY_CONTAMINATION, cancel_event=None,
+                     progress=None, n_jobs=FORECAST_PROCESSES, n_rows=None):
+    IsolationForest = lazy_import("sklearn.ensemble").IsolationForest
+    StandardScaler = lazy_import("sklearn.preprocessing").StandardScaler
+    if len(sample) > ANOMALY_FIT_ROWS:
+        sample = sample.iloc[np.linspace(0, len(sample) - 1, ANOMALY_FIT_ROWS).astype(int)]
+    features, medians = anomaly_features(sample, columns)
+    scaler = StandardScaler().fit(features)
+    forest = IsolationForest(contamination=contamination, random_state=0, n_jobs=n_jobs)
+    forest.fit(scaler.transform(features))
+    positions, scores, offset = [], [], 0
+    for chunk in chunks():
+        if cancel_event is not None and cancel_event.is_set():
+            raise AnomalyCancelled()
+        chunk_features, _ = anomaly_features(chunk, columns, medians)
+        chunk_scores = forest.decision_function(scaler.transform(chunk_features))
+        flagged = np.flatnonzero(chunk_scores < 0)
+        positions.append(flagged + offset)
+        scores.append(chunk_scores[flagged])
+        offset += len(chunk)
+        if progress is not None:
+            progress(offset)
+    return AnomalyResult(np.concatenate(positions) if positions else np.array([], dtype=np.int64),
+                         np.concatenate(scores) if scores else np.array([]), tuple(columns), contamination, offset)
+
+
+# ------------------ Chart Suggestions ------------------
+SUGGESTION_COUNT = 10
+# Columns are profiled on an evenly spaced sample of rows
+SUGGESTION_SAMPLE_ROWS = 20_000
+SUGGESTION_MAX_NULL_RATE = 0.5
+SUGGESTION_BAR_MAX_CATEGORIES = 30
+SUGGESTION_PIE_MAX_CATEGORIES = 8
+SUGGESTION_POLL_MS = 100
+
+
+# Helper: One pass over a row sample: kind, cardinality, null rate and monotonicity per column, plus the
+# correlation matrix of the numeric columns
+def profile_columns(data, sample_rows=SUGGESTION_SAMPLE_ROWS, null_counts=None):
+    n_rows = len(data)
+    if len(data) > sample_rows:
+        data = data.iloc[np.linspace(0, len(data) - 1, sample_rows).astype(int)]
+    numeric = data.select_dtypes(include=[np.number])
+    datetimes = data.select_dtypes(include=["datetime", "datetimetz"])
+    profile = pd.DataFrame(index=data.columns)
+    profile["kind"] = "categorical"
+    profile.loc[numeric.columns, "kind"] = "numeric"
+    profile.loc[datetimes.columns, "kind"] = "datetime"
+    profile["cardinality"] = data.nunique()
+    if null_counts is not None:
+        profile["null_rate"] = null_counts.reindex(data.columns).fillna(0) / max(n_rows, 1)
+    else:
+        profile["null_rate"] = data.isna().mean() if len(data) else 1.0
+    profile["unique_ratio"] = profile["cardinality"] / max(len(data), 1)
+    profile["monotonic"] = False
+    ordered = pd.concat([numeric] + [(datetimes[c] - datetimes[c].min()).dt.total_seconds() for c in datetimes],
+                        axis=1)
+    if len(ordered) > 1 and not ordered.empty:
+        diffs = np.diff(ordered.to_numpy(np.float64), axis=0)
+        profile.loc[ordered.columns, "monotonic"] = (diffs >= 0).all(axis=0) | (diffs <= 0).all(axis=0)
+    corr = pd.DataFrame()
+    if numeric.shape[1] > 1:
+        values = numeric.to_numpy(np.float64)
+        values = np.where(np.isnan(values), np.nanmean(values, axis=0), values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = pd.DataFrame(np.corrcoef(values, rowvar=False), index=numeric.columns, columns=numeric.columns)
+    return profile, corr
+
+
+# Helper: Candidate suggestions of each chart type, each yielded in descending score order
+def _scatter_candidates(usable, corr):
+    cols = [c for c in corr.columns if c in usable.index]
+    if len(cols) < 2:
+        return
+    matrix = np.abs(corr.loc[cols, cols].to_numpy())
+    i, j = np.triu_indices(len(cols), k=1)
+    scores = np.nan_to_num(matrix[i, j])
+    for k in np.argsort(-scores, kind="stable"):
+        yield scores[k], "Scatter", cols[i[k]], cols[j[k]]
+
+
+def _line_candidates(usable, numeric_y):
+    x_cols = usable.index[usable["monotonic"] & (usable["kind"] != "categorical")]
+    for x in x_cols:
+        for y, y_score in numeric_y.items():
+            if y != x:
+                yield 0.9 * y_score, "Line", x, y
+
+
+def _category_candidates(usable, numeric_y, chart, max_categories, weight):
+    cats = usable[(usable["kind"] == "categorical") & (usable["cardinality"] >= 2) &
+                  (usable["cardinality"] <= max_categories)]
+    # Fewer categories read better; numeric_y is already best-first, so each x yields in descending order
+    x_scores = (1 - cats["cardinality"] / (max_categories + 1)).sort_values(ascending=False)
+    for x, x_score in x_scores.items():
+        for y, y_score in numeric_y.items():
+            yield weight * x_score * y_score, chart, x, y
+
+
+def _histogram_candidates(numeric_y):
+    for col, score in numeric_y.items():
+        yield 0.5 * score, "Histogram", col, ""
+
+
+# Rank chart suggestions by relevance and stop after top_k. Constant, mostly-empty and ID-like columns are
+# skipped. Candidate streams are generated lazily and cut to a small window each, so the work depends on
+# top_k rather than on the number of column pairs.
+def suggest_charts(profile, corr, top_k=SUGGESTION_COUNT):
+    usable = profile[(profile["cardinality"] > 1) & (profile["null_rate"] <= SUGGESTION_MAX_NULL_RATE)]
+    id_like = usable["unique_ratio"] > 0.95
+    numeric = usable[(usable["kind"] == "numeric") & ~(id_like & usable["monotonic"])]
+    # A good Y column is well populated and not a key
+    numeric_y = ((1 - numeric["null_rate"]) * np.where(numeric["cardinality"] > 10, 1.0, 0.6)).sort_values(
+        ascending=False)
+    streams = [_scatter_candidates(numeric, corr), _line_candidates(usable, numeric_y),
+               _category_candidates(usable[~id_like], numeric_y, "Bar", SUGGESTION_BAR_MAX_CATEGORIES, 0.8),
+               _category_candidates(usable[~id_like], numeric_y, "Pie", SUGGESTION_PIE_MAX_CATEGORIES, 0.6),
+               _histogram_candidates(numeric_y)]
+    merged = heapq.merge(*(sorted(itertools.islice(stream, top_k * 4), key=lambda c: -c[0]) for stream in streams),
+                         key=lambda c: -c[0])
+    # Keep the list varied: a few suggestions per chart type and no column in more than two of them; the
+    # skipped candidates only fill remaining slots when there isn't enough variety
+    per_chart_limit = max(2, top_k // 3)
+    suggestions, skipped = [], []
+    chart_counts, column_counts = collections.Counter(), collections.Counter()
+    for _score, chart, x, y in merged:
+        if (chart, x, y) in suggestions:
+            continue
+        if chart_counts[chart] >= per_chart_limit or column_counts[x] >= 2 or (y and column_counts[y] >= 2):
+            skipped.append((chart, x, y))
+            continue
+        suggestions.append((chart, x, y))
+        chart_counts[chart] += 1
+        column_counts.update(c for c in (x, y) if c)
+        if len(suggestions) == top_k:
+            return suggestions
+    return suggestions + list(dict.fromkeys(skipped))[:top_k - len(suggestions)]
+
+
+# ------------------ Column Index ------------------
+# Facts about the loaded data that many code paths need, built once per load: case-insensitive name lookup,
+# numeric views (columns with no numeric values at all become their factorized codes), min/max/null counts
+# and the suggestion profile. Views are computed on first use and kept until the column is invalidated.
+# Safe to share with worker threads.
+class ColumnIndex:
+    def __init__(self, data, columns=None):
+        self.data = data
+        self.lock = threading.Lock()
+        self._numeric = {}
+        self._codes = {}
+        self._stats = None
+        self._profile = None
+        self._set_columns(list(data.columns) if columns is None else list(columns))
+
+    def _set_columns(self, columns):
+        self.columns = columns
+        self.name_map = {}
+        for col in columns:
+            self.name_map.setdefault(str(col).lower(), col)
+
+    def resolve(self, name):
+        if name in self.name_map.values():
+            return name
+        return self.name_map.get(str(name).lower(), name)
+
+    def _cached(self, cache, col, compute):
+        with self.lock:
+            if col in cache:
+                return cache[col]
+        value = compute()
+        with self.lock:
+            return cache.setdefault(col, value)
+
+    def numeric(self, col):
+        def compute():
+            values = pd.to_numeric(self.data[col], errors="coerce")
+            if values.isna().all():
+                values = pd.Series(self.codes(col)[0], index=self.data.index)
+            return values
+        return self._cached(self._numeric, col, compute)
+
+    def codes(self, col):
+        return self._cached(self._codes, col, lambda: pd.factorize(self.data[col]))
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            numeric = self.data.select_dtypes(include=[np.number])
+            stats = pd.DataFrame({"null_count": self.data.isna().sum()})
+            stats["min"], stats["max"] = numeric.min(), numeric.max()
+            self._stats = stats
+        return self._stats
+
+    def profile(self):
+        if self._profile is None:
+            self._profile = profile_columns(self.data, null_counts=self.stats["null_count"])
+        return self._profile
+
+    # Catch up with rows appended to the data (new_data holds the old rows followed by the new ones): numeric
+    # views, null counts and min/max are extended from the new rows alone, codes and the sampled profile are
+    # rebuilt on next use
+    def append(self, new_data):
+        rows = new_data.iloc[len(self.data):]
+        with self.lock:
+            old_numeric = self.data.select_dtypes(include=[np.number]).columns
+            numeric = new_data.select_dtypes(include=[np.number]).columns
+            self.data = new_data
+            for col, values in list(self._numeric.items()):
+                if col in numeric:
+                    self._numeric[col] = pd.concat([values, pd.to_numeric(rows[col], errors="coerce")])
+                else:
+                    del self._numeric[col]
+            self._codes.clear()
+            if self._stats is not None and numeric.equals(old_numeric):
+                stats = self._stats.copy()
+                stats["null_count"] += rows.isna().sum()
+                stats["min"] = np.fmin(stats["min"], rows[numeric].min().reindex(stats.index))
+                stats["max"] = np.fmax(stats["max"], rows[numeric].max().reindex(stats.index))
+                self._stats = stats
+            else:
+                self._stats = None
+            self._profile = None
+
+    # Forget cached views of changed columns (all when columns is None); columns_now is the new column list
+    def invalidate(self, columns=None, columns_now=None):
+        with self.lock:
+            for cache in (self._numeric, self._codes):
+                for col in list(cache) if columns is None else columns:
+                    cache.pop(col, None)
+            self._stats = self._profile = None
+        self._set_columns(list(self.data.columns) if columns_now is None else list(columns_now))
+
+
+# Helper: Rows where both columns are numeric, as (valid_mask, X column vector, y) for the forecast models.
+# rows limits the inputs to the first rows rows, e.g. those present when a background fit was queued.
+def forecast_inputs(index, x_column, y_column, rows=None):
+    X_series = index.numeric(x_column).iloc[:rows]
+    y_series = index.numeric(y_column).iloc[:rows]
+    valid_mask = (X_series.notna() & y_series.notna()).to_numpy()
+    X = X_series.to_numpy()[valid_mask].reshape(-1, 1)
+    y = y_series.to_numpy()[valid_mask]
+    return valid_mask, X, y
+
+
+# ------------------ Headless Rendering ------------------
+# Charts and forecasts described in a JSON spec file are rendered to HTML/PNG/JSON without a display,
+# one spec per process. PNG output needs the kaleido package.
+RENDER_FORMATS = ("html", "png", "json")
+RENDER_PROCESSES = os.cpu_count() or 1
+DEFAULT_RENDER_SETTINGS = dict(theme=dict(font_family="Calibri", title_size=20, title_color="#1a1a1a",
+                                          axis_color="#1a1a1a"),
+                               palette=["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A"],
+                               max_points=CHART_MAX_POINTS, webgl_threshold=WEBGL_THRESHOLD)
+
+ChartSpec = collections.namedtuple("ChartSpec", "name chart x y z title", defaults=(None, None))
+ForecastSpec = collections.namedtuple("ForecastSpec", "name x y model horizon conf_int criterion group title",
+                                      defaults=("Linear", 5, False, "AIC", None, None))
+
+# Dataset of the current render worker process, loaded once by _init_render_worker
+_RENDER_DATA = None
+
+
+# Helper: Read a spec file: {"charts": [...], "forecasts": [...], "settings": {...}}. Entries take the
+# ChartSpec/ForecastSpec fields; unnamed entries are called chart_1, forecast_1, ...
+def load_render_specs(file_path):
+    with open(file_path, encoding="utf-8") as fh:
+        raw = json.load(fh)
+    specs = []
+    for key, spec_cls, prefix in (("charts", ChartSpec, "chart"), ("forecasts", ForecastSpec, "forecast")):
+        for i, entry in enumerate(raw.get(key, []), start=1):
+            entry = {"name": f"{prefix}_{i}", **entry}
+            unknown = set(entry) - set(spec_cls._fields)
+            if unknown:
+                raise ValueError(f"{entry['name']}: unknown field(s) {', '.join(sorted(unknown))}.")
+            try:
+                specs.append(spec_cls(**entry))
+            except TypeError as e:
+                raise ValueError(f"{entry['name']}: {e}") from e
+    names = [spec.name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate spec names: {', '.join(duplicates)}.")
+    settings = dict(DEFAULT_RENDER_SETTINGS)
+    settings.update(raw.get("settings", {}))
+    settings["theme"] = {**DEFAULT_RENDER_SETTINGS["theme"], **settings["theme"]}
+    return specs, settings
+
+
+def render_chart(data, spec, settings=DEFAULT_RENDER_SETTINGS, engine=None):
+    engine = engine or ChartEngine()
+    columns = {"x": spec.x, "y": spec.y, "z": spec.z}
+    return engine.build(spec.chart, data, columns, settings["theme"], title=spec.title, palette=settings["palette"],
+                        max_points=settings["max_points"], webgl_threshold=settings["webgl_threshold"]).figure
+
+
+# Scatter of the data with the fitted and forecast lines; with a group column, one model and line per group
+def render_forecast(data, spec, settings=DEFAULT_RENDER_SETTINGS, engine=None):
+    engine = engine or ChartEngine()
+    horizon = int(spec.horizon)
+    index = ColumnIndex(data[list(dict.fromkeys(c for c in (spec.x, spec.y, spec.group) if c))])
+    title = spec.title or f"{spec.model} forecast of {spec.y}"
+    if spec.group:
+        frame = pd.DataFrame({spec.group: index.data[spec.group], spec.x: index.numeric(spec.x),
+                              spec.y: index.numeric(spec.y)})
+        table, _ = batch_forecast(frame, spec.group, spec.x, spec.y, spec.model, horizon, spec.conf_int,
+                                  processes=1, criterion=spec.criterion)
+        fitted = table[table["kind"] == "fitted"]
+        # Sampled per group, splitting the point budget, so every group keeps its colour in the reduced chart
+        groups = fitted.groupby(spec.group, sort=False)
+        budget = max(1, settings["max_points"] // max(1, groups.ngroups))
+        reduced = [reduce_chart_data(group, "sample", spec.x, spec.y, budget) for _, group in groups]
+        points = pd.concat([group for group, _ in reduced]) if reduced else fitted
+        render_mode = "webgl" if len(points) > settings["webgl_threshold"] else "svg"
+        fig = px.scatter(points, x=spec.x, y=spec.y, color=spec.group, title=title, render_mode=render_mode,
+                         color_discrete_sequence=settings["palette"])
+        forecast = table[table["kind"] == "forecast"]
+        for trace in px.line(forecast, x=spec.x, y="Prediction", color=spec.group, render_mode=render_mode,
+                             color_discrete_sequence=settings["palette"]).data:
+            fig.add_trace(trace.update(line_dash="dash", name=f"{trace.name} forecast", showlegend=True))
+        if len(points) < len(fitted):
+            add_reduction_note(fig, len(fitted), len(points), "sampled")
+        return apply_chart_theme(fig, settings["theme"])
+    valid_mask, X, y = forecast_inputs(index, spec.x, spec.y)
+    if not valid_mask.any():
+        raise ValueError("No valid numeric data available for prediction.")
+    result = fit_forecast(X, y, spec.model, horizon, spec.conf_int, criterion=spec.criterion, processes=1)
+    points = pd.DataFrame({spec.x: X.ravel(), spec.y: y})
+    chart = engine.build("Scatter", points, {"x": spec.x, "y": spec.y}, settings["theme"], title=title,
+                         palette=settings["palette"], max_points=settings["max_points"],
+                         webgl_threshold=settings["webgl_threshold"])
+    fitted = pd.DataFrame({spec.x: X.ravel(), "Prediction": result.y_pred})
+    return add_forecast_traces(chart.figure, chart.render_mode, fitted, spec.x, result.forecast_x, result.forecast_y,
+                               result.forecast_ci, settings["max_points"])
+
+
+# Helper: Write a figure as <base_path>.<format> for each format; returns the written paths
+def write_figure(fig, base_path, formats=("html",), title=None, plotly_js="inline"):
+    paths = []
+    for fmt in formats:
+        path = f"{base_path}.{fmt}"
+        if fmt == "html":
+            export_dashboard_html(fig, path, title or os.path.basename(base_path), plotly_js)
+        elif fmt == "png":
+            fig.write_image(path)
+        elif fmt == "json":
+            fig.write_json(path)
+        else:
+            raise ValueError(f"Unsupported output format: {fmt}")
+        paths.append(path)
+    return paths
+
+
+def render_spec(data, spec, output_dir, formats=("html",), settings=DEFAULT_RENDER_SETTINGS, plotly_js="inline"):
+    start = time.perf_counter()
+    if isinstance(spec, ForecastSpec):
+        fig = render_forecast(data, spec, settings)
+    else:
+        fig = render_chart(data, spec, settings)
+    paths = write_figure(fig, os.path.join(output_dir, spec.name), formats, spec.title, plotly_js)
+    return paths, time.perf_counter() - start
+
+
+def _init_render_worker(data_path, sqlite_query):
+    global _RENDER_DATA
+    _RENDER_DATA = load_dataset(data_path, sqlite_query=sqlite_query)[0]
+
+
+def _render_task(spec, output_dir, formats, settings, plotly_js):
+    return render_spec(_RENDER_DATA, spec, output_dir, formats, settings, plotly_js)
+
+
+# Render every spec against one dataset. Returns {spec name: (paths, seconds) or the exception it failed with}.
+# The dataset is parsed once here, which also fills the columnar cache that each worker process then loads from.
+def render_batch(data_path, specs, output_dir, formats=("html",), settings=DEFAULT_RENDER_SETTINGS,
+                 processes=RENDER_PROCESSES, sqlite_query=None, plotly_js="inline"):
+    os.makedirs(output_dir, exist_ok=True)
+    data = load_dataset(data_path, sqlite_query=sqlite_query)[0]
+    results = {}
+    if processes <= 1 or len(specs) <= 1:
+        for spec in specs:
+            try:
+                results[spec.name] = render_spec(data, spec, output_dir, formats, settings, plotly_js)
+            except Exception as e:
+                results[spec.name] = e
+        return results
+
+    del data
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(processes, len(specs)),
+                                                initializer=_init_render_worker,
+                                                initargs=(data_path, sqlite_query)) as pool:
+        futures = {pool.submit(_render_task, spec, output_dir, formats, settings, plotly_js): spec.name
+                   for spec in specs}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+    return {spec.name: results[spec.name] for spec in specs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sportscope",
+                                     description="Render SportScope charts and forecasts without a display.")
+    parser.add_argument("data", help="CSV, Excel or SQLite file")
+    parser.add_argument("specs", help="JSON file with 'charts' and 'forecasts' lists")
+    parser.add_argument("-o", "--output", default="sportscope_output", help="output folder")
+    parser.add_argument("-f", "--format", nargs="+", choices=RENDER_FORMATS, default=["html"])
+    parser.add_argument("-j", "--processes", type=int, default=RENDER_PROCESSES)
+    parser.add_argument("--table", help="table to read from a SQLite database (default: the first one)")
+    parser.add_argument("--plotly-js", choices=("inline", "directory"), default="inline",
+                        help="embed Plotly.js in every HTML file, or write it once next to them")
+    args = parser.parse_args(argv)
+
+    specs, settings = load_render_specs(args.specs)
+    sqlite_query = SQLiteQuery(args.table, None, None) if args.table else None
+    start = time.perf_counter()
+    results = render_batch(args.data, specs, args.output, args.format, settings, args.processes, sqlite_query,
+                           args.plotly_js)
+    failed = 0
+    for name, outcome in results.items():
+        if isinstance(outcome, Exception):
+            failed += 1
+            print(f"{name}: failed ({outcome})", file=sys.stderr)
+        else:
+            paths, seconds = outcome
+            print(f"{name}: {', '.join(paths)} ({seconds:.2f}s)")
+    print(f"Rendered {len(results) - failed} of {len(results)} spec(s) in {time.perf_counter() - start:.2f}s.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
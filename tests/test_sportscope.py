@@ -0,0 +1,566 @@
+import base64
+import functools
+import json
+import os
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import sportscope
+from sportscope import (CSVTail, ChartServer, IncrementalForecaster, SQLiteQuery, SQLiteWriter, backtest_splits,
+                        batch_forecast, convert_files, csv_data_offset, fit_forecast, reduce_chart_data,
+                        stream_convert)
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"x": np.arange(50_000), "y": rng.normal(size=50_000),
+                         "group": rng.choice(list("abc"), size=50_000)})
+
+
+# ------------------ Data Cache ------------------
+def test_cache_round_trip_keeps_data_and_report(tmp_path):
+    data = pd.DataFrame({"team": ["a", "b"], "score": [1.5, 2.0]})
+    report = pd.DataFrame({"column": ["score"], "saved_bytes": [8]})
+    assert sportscope.write_cached("key", data, report, cache_dir=str(tmp_path))
+    cached, cached_report = sportscope.read_cached("key", cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cached, data)
+    pd.testing.assert_frame_equal(cached_report, report)
+    assert sportscope.read_cached("missing", cache_dir=str(tmp_path)) is None
+
+
+def test_cache_key_changes_with_the_file_and_ingest_mode(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("a\n1\n")
+    key = sportscope.cache_key(str(path), False)
+    assert sportscope.cache_key(str(path), True) != key
+    path.write_text("a\n1\n2\n")
+    assert sportscope.cache_key(str(path), False) != key
+
+
+def test_cache_evicts_the_least_recently_used_entry(tmp_path):
+    cache_dir = str(tmp_path)
+    data = pd.DataFrame({"x": np.arange(1_000)})
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        sportscope.write_cached(key, data, data.describe(), cache_dir=cache_dir)
+        os.utime(tmp_path / f"{key}.feather", (1_000_000 - age, 1_000_000 - age))
+    # Reading the oldest entry marks it as recently used, so "middle" goes first
+    assert sportscope.read_cached("oldest", cache_dir=cache_dir) is not None
+    entry_bytes = (tmp_path / "newest.feather").stat().st_size
+    sportscope.evict_cache(cache_dir, max_bytes=2 * entry_bytes)
+    assert sorted(p.name for p in tmp_path.glob("*.feather")) == ["newest.feather", "oldest.feather"]
+    assert not (tmp_path / "middle.report.json").exists()
+
+
+# ------------------ Out-of-Core Dataset ------------------
+@pytest.fixture
+def sqlite_dataset(tmp_path):
+    path = tmp_path / "rows.csv"
+    pd.DataFrame({"x": np.arange(25), "y": np.arange(25) * 2.0}).to_csv(path, index=False)
+    return sportscope.SQLiteDataset.from_file(str(path), cache_dir=str(tmp_path / "cache"))
+
+
+def test_sqlite_dataset_loads_columns_by_row_position(sqlite_dataset):
+    assert len(sqlite_dataset) == 25
+    assert sqlite_dataset.columns == ["x", "y"]
+    window = sqlite_dataset.load(["y"], start=10, stop=13)
+    assert list(window.columns) == ["y"]
+    assert window.index.tolist() == [10, 11, 12]
+    assert window["y"].tolist() == [20.0, 22.0, 24.0]
+    assert len(sqlite_dataset.load(["x"], max_rows=5)) <= 5
+    assert sqlite_dataset.load_rows(["x"], [20, 3, 3])["x"].tolist() == [3, 20]
+
+
+def test_sqlite_dataset_keeps_derived_columns_aligned(sqlite_dataset):
+    sqlite_dataset.set_column("Prediction", np.arange(25) * -1)
+    assert sqlite_dataset.columns == ["x", "y", "Prediction"]
+    chunks = list(sqlite_dataset.iter_chunks(chunk_rows=10, columns=["x", "Prediction"]))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    joined = pd.concat(chunks)
+    assert (joined["Prediction"] == -joined["x"]).all()
+
+
+def test_sqlite_dataset_reuses_the_cached_copy(tmp_path, sqlite_dataset):
+    again = sportscope.SQLiteDataset.from_file(str(tmp_path / "rows.csv"), cache_dir=str(tmp_path / "cache"))
+    assert again.db_path == sqlite_dataset.db_path
+    assert len(list((tmp_path / "cache").glob("*.db"))) == 1
+
+
+# ------------------ Chart Data Reduction ------------------
+@pytest.mark.parametrize("kind, method", [("line", "LTTB"), ("density", "density"), ("histogram", "binned"),
+                                          ("group", "grouped sum"), ("sample", "sampled")])
+@pytest.mark.parametrize("max_points", [150, 5_000])
+def test_reduction_stays_under_max_points(points, kind, method, max_points):
+    reduced, reduction = reduce_chart_data(points, kind, "x", "y", max_points)
+    assert reduction == method
+    assert len(reduced) <= max_points
+
+
+def test_small_data_is_not_reduced(points):
+    small = points.head(100)
+    reduced, reduction = reduce_chart_data(small, "line", "x", "y", 1_000)
+    assert reduction is None
+    assert reduced is small
+
+
+def test_line_reduction_keeps_end_points(points):
+    reduced, _ = reduce_chart_data(points, "line", "x", "y", 1_000)
+    assert reduced["x"].iloc[0] == 0
+    assert reduced["x"].iloc[-1] == len(points) - 1
+
+
+def test_group_reduction_keeps_the_largest_categories_and_an_other_bucket():
+    data = pd.DataFrame({"team": [f"t{i}" for i in range(20)], "y": np.arange(20.0)})
+    reduced, reduction = reduce_chart_data(data, "group", "team", "y", 5)
+    assert reduction == f"grouped sum, top 4 categories + {sportscope.OTHER_CATEGORY}"
+    totals = dict(zip(reduced["team"], reduced["y"]))
+    assert totals == {"t19": 19.0, "t18": 18.0, "t17": 17.0, "t16": 16.0, sportscope.OTHER_CATEGORY: sum(range(16))}
+
+
+def test_density_scatter_renders_as_svg(points):
+    result = sportscope.ChartEngine().build("Scatter", points, {"x": "x", "y": "y"},
+                                            sportscope.DEFAULT_RENDER_SETTINGS["theme"], max_points=2_000,
+                                            webgl_threshold=100)
+    assert result.reduction == "density"
+    assert result.render_mode == "svg"
+    assert result.shown_rows <= 2_000
+
+
+# ------------------ HTML Export ------------------
+def _exported(page, name):
+    line = next(line for line in page.splitlines() if line.startswith(f"const {name} = "))
+    return json.loads(line[len(f"const {name} = "):-1])
+
+
+def test_html_export_stores_each_shared_array_once(tmp_path):
+    x = np.arange(100)
+    fig = go.Figure([go.Scatter(x=x, y=np.sin(x)), go.Scatter(x=x, y=np.cos(x), text=["t"] * 100),
+                     go.Bar(x=[1, 2], y=[3, 4])])
+    path = tmp_path / "dashboard.html"
+    n_arrays = sportscope.export_dashboard_html(fig, str(path), title="A <b> & C", plotly_js="directory")
+    # x is shared by the first two traces; the short bar arrays stay inline
+    assert n_arrays == 4
+    page = path.read_text(encoding="utf-8")
+    assert "<title>A &lt;b&gt; &amp; C</title>" in page
+    assert (tmp_path / "plotly.min.js").exists()
+
+    payload, figure = _exported(page, "DATA"), _exported(page, "FIGURE")
+    first, second, bar = figure["data"]
+    assert first["x"] == second["x"]
+    assert bar["x"] == [1, 2]
+    xs = payload[first["x"]["__ref__"]]
+    assert xs["dtype"] == "f4"
+    np.testing.assert_array_equal(np.frombuffer(base64.b64decode(xs["b64"]), dtype=np.float32), x)
+    assert payload[second["text"]["__ref__"]] == {"dtype": "json", "values": ["t"] * 100}
+
+
+# ------------------ Saved Dashboards ------------------
+@pytest.fixture
+def saved_dashboard(tmp_path, points):
+    source = tmp_path / "points.csv"
+    source.write_text("x\n1\n")
+    fingerprint = sportscope.dataset_fingerprint(str(source))
+    aggregates = sportscope.DashboardAggregates(fingerprint, max_points=500)
+    charts = [sportscope.DashboardChart("Line", "x", "y"), sportscope.DashboardChart("Bar", "group", "y")]
+    engine = sportscope.ChartEngine()
+    for chart in charts:
+        _, reused = sportscope.build_dashboard_chart(engine, chart, sportscope.DEFAULT_RENDER_SETTINGS, aggregates,
+                                                     lambda columns: points[columns])
+        assert not reused
+    dataset = {"file_path": str(source), "sqlite_query": SQLiteQuery("games", ("x", "y"), "y > 0")}
+    path = str(tmp_path / "dashboard.json")
+    spec = sportscope.DashboardSpec(charts, sportscope.DEFAULT_RENDER_SETTINGS, dataset, aggregates, "Season")
+    assert sportscope.save_dashboard_spec(path, spec) == (2, [])
+    return path, spec
+
+
+def test_saved_dashboard_round_trip_reuses_its_aggregates(saved_dashboard):
+    path, spec = saved_dashboard
+    loaded = sportscope.load_dashboard_spec(path)
+    assert loaded.charts == spec.charts
+    assert loaded.title == "Season"
+    assert loaded.dataset == spec.dataset
+    assert loaded.skipped == ()
+    aggregates = loaded.aggregates.for_dataset(spec.aggregates.fingerprint, 500)
+    assert aggregates is loaded.aggregates
+    for chart in loaded.charts:
+        pd.testing.assert_frame_equal(aggregates.get(chart).data, spec.aggregates.get(chart).data)
+        _, reused = sportscope.build_dashboard_chart(sportscope.ChartEngine(), chart, loaded.settings, aggregates)
+        assert reused
+
+
+def test_saved_dashboard_data_is_dropped_when_the_dataset_changed(saved_dashboard):
+    path, spec = saved_dashboard
+    loaded = sportscope.load_dashboard_spec(path)
+    for fingerprint, max_points in (("another dataset", 500), (spec.aggregates.fingerprint, 1_000)):
+        aggregates = loaded.aggregates.for_dataset(fingerprint, max_points)
+        assert aggregates.get(loaded.charts[0]) is None
+        with pytest.raises(ValueError, match="out of date"):
+            sportscope.build_dashboard_chart(sportscope.ChartEngine(), loaded.charts[0], loaded.settings, aggregates)
+
+
+def test_saved_dashboard_reports_unreadable_chart_data(saved_dashboard):
+    path, spec = saved_dashboard
+    data_dir = sportscope.dashboard_data_dir(path)
+    first = sorted(os.listdir(data_dir))[0]
+    with open(os.path.join(data_dir, first), "wb") as fh:
+        fh.write(b"not parquet")
+    loaded = sportscope.load_dashboard_spec(path)
+    assert len(loaded.skipped) == 1
+    assert len(loaded.aggregates.charts) == 1
+    assert loaded.skipped[0] in [sportscope.dashboard_chart_label(chart) for chart in spec.charts]
+
+    # Saving fewer charts removes the data files of the charts that are gone
+    sportscope.save_dashboard_spec(path, spec._replace(charts=spec.charts[:1]))
+    assert len(os.listdir(data_dir)) == 1
+
+
+# ------------------ Forecasting ------------------
+@pytest.mark.parametrize("model", ["Linear", "Polynomial"])
+def test_incremental_update_matches_full_fit(model):
+    rng = np.random.default_rng(1)
+    x = np.linspace(0, 10, 400)
+    y = 0.5 * x ** 2 - 3 * x + rng.normal(scale=2.0, size=len(x))
+    X = x.reshape(-1, 1)
+    first = fit_forecast(X[:300], y[:300], model, 5, processes=1)
+    forecaster = IncrementalForecaster.start(X[:300], y[:300], first, 5)
+    y_new, result = forecaster.update(X[300:], y[300:])
+
+    full = fit_forecast(X, y, model, 5, processes=1)
+    np.testing.assert_allclose(y_new, full.y_pred[300:], rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(forecaster.predict(X), full.y_pred, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(result.forecast_x, full.forecast_x)
+    np.testing.assert_allclose(result.forecast_y, full.forecast_y, rtol=1e-6, atol=1e-6)
+
+
+@pytest.fixture
+def arima_cache(monkeypatch):
+    cache = sportscope.ResultCache(max_entries=64)
+    monkeypatch.setattr(sportscope, "ARIMA_CACHE", cache)
+    return cache
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_auto_arima_reuses_the_cached_search(monkeypatch, arima_cache):
+    rng = np.random.default_rng(2)
+    y = np.zeros(200)
+    for i in range(1, len(y)):
+        y[i] = 0.7 * y[i - 1] + rng.normal()
+    order = sportscope.auto_arima_order(y, processes=1, max_p=2, max_d=1, max_q=1)
+    assert order[1] == 0
+    assert arima_cache.get((sportscope.series_fingerprint(y), order)) is not None
+
+    # A second search on the same series fits nothing
+    def no_fit(*args, **kwargs):
+        raise AssertionError("refitted a cached series")
+    monkeypatch.setattr(sportscope, "_arima_candidate_score", no_fit)
+    assert sportscope.auto_arima_order(y, processes=1, max_p=2, max_d=1, max_q=1) == order
+
+
+def test_result_cache_drops_the_least_recently_used_entry():
+    cache = sportscope.ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_batch_forecast_returns_every_group(points):
+    table, metrics = batch_forecast(points, "group", "x", "y", "Linear", 5, processes=1)
+    assert sorted(metrics["group"]) == ["a", "b", "c"]
+    fitted = table[table["kind"] == "fitted"]
+    assert len(fitted) == len(points)
+    assert fitted.groupby("group").size().to_dict() == points.groupby("group").size().to_dict()
+
+
+# ------------------ Backtesting ------------------
+def test_backtest_folds_are_contiguous_and_end_on_the_horizon_grid():
+    splits = backtest_splits(1_003, 4, 10, min_train=50)
+    assert len(splits) == 4
+    assert [test_end for _, _, test_end in splits] == [970, 980, 990, 1_000]
+    for train_start, origin, test_end in splits:
+        assert train_start == 0
+        assert test_end - origin == 10
+    # Consecutive folds test consecutive blocks
+    assert all(a[2] == b[1] for a, b in zip(splits, splits[1:]))
+
+
+def test_backtest_folds_keep_their_rows_when_data_is_appended():
+    before = backtest_splits(1_000, 3, 10, min_train=50)
+    after = backtest_splits(1_015, 5, 10, min_train=50)
+    assert set(before) <= set(after)
+
+
+def test_sliding_backtest_window_is_bounded():
+    for train_start, origin, _ in backtest_splits(1_000, 5, 10, window="Sliding", min_train=50):
+        assert origin - train_start == 100
+
+
+def test_backtest_needs_min_train_rows():
+    assert backtest_splits(60, 5, 10, min_train=50) == [(0, 50, 60)]
+    assert backtest_splits(55, 5, 10, min_train=50) == []
+
+
+# ------------------ Live Refresh ------------------
+def test_csv_data_offset_skips_header_and_loaded_rows(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4\n5,6\n")
+    assert csv_data_offset(str(path), 0) == len(b"a,b\n")
+    assert csv_data_offset(str(path), 2) == len(b"a,b\n1,2\n3,4\n")
+    with pytest.raises(ValueError):
+        csv_data_offset(str(path), 4)
+
+
+def test_csv_data_offset_accepts_a_last_row_without_newline(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4")
+    assert csv_data_offset(str(path), 2) == path.stat().st_size
+
+
+def test_csv_tail_waits_for_partly_written_lines(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+    tail = CSVTail(str(path), csv_data_offset(str(path), 1))
+    assert tail.read() is None
+
+    with open(path, "ab") as fh:
+        fh.write(b"3,4\n5,")
+    rows = tail.read()
+    assert rows.to_dict("list") == {"a": [3], "b": [4]}
+    assert tail.read() is None
+
+    with open(path, "ab") as fh:
+        fh.write(b"6\n")
+    assert tail.read().to_dict("list") == {"a": [5], "b": [6]}
+
+
+def test_csv_tail_reports_a_truncated_file(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4\n")
+    tail = CSVTail(str(path), path.stat().st_size)
+    path.write_bytes(b"a,b\n")
+    with pytest.raises(ValueError):
+        tail.read()
+
+
+def _messages(client):
+    messages = []
+    while not client.empty():
+        messages.append(json.loads(client.get()[len("data: "):]))
+    return messages
+
+
+def test_chart_server_sends_only_what_changed():
+    server = ChartServer()
+    client = queue.Queue()
+    server.clients.append(client)
+    try:
+        fig = go.Figure(go.Scatter(x=[1, 2], y=[3, 4]), layout=dict(title="one"))
+        server.show(fig)
+        assert [m["op"] for m in _messages(client)] == ["figure"]
+
+        server.show(go.Figure(fig))
+        assert _messages(client) == []
+
+        fig.update_layout(title="two")
+        fig.update_traces(y=[5, 6])
+        server.show(fig)
+        ops = {m["op"]: m for m in _messages(client)}
+        assert set(ops) == {"restyle", "relayout"}
+        assert list(ops["restyle"]["update"]) == ["y"]
+        assert list(ops["relayout"]["update"]) == ["title"]
+
+        server.show(go.Figure(go.Bar(x=[1, 2], y=[3, 4])))
+        assert [m["op"] for m in _messages(client)] == ["react"]
+    finally:
+        server.close()
+
+
+def test_live_snapshot_copies_only_what_the_charts_read(points):
+    settings = dict(sportscope.DEFAULT_RENDER_SETTINGS, max_points=100)
+    line = sportscope.DashboardChart("Line", "x", "y")
+    live = sportscope.LiveDashboard(sportscope.ChartEngine(), [line], settings)
+    snapshot = live.snapshot(points)
+    assert list(snapshot.columns) == ["x", "y"]
+    assert snapshot["x"].tolist() == points["x"].iloc[-100:].tolist()
+    assert not np.shares_memory(snapshot["y"].to_numpy(), points["y"].to_numpy())
+
+    # A chart that is rebuilt rather than extended needs every row
+    live.charts = [line, sportscope.DashboardChart("Bar", "group", "y")]
+    assert len(live.snapshot(points)) == len(points)
+
+
+# ------------------ Anomaly Detection ------------------
+def test_anomaly_detection_flags_injected_outliers_across_chunks():
+    rng = np.random.default_rng(3)
+    data = pd.DataFrame({"a": rng.normal(size=3_000), "b": rng.normal(size=3_000),
+                         "team": rng.choice(list("xyz"), size=3_000)})
+    outliers = [10, 1_500, 2_999]
+    data.loc[outliers, ["a", "b"]] = [[40.0, -40.0], [-35.0, 30.0], [50.0, 50.0]]
+    seen = []
+    result = sportscope.detect_anomalies(data, lambda: (data.iloc[i:i + 1_000] for i in range(0, 3_000, 1_000)),
+                                         ["a", "b", "team"], contamination=0.01, progress=seen.append, n_jobs=1)
+    assert result.n_rows == 3_000
+    assert seen == [1_000, 2_000, 3_000]
+    assert set(outliers) <= set(result.positions.tolist())
+    assert len(result.positions) <= 60
+    assert (result.scores < 0).all()
+
+
+def test_anomaly_detection_can_be_cancelled():
+    data = pd.DataFrame({"a": np.arange(100.0)})
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(sportscope.AnomalyCancelled):
+        sportscope.detect_anomalies(data, lambda: iter([data]), ["a"], cancel_event=cancel_event, n_jobs=1)
+
+
+# ------------------ Chart Suggestions ------------------
+@pytest.fixture
+def games():
+    rng = np.random.default_rng(4)
+    n = 2_000
+    minutes = rng.uniform(0, 40, size=n)
+    return pd.DataFrame({"game_id": np.arange(n), "date": pd.date_range("2024-01-01", periods=n, freq="h"),
+                         "minutes": minutes, "points": 0.8 * minutes + rng.normal(scale=1.0, size=n),
+                         "team": rng.choice(["home", "away"], size=n), "constant": 1,
+                         "notes": np.where(rng.random(n) < 0.8, None, "x")})
+
+
+def test_suggestions_rank_the_strongest_relationship_first(games):
+    profile, corr = sportscope.profile_columns(games)
+    suggestions = sportscope.suggest_charts(profile, corr, top_k=6)
+    assert suggestions[0] == ("Scatter", "minutes", "points")
+    assert len(suggestions) == len(set(suggestions)) == 6
+    used = {c for _, x, y in suggestions for c in (x, y)}
+    # Constant and mostly empty columns are never suggested, and a key column is never plotted as Y
+    assert not used & {"constant", "notes"}
+    assert "game_id" not in {y for _, _, y in suggestions}
+    assert any(chart == "Line" and x == "date" for chart, x, _ in suggestions)
+    assert any(chart in ("Bar", "Pie") and x == "team" for chart, x, _ in suggestions)
+
+
+def test_suggestions_stop_at_top_k(games):
+    profile, corr = sportscope.profile_columns(games)
+    assert len(sportscope.suggest_charts(profile, corr, top_k=2)) == 2
+    assert sportscope.suggest_charts(profile.iloc[:0], pd.DataFrame(), top_k=5) == []
+
+
+# ------------------ Column Index ------------------
+def test_column_index_append_matches_a_fresh_index():
+    first = pd.DataFrame({"Score": [1.0, np.nan, 3.0], "team": ["a", "b", "a"]})
+    more = pd.DataFrame({"Score": [-2.0, 9.0], "team": [None, "c"]})
+    index = sportscope.ColumnIndex(first)
+    # Build the cached views that append has to extend
+    assert index.numeric("team").tolist() == [0, 1, 0]
+    assert index.stats.loc["Score", "max"] == 3.0
+
+    grown = pd.concat([first, more], ignore_index=True)
+    index.append(grown)
+    fresh = sportscope.ColumnIndex(grown)
+    pd.testing.assert_series_equal(index.numeric("Score"), fresh.numeric("Score"))
+    pd.testing.assert_series_equal(index.numeric("team"), fresh.numeric("team"))
+    pd.testing.assert_frame_equal(index.stats, fresh.stats)
+    assert index.resolve("score") == "Score"
+
+
+def test_column_index_append_rebuilds_stats_when_a_column_turns_numeric():
+    index = sportscope.ColumnIndex(pd.DataFrame({"a": [None, None]}, dtype=object))
+    assert index.stats.loc["a", "null_count"] == 2
+    grown = pd.DataFrame({"a": [np.nan, np.nan, 4.0]})
+    index.append(grown)
+    pd.testing.assert_frame_equal(index.stats, sportscope.ColumnIndex(grown).stats)
+
+
+# ------------------ Headless Rendering ------------------
+def test_render_specs_fill_names_and_settings(tmp_path):
+    path = tmp_path / "specs.json"
+    path.write_text(json.dumps({"charts": [{"chart": "Bar", "x": "team", "y": "points"}],
+                                "forecasts": [{"name": "trend", "x": "minutes", "y": "points"}],
+                                "settings": {"max_points": 500, "theme": {"title_size": 30}}}))
+    specs, settings = sportscope.load_render_specs(str(path))
+    assert [spec.name for spec in specs] == ["chart_1", "trend"]
+    assert specs[1].model == "Linear"
+    assert settings["max_points"] == 500
+    assert settings["theme"]["title_size"] == 30
+    assert settings["theme"]["font_family"] == sportscope.DEFAULT_RENDER_SETTINGS["theme"]["font_family"]
+
+    path.write_text(json.dumps({"charts": [{"chart": "Bar", "x": "team", "y": "points", "colour": "red"}]}))
+    with pytest.raises(ValueError, match="colour"):
+        sportscope.load_render_specs(str(path))
+
+
+def test_render_batch_writes_each_spec_and_reports_failures(tmp_path, monkeypatch, games):
+    # Keep the test's dataset out of the user's columnar cache
+    monkeypatch.setattr(sportscope, "load_dataset", functools.partial(sportscope.load_dataset, use_cache=False))
+    data_path = tmp_path / "games.csv"
+    games.to_csv(data_path, index=False)
+    specs = [sportscope.ChartSpec("bar", "Bar", "team", "points"),
+             sportscope.ForecastSpec("trend", "minutes", "points", horizon=3),
+             sportscope.ChartSpec("broken", "Line", "no_such_column", "points")]
+    output_dir = tmp_path / "out"
+    results = sportscope.render_batch(str(data_path), specs, str(output_dir), formats=("html", "json"), processes=1,
+                                      plotly_js="directory")
+    assert list(results) == ["bar", "trend", "broken"]
+    assert isinstance(results["broken"], Exception)
+    for name in ("bar", "trend"):
+        paths, seconds = results[name]
+        assert paths == [str(output_dir / f"{name}.html"), str(output_dir / f"{name}.json")]
+        assert all(os.path.getsize(path) for path in paths)
+    assert json.loads((output_dir / "bar.json").read_text())["data"][0]["type"] == "bar"
+    assert (output_dir / "plotly.min.js").exists()
+
+
+# ------------------ Conversion ------------------
+def test_sqlite_writer_round_trip(tmp_path):
+    path = str(tmp_path / "out.db")
+    frame = pd.DataFrame({"team": ["a", "b", None], "score": [1.5, 2.0, np.nan], "games": [1, 2, 3]})
+    with SQLiteWriter(path, index_columns=["team"]) as writer:
+        writer.write(frame.iloc[:2])
+        writer.write(frame.iloc[2:])
+    with sqlite3.connect(path) as conn:
+        back = pd.read_sql_query(f"SELECT * FROM {sportscope.SQLITE_EXPORT_TABLE}", conn)
+        indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    pd.testing.assert_frame_equal(back, frame)
+    assert len(indexes) == 1
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "games.db")
+    with sqlite3.connect(path) as conn:
+        pd.DataFrame({"a": range(10)}).to_sql("first", conn, index=False)
+        pd.DataFrame({"b": range(7), "c": range(7)}).to_sql("second", conn, index=False)
+    return path
+
+
+def test_stream_convert_uses_the_sqlite_query(tmp_path, database):
+    output = str(tmp_path / "out.csv")
+    stats = stream_convert(database, output, "CSV", sqlite_query=SQLiteQuery("second", ("b",), "b > 2"),
+                           chunk_rows=2)
+    assert stats.rows == 4
+    assert pd.read_csv(output).to_dict("list") == {"b": [3, 4, 5, 6]}
+
+
+def test_stream_convert_defaults_to_the_first_table(tmp_path, database):
+    output = str(tmp_path / "out.csv")
+    assert stream_convert(database, output, "CSV").rows == 10
+
+
+def test_convert_files_reports_failures_per_file(tmp_path, database):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("a\n")
+    jobs = [(database, str(tmp_path / "games.parquet")), (str(empty), str(tmp_path / "empty.parquet"))]
+    results = convert_files(jobs, "Parquet", processes=1)
+    assert results[database].rows == 10
+    assert isinstance(results[str(empty)], ValueError)
+    # A failed conversion leaves no partial output behind
+    assert not (tmp_path / "empty.parquet").exists()